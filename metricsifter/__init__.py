@@ -1,15 +1,24 @@
 from importlib.metadata import PackageNotFoundError, version
 
+from metricsifter.aio import AsyncSift
+from metricsifter.cancellation import CancellationToken
 from metricsifter.evaluation import SelectionMetrics, evaluate_selection
+from metricsifter.execution import ExecutionOptions
 from metricsifter.sifter import Sifter
 from metricsifter.transformer import SifterTransformer
 from metricsifter.types import (
     BandwidthTuning,
+    BatchSegmentScorer,
+    ChangePointDetection,
+    ExecutionPlan,
     PenaltyTuning,
     Segment,
     SegmentCandidate,
+    SegmentCandidateBatch,
     SegmentInfo,
     SiftResult,
+    StageHooks,
+    StageTiming,
 )
 
 try:
@@ -18,15 +27,24 @@ except PackageNotFoundError:
     __version__ = "0.0.0"
 
 __all__ = [
-    "Sifter",
-    "SifterTransformer",
+    "AsyncSift",
+    "BandwidthTuning",
+    "BatchSegmentScorer",
+    "CancellationToken",
+    "ChangePointDetection",
+    "ExecutionOptions",
+    "ExecutionPlan",
+    "PenaltyTuning",
     "Segment",
     "SegmentCandidate",
+    "SegmentCandidateBatch",
     "SegmentInfo",
-    "SiftResult",
-    "PenaltyTuning",
-    "BandwidthTuning",
     "SelectionMetrics",
-    "evaluate_selection",
+    "SiftResult",
+    "Sifter",
+    "SifterTransformer",
+    "StageHooks",
+    "StageTiming",
     "__version__",
+    "evaluate_selection",
 ]
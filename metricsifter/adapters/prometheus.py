@@ -21,6 +21,8 @@ the same canonical name, a deterministic ``#<n>`` suffix disambiguates them.
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
 import pandas as pd
 
 METRIC_LABELS_ATTR = "metric_labels"
@@ -126,3 +128,27 @@ def to_metric_labels(df: pd.DataFrame, column: str) -> dict[str, str]:
     if column not in mapping:
         raise KeyError(f"Unknown column {column!r}. Known columns: {sorted(mapping)}.")
     return dict(mapping[column])
+
+
+def shard_by_labels(df: pd.DataFrame, label_keys: Sequence[str]) -> dict[str, tuple[str | None, ...]]:
+    """Map every column to the values of ``label_keys`` in its label set.
+
+    Columns sharing these values (e.g. ``["service"]`` or ``["namespace",
+    "pod"]``) form one shard of :meth:`Sifter.sift_sharded`; a missing label is
+    ``None``.
+
+    Args:
+        df: A DataFrame produced by :func:`from_query_range`.
+        label_keys: Prometheus label keys to shard by.
+
+    Returns:
+        Column name -> tuple of label values, in ``label_keys`` order.
+
+    Raises:
+        KeyError: If the frame carries no adapter metadata for a column.
+    """
+    shards: dict[str, tuple[str | None, ...]] = {}
+    for column in df.columns:
+        labels = to_metric_labels(df, column)
+        shards[column] = tuple(labels.get(key) for key in label_keys)
+    return shards
@@ -0,0 +1,152 @@
+"""asyncio integration: sifting from an event loop without blocking it.
+
+:meth:`metricsifter.sifter.Sifter.asift` returns an :class:`AsyncSift`, which
+is both awaitable (for the :class:`~metricsifter.types.SiftResult`) and an
+async iterator of the sift's stage events::
+
+    run = sifter.asift(frame, semaphore=limit)
+    async for stage, timing in run:  # timing is None when the stage starts
+        log.info("sift stage %s %s", stage, "done" if timing else "started")
+    result = await run
+
+The sift's orchestration runs on the event loop's default thread pool and its
+per-metric detection on the sifter's workers (``executor`` / ``n_jobs``), so
+the loop stays free. Cancelling the awaiting task (or :meth:`AsyncSift.cancel`)
+cancels the sift's :class:`~metricsifter.cancellation.CancellationToken`: no
+new metric is dispatched, the tasks still queued on the workers are cancelled
+and the sift stops at its next stage boundary (e.g. before the bandwidth
+bootstrap, or between segmentation and selection). A shared
+:class:`asyncio.Semaphore` bounds how many sifts run at once; the others wait
+for a slot before starting, and a cancelled sift keeps its slot until its
+thread has stopped.
+"""
+
+import asyncio
+import contextlib
+import copy
+import functools
+from collections.abc import AsyncIterator, Generator
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from metricsifter.cancellation import CancellationToken
+from metricsifter.types import SiftResult, StageHooks, StageTiming
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from metricsifter.sifter import Sifter
+
+__all__ = ["AsyncSift"]
+
+# Queued after the last stage event of a sift.
+_DONE = object()
+
+
+class _Abandoned(Exception):
+    """Stops the sift of a cancelled :class:`AsyncSift` at a stage boundary; nobody awaits its result."""
+
+
+class _QueueHooks:
+    """Stage hooks that forward every event to an asyncio queue, then to the sifter's own hooks.
+
+    A stage does not start once ``token`` is cancelled.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        queue: asyncio.Queue,
+        hooks: StageHooks | None,
+        token: CancellationToken,
+    ) -> None:
+        self.loop = loop
+        self.queue = queue
+        self.hooks = hooks
+        self.token = token
+
+    def _put(self, event: Any) -> None:
+        with contextlib.suppress(RuntimeError):  # the loop closed under an abandoned sift
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+
+    def on_stage_start(self, stage: str) -> None:
+        if self.token.cancelled:
+            raise _Abandoned(stage)
+        if self.hooks is not None:
+            self.hooks.on_stage_start(stage)
+        self._put((stage, None))
+
+    def on_stage_end(self, stage: str, timing: StageTiming) -> None:
+        if self.hooks is not None:
+            self.hooks.on_stage_end(stage, timing)
+        self._put((stage, timing))
+
+
+async def _drain(future: asyncio.Future) -> None:
+    """Wait for ``future`` to finish, whatever further cancellations arrive; its outcome is dropped."""
+    while not future.done():
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.wait([future])
+    if not future.cancelled():
+        future.exception()  # retrieved, so the loop does not log it
+
+
+class AsyncSift:
+    """A sift running in the background of the current event loop.
+
+    Created by :meth:`metricsifter.sifter.Sifter.asift` (which must be called
+    from a running loop); the sift starts right away.
+    """
+
+    def __init__(
+        self,
+        sifter: "Sifter",
+        data: pd.DataFrame,
+        without_simple_filter: bool = False,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        self._events: asyncio.Queue = asyncio.Queue()
+        self._token = CancellationToken()
+        runner = copy.copy(sifter)
+        runner.stage_hooks = _QueueHooks(loop, self._events, sifter.stage_hooks, self._token)
+        sift = functools.partial(runner.sift, data, without_simple_filter, cancel_token=self._token)
+        self._task = loop.create_task(self._run(loop, sift, semaphore))
+
+    async def _run(
+        self, loop: asyncio.AbstractEventLoop, sift: functools.partial, semaphore: asyncio.Semaphore | None
+    ) -> SiftResult:
+        try:
+            async with semaphore if semaphore is not None else contextlib.nullcontext():
+                future = loop.run_in_executor(None, sift)
+                try:
+                    return await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    # Stops the worker thread at its next stage boundary; the
+                    # slot is only released once the thread is done.
+                    self._token.cancel()
+                    await _drain(future)
+                    raise
+        finally:
+            self._events.put_nowait(_DONE)
+
+    def cancel(self) -> bool:
+        """Cancel the sift (see :meth:`asyncio.Task.cancel`)."""
+        return self._task.cancel()
+
+    def done(self) -> bool:
+        return self._task.done()
+
+    def __await__(self) -> Generator[Any, None, SiftResult]:
+        return self._task.__await__()
+
+    async def __aiter__(self) -> AsyncIterator[tuple[str, StageTiming | None]]:
+        """``(stage, None)`` when a stage starts and ``(stage, timing)`` when it ends, until the sift finishes.
+
+        Events are buffered, so they can be consumed after the fact; iterate
+        once per :class:`AsyncSift`.
+        """
+        while True:
+            event = await self._events.get()
+            if event is _DONE:
+                return
+            yield event
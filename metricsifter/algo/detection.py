@@ -1,14 +1,21 @@
+import threading
 import warnings
 from collections import defaultdict
+from collections.abc import Sequence
+from concurrent.futures import Executor
+from functools import cached_property
 from typing import Final
 
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 import ruptures as rpt
-from joblib import Parallel, delayed
+import scipy.sparse
 from ruptures.exceptions import BadSegmentationParameters
 
+from metricsifter import parallel
+from metricsifter.utils import gen_even_slices
+
 NO_CHANGE_POINTS: Final[int] = -1
 
 #: Noise-scale (``sigma``) estimators supported by :func:`detect_univariate_changepoints`.
@@ -30,6 +37,9 @@ PENALTY_ADJUST_FALLBACK: Final[float] = 2.0
 #: standard deviation of a Gaussian: ``sigma = MAD / Phi^{-1}(0.75) = 1.4826 * MAD``.
 _MAD_TO_SIGMA: Final[float] = 1.4826
 
+# Upper bound on the (rows x columns) block read at once by change_magnitude_scores.
+_SCORE_BLOCK_SIZE: Final[int] = 1 << 20
+
 
 def _estimate_sigma(core: np.ndarray, sigma_estimator: str) -> float:
     """Estimate the noise scale ``sigma`` used to derive the AIC/BIC penalty.
@@ -124,7 +134,38 @@ def _prepare_core(x: np.ndarray) -> tuple[np.ndarray | None, int]:
     return core, left
 
 
+#: Per-thread cache of built searchers, keyed by ``(search_method, cost_model)``.
+_searchers = threading.local()
+
+# Serializes searcher construction: it silences warnings with
+# warnings.catch_warnings, which swaps the process-wide warning filters.
+_searcher_lock = threading.Lock()
+
+
 def _build_searcher(search_method: str, cost_model: str):
+    """This thread's searcher for ``(search_method, cost_model)``, built on first use.
+
+    Every ruptures searcher resets its state in ``fit``, so one instance per
+    thread serves all the metrics that thread (or worker process) detects; a
+    searcher is never shared between threads, so detection is thread-safe
+    (also on a free-threaded interpreter).
+    """
+    cache: dict = _searchers.__dict__.setdefault("cache", {})
+    key = (search_method, cost_model)
+    if key not in cache:
+        with _searcher_lock:
+            cache[key] = _new_searcher(search_method, cost_model)
+    return cache[key]
+
+
+def warm_up_searchers(search_methods: Sequence[str], cost_model: str = "l2") -> None:
+    """Build and exercise the searchers of ``search_methods`` once (pool worker start-up)."""
+    signal = np.concatenate([np.zeros(8), np.ones(8)])
+    for search_method in search_methods:
+        _build_searcher(search_method, cost_model).fit(signal).predict(pen=1.0)
+
+
+def _new_searcher(search_method: str, cost_model: str):
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         match search_method:
@@ -212,21 +253,277 @@ def detect_univariate_changepoints(
     return sorted(remapped_cps | missing_value_cps)
 
 
-def _aggregate_multi_changepoints(
-    metrics: list[str], multi_change_points: list[list[int]]
-) -> tuple[list[int], dict[int, list[str]], dict[str, list[int]]]:
-    cp_to_metrics: dict[int, list[str]] = defaultdict(list)
-    for metric, change_points in zip(metrics, multi_change_points):
-        if change_points is None or len(change_points) < 1:
-            cp_to_metrics[NO_CHANGE_POINTS].append(metric)  # cp == -1 means no change point
-            continue
-        for cp in change_points:
-            cp_to_metrics[cp].append(metric)
+class ChangePointStore:
+    """Change points of every metric in a compact CSR layout (STEP1 output).
+
+    The change points of metric ``i`` (``metrics[i]``) are
+    ``positions[offsets[i]:offsets[i + 1]]``, sorted ascending. ``positions``
+    and ``offsets`` are exactly the ``indices`` / ``indptr`` of the sparse
+    metric x time incidence matrix (see :meth:`incidence`), so later stages
+    work on flat integer arrays rather than per-metric Python lists.
+
+    The dict-of-lists aggregates the pipeline used to pass around
+    (``flatten_change_points``, ``cp_to_metrics``, ``metric_to_cps``) remain
+    available as lazily built, cached views for the dict-based APIs.
+
+    ``detected`` marks the metrics whose detection returned a list (all of
+    them by default). A metric whose detection returned ``None`` has an empty
+    row, is listed under ``NO_CHANGE_POINTS`` in ``cp_to_metrics`` and is left
+    out of ``metric_to_cps``.
+    """
 
-    flatten_change_points: list[int] = sum(multi_change_points, [])
-    metric_to_cps = {metric: cps for metric, cps in zip(metrics, multi_change_points) if cps is not None}
+    def __init__(
+        self,
+        metrics: Sequence[str],
+        offsets: npt.ArrayLike,
+        positions: npt.ArrayLike,
+        detected: npt.ArrayLike | None = None,
+    ) -> None:
+        self.metrics: tuple[str, ...] = tuple(metrics)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.positions = np.asarray(positions, dtype=np.int32)
+        if self.offsets.shape != (len(self.metrics) + 1,) or self.offsets[-1] != self.positions.size:
+            raise ValueError("offsets must have one entry per metric plus one, ending at len(positions)")
+        self.detected = np.ones(len(self.metrics), dtype=bool) if detected is None else np.asarray(detected, dtype=bool)
+        if self.detected.shape != (len(self.metrics),):
+            raise ValueError("detected must have one entry per metric")
+
+    @classmethod
+    def from_lists(
+        cls, metrics: Sequence[str], multi_change_points: Sequence[Sequence[int] | None]
+    ) -> "ChangePointStore":
+        """Build from per-metric change-point lists (``None`` = no change points)."""
+        counts = np.fromiter((len(cps) if cps is not None else 0 for cps in multi_change_points), dtype=np.int64)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        positions = np.fromiter(
+            (cp for cps in multi_change_points if cps is not None for cp in cps), dtype=np.int32, count=int(offsets[-1])
+        )
+        detected = np.fromiter((cps is not None for cps in multi_change_points), dtype=bool, count=len(counts))
+        return cls(metrics, offsets, positions, detected)
+
+    @classmethod
+    def concat(cls, stores: Sequence["ChangePointStore"]) -> "ChangePointStore":
+        """Stack the metrics of several stores (e.g. of column shards) into one store."""
+        counts = np.concatenate([store.counts for store in stores]) if stores else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        positions = np.concatenate([store.positions for store in stores]) if stores else np.zeros(0, dtype=np.int32)
+        detected = np.concatenate([store.detected for store in stores]) if stores else np.zeros(0, dtype=bool)
+        return cls([metric for store in stores for metric in store.metrics], offsets, positions, detected)
+
+    def take(self, metric_ids: npt.ArrayLike) -> "ChangePointStore":
+        """The store of the metrics ``metric_ids``, in that order."""
+        metric_ids = np.asarray(metric_ids, dtype=np.int64)
+        counts = self.counts[metric_ids]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        # Entry k of the new store is entry k - new_start + old_start of the old one.
+        shift = np.repeat(self.offsets[metric_ids] - offsets[:-1], counts)
+        positions = self.positions[np.arange(offsets[-1]) + shift]
+        return ChangePointStore([self.metrics[i] for i in metric_ids], offsets, positions, self.detected[metric_ids])
+
+    @property
+    def n_metrics(self) -> int:
+        return len(self.metrics)
+
+    @property
+    def n_change_points(self) -> int:
+        return int(self.positions.size)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of change points per metric id."""
+        return np.diff(self.offsets)
+
+    @cached_property
+    def metric_ids(self) -> np.ndarray:
+        """Metric id of every entry of ``positions`` (the COO row index)."""
+        return np.repeat(np.arange(self.n_metrics), self.counts)
+
+    @cached_property
+    def metric_index(self) -> dict[str, int]:
+        """Metric name -> metric id."""
+        return {metric: i for i, metric in enumerate(self.metrics)}
+
+    def change_points(self, metric: str) -> np.ndarray:
+        """The sorted change points of ``metric``."""
+        i = self.metric_index[metric]
+        return self.positions[self.offsets[i] : self.offsets[i + 1]]
+
+    def incidence(self, time_series_length: int) -> scipy.sparse.csr_matrix:
+        """Sparse ``(n_metrics, time_series_length)`` 0/1 matrix of (metric, change point) pairs."""
+        data = np.ones(self.n_change_points, dtype=np.int32)
+        return scipy.sparse.csr_matrix((data, self.positions, self.offsets), shape=(self.n_metrics, time_series_length))
+
+    # -- lazy dict-of-lists compatibility views ---------------------------
+
+    @cached_property
+    def flatten_change_points(self) -> list[int]:
+        """Change points of all metrics, with multiplicity, in metric order."""
+        return self.positions.tolist()
+
+    @cached_property
+    def metric_to_cps(self) -> dict[str, list[int]]:
+        """Metric name -> its change points, for the detected metrics."""
+        rows = np.split(self.positions, self.offsets[1:-1])
+        return {metric: cps.tolist() for metric, cps, detected in zip(self.metrics, rows, self.detected) if detected}
+
+    @cached_property
+    def cp_to_metrics(self) -> dict[int, list[str]]:
+        """Change point -> metric names (metrics without any under ``NO_CHANGE_POINTS``)."""
+        cp_to_metrics: dict[int, list[str]] = defaultdict(list)
+        for metric, row in zip(self.metrics, np.split(self.positions, self.offsets[1:-1])):
+            change_points = row.tolist()
+            if len(change_points) < 1:
+                cp_to_metrics[NO_CHANGE_POINTS].append(metric)  # cp == -1 means no change point
+                continue
+            for cp in change_points:
+                cp_to_metrics[cp].append(metric)
+        return cp_to_metrics
+
+
+def _selected_columns(X: pd.DataFrame, columns: npt.ArrayLike | None) -> tuple[list[str], np.ndarray]:
+    """Names and integer positions of the columns of ``X`` to detect on (all by default)."""
+    positions = np.arange(X.shape[1]) if columns is None else np.asarray(columns, dtype=np.int64)
+    return X.columns[positions].tolist(), positions
+
+
+def detect_change_point_store(
+    X: pd.DataFrame,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    penalty_adjust: float,
+    n_jobs: int = -1,
+    sigma_estimator: str = "std",
+    columns: npt.ArrayLike | None = None,
+    executor: Executor | None = None,
+) -> ChangePointStore:
+    """Detect the change points of every column of ``X`` into a :class:`ChangePointStore`.
+
+    ``columns`` restricts detection to those integer column positions; each
+    column is read in place, so no sub-frame of ``X`` is built. The columns
+    run on ``n_jobs`` joblib workers, or on ``executor`` when given (e.g. a warm
+    :class:`metricsifter.parallel.WorkerPool` or a
+    :class:`metricsifter.remote.RemoteExecutor`) as a few blocks of columns per
+    worker (see :func:`detect_column_block`).
+    """
+    if executor is not None:
+        return _detect_store_in_blocks(
+            X, search_method, cost_model, penalty, penalty_adjust, sigma_estimator, columns, executor, n_jobs
+        )
+    metrics, tasks = change_point_tasks(
+        X, search_method, cost_model, penalty, penalty_adjust, sigma_estimator=sigma_estimator, columns=columns
+    )
+    multi_change_points = parallel.map_tasks(detect_univariate_changepoints, tasks, n_jobs=n_jobs)
+    return ChangePointStore.from_lists(metrics, multi_change_points)
 
-    return flatten_change_points, cp_to_metrics, metric_to_cps
+
+def detect_column_block(
+    block: np.ndarray,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    penalty_adjust: float,
+    sigma_estimator: str = "std",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Detect the change points of every column of a 2D ``(time, metric)`` block.
+
+    The executor task of :func:`detect_change_point_store`: a block travels as
+    one contiguous array and its result as the compact ``(counts, positions)``
+    arrays of a :class:`ChangePointStore` (change points per column and their
+    concatenation), rather than one Python list per metric.
+    """
+    multi_change_points = [
+        detect_univariate_changepoints(block[:, j], search_method, cost_model, penalty, penalty_adjust, sigma_estimator)
+        for j in range(block.shape[1])
+    ]
+    store = ChangePointStore.from_lists(range(block.shape[1]), multi_change_points)
+    return store.counts, store.positions
+
+
+def _detect_store_in_blocks(
+    X: pd.DataFrame,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    penalty_adjust: float,
+    sigma_estimator: str,
+    columns: npt.ArrayLike | None,
+    executor: Executor,
+    n_jobs: int,
+) -> ChangePointStore:
+    """:func:`detect_change_point_store` as :func:`detect_column_block` tasks, a few blocks per worker."""
+    metrics, positions = _selected_columns(X, columns)
+    n_blocks = min(len(positions), 4 * parallel.executor_workers(executor, n_jobs))
+    tasks = [
+        (
+            X.iloc[:, positions[block]].to_numpy(dtype=np.float64, na_value=np.nan),
+            search_method,
+            cost_model,
+            penalty,
+            penalty_adjust,
+            sigma_estimator,
+        )
+        for block in (gen_even_slices(len(positions), n_blocks) if n_blocks else ())
+    ]
+    pieces = parallel.map_tasks(detect_column_block, tasks, executor=executor)
+    counts = np.concatenate([piece[0] for piece in pieces]) if pieces else np.zeros(0, dtype=np.int64)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    flat = np.concatenate([piece[1] for piece in pieces]) if pieces else np.zeros(0, dtype=np.int32)
+    return ChangePointStore(metrics, offsets, flat)
+
+
+def change_magnitude_scores(X: pd.DataFrame, columns: npt.ArrayLike | None = None) -> np.ndarray:
+    """A cheap level-shift score of every column in ``columns``, to run detection strongest first.
+
+    The maximum of the standardized CUSUM ``|cumsum(x - mean)| / (std * sqrt(n))``
+    over the non-missing values: one vectorized pass per column, far cheaper
+    than a change-point search. Constant and all-NaN columns score 0.
+    """
+    _, positions = _selected_columns(X, columns)
+    scores = np.zeros(len(positions))
+    n_rows = X.shape[0]
+    if n_rows == 0:
+        return scores
+    step = max(1, _SCORE_BLOCK_SIZE // n_rows)
+    for start in range(0, len(positions), step):
+        block = X.iloc[:, positions[start : start + step]].to_numpy(dtype=float)
+        valid = ~np.isnan(block)
+        n = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            centered = np.where(valid, block - np.nansum(block, axis=0) / n, 0.0)
+            std = np.sqrt((centered**2).sum(axis=0) / n)
+            score = np.abs(np.cumsum(centered, axis=0)).max(axis=0) / (std * np.sqrt(n))
+        scores[start : start + block.shape[1]] = np.nan_to_num(score, nan=0.0, posinf=0.0)
+    return scores
+
+
+def change_point_tasks(
+    X: pd.DataFrame,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    penalty_adjust: float,
+    sigma_estimator: str = "std",
+    columns: npt.ArrayLike | None = None,
+) -> tuple[list[str], list[tuple]]:
+    """The per-column work of :func:`detect_change_point_store`, unscheduled.
+
+    Returns ``(metrics, tasks)``: every task is the argument tuple of one
+    :func:`detect_univariate_changepoints` call, and
+    ``ChangePointStore.from_lists(metrics, results)`` assembles their results.
+    Callers detecting several frames at once schedule the tasks of all frames
+    as one job list.
+    """
+    metrics, positions = _selected_columns(X, columns)
+    tasks = [
+        (X.iloc[:, j].to_numpy(), search_method, cost_model, penalty, penalty_adjust, sigma_estimator)
+        for j in positions
+    ]
+    return metrics, tasks
 
 
 def detect_multi_changepoints(
@@ -238,14 +535,10 @@ def detect_multi_changepoints(
     n_jobs: int = -1,
     sigma_estimator: str = "std",
 ) -> tuple[list[int], dict[int, list[str]], dict[str, list[int]]]:
-    metrics: list[str] = X.columns.tolist()
-    multi_change_points = Parallel(n_jobs=n_jobs)(
-        delayed(detect_univariate_changepoints)(
-            X[metric].to_numpy(), search_method, cost_model, penalty, penalty_adjust, sigma_estimator
-        )
-        for metric in metrics
+    store = detect_change_point_store(
+        X, search_method, cost_model, penalty, penalty_adjust, n_jobs=n_jobs, sigma_estimator=sigma_estimator
     )
-    return _aggregate_multi_changepoints(metrics, multi_change_points)
+    return store.flatten_change_points, store.cp_to_metrics, store.metric_to_cps
 
 
 def _univariate_penalty_path(
@@ -274,10 +567,20 @@ def _univariate_penalty_path(
     if core is None or core.size < 2:
         return [[] for _ in penalty_adjust_grid], missing_value_cps
 
-    searcher = _build_searcher(search_method, cost_model)
-    base_pen = _base_penalty(core, penalty, sigma_estimator)
-    fitted = searcher.fit(core)
+    fitted = _build_searcher(search_method, cost_model).fit(core)
+    return _predict_path(fitted, core, left, penalty, penalty_adjust_grid, sigma_estimator), missing_value_cps
+
 
+def _predict_path(
+    fitted,
+    core: np.ndarray,
+    left: int,
+    penalty: str | float,
+    penalty_adjust_grid: tuple[float, ...],
+    sigma_estimator: str,
+) -> list[list[int]]:
+    """The change points a fitted searcher predicts at every ``penalty_adjust`` of the grid."""
+    base_pen = _base_penalty(core, penalty, sigma_estimator)
     path: list[list[int]] = []
     for adjust in penalty_adjust_grid:
         try:
@@ -288,7 +591,39 @@ def _univariate_penalty_path(
         if cps is None:
             raise ValueError("Change point detection failed: predict() returned None.")
         path.append(sorted(int(cp) + left for cp in cps[:-1]))
-    return path, missing_value_cps
+    return path
+
+
+def univariate_penalty_sweep(
+    x: np.ndarray,
+    search_method: str,
+    cost_model: str,
+    settings: Sequence[tuple[str | float, str, tuple[float, ...]]],
+    tolerance: int,
+) -> list[tuple[list[list[int]], list[int], list[int]]]:
+    """Penalty paths of one metric for several penalty settings, from a single searcher fit.
+
+    Every setting is a ``(penalty, sigma_estimator, penalty_adjust_grid)``
+    triple; the ``fit`` only depends on the searcher, so every setting costs
+    just its ``predict`` calls. Returns one
+    :func:`univariate_penalty_path_with_matches`-shaped result per setting
+    (the matched counts are empty for a single-point grid).
+    """
+    missing_value_cps = sorted({int(i) for i in _detect_changepoints_with_missing_values(x)})
+    core, left = _prepare_core(x)
+    fitted = None
+    if core is not None and core.size >= 2:
+        fitted = _build_searcher(search_method, cost_model).fit(core)
+
+    results = []
+    for penalty, sigma_estimator, grid in settings:
+        if fitted is None:
+            path = [[] for _ in grid]
+        else:
+            path = _predict_path(fitted, core, left, penalty, grid, sigma_estimator)
+        matched = _adjacent_matched_counts(path, tolerance) if len(grid) > 1 else []
+        results.append((path, missing_value_cps, matched))
+    return results
 
 
 def _tolerant_matched_count(a: list[int], b: list[int], tolerance: int) -> int:
@@ -306,11 +641,38 @@ def _tolerant_matched_count(a: list[int], b: list[int], tolerance: int) -> int:
     return matched
 
 
+def _plateau_tolerance(series_length: int) -> int:
+    """Match tolerance of the plateau search: 1% of the series, at least one sample."""
+    return max(1, round(0.01 * series_length))
+
+
+def _adjacent_matched_counts(path: list[list[int]], tolerance: int) -> list[int]:
+    """Tolerant matches between the change points of each pair of adjacent grid points of one metric."""
+    return [_tolerant_matched_count(path[g], path[g + 1], tolerance) for g in range(len(path) - 1)]
+
+
+def univariate_penalty_path_with_matches(
+    x: np.ndarray,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    penalty_adjust_grid: tuple[float, ...],
+    sigma_estimator: str,
+    tolerance: int,
+) -> tuple[list[list[int]], list[int], list[int]]:
+    """:func:`_univariate_penalty_path` plus its adjacent matched counts, computed in the same worker."""
+    path, missing_value_cps = _univariate_penalty_path(
+        x, search_method, cost_model, penalty, penalty_adjust_grid, sigma_estimator
+    )
+    return path, missing_value_cps, _adjacent_matched_counts(path, tolerance)
+
+
 def select_penalty_adjust(
     paths: list[list[list[int]]],
     series_length: int,
     penalty_adjust_grid: tuple[float, ...] = PENALTY_ADJUST_GRID,
     plateau_threshold: float = PLATEAU_JACCARD_THRESHOLD,
+    matched_counts: list[list[int]] | None = None,
 ) -> tuple[float, dict]:
     """Pick ``penalty_adjust`` by penalty-plateau detection (stability selection).
 
@@ -337,6 +699,10 @@ def select_penalty_adjust(
         series_length: Length of the time axis (defines the match tolerance).
         penalty_adjust_grid: Ascending candidate multipliers.
         plateau_threshold: Minimum adjacent similarity within a plateau.
+        matched_counts: Optional ``matched_counts[m][g]`` = tolerant matches of
+            metric ``m`` between grid points ``g`` and ``g + 1``, as computed by
+            :func:`_adjacent_matched_counts` (e.g. inside the detection workers).
+            Computed here when omitted.
 
     Returns:
         ``(resolved, diagnostics)`` where diagnostics carries ``grid``,
@@ -344,12 +710,14 @@ def select_penalty_adjust(
     """
     grid = [float(a) for a in penalty_adjust_grid]
     n_grid = len(grid)
-    tolerance = max(1, round(0.01 * series_length))
+    if matched_counts is None:
+        tolerance = _plateau_tolerance(series_length)
+        matched_counts = [_adjacent_matched_counts(path, tolerance) for path in paths]
 
     counts = [sum(len(path[g]) for path in paths) for g in range(n_grid)]
     jaccards: list[float] = []
     for g in range(n_grid - 1):
-        intersection = sum(_tolerant_matched_count(path[g], path[g + 1], tolerance) for path in paths)
+        intersection = sum(matched[g] for matched in matched_counts)
         union = counts[g] + counts[g + 1] - intersection
         jaccards.append(intersection / union if union > 0 else 1.0)
 
@@ -381,7 +749,7 @@ def select_penalty_adjust(
     return grid[(start + end) // 2], diagnostics
 
 
-def detect_multi_changepoints_with_penalty_tuning(
+def detect_change_point_store_with_penalty_tuning(
     X: pd.DataFrame,
     search_method: str,
     cost_model: str,
@@ -389,41 +757,125 @@ def detect_multi_changepoints_with_penalty_tuning(
     n_jobs: int = -1,
     sigma_estimator: str = "std",
     penalty_adjust_grid: tuple[float, ...] = PENALTY_ADJUST_GRID,
-) -> tuple[list[int], dict[int, list[str]], dict[str, list[int]], float, dict]:
-    """Like :func:`detect_multi_changepoints`, but with ``penalty_adjust`` tuned.
-
-    Computes the penalty path of every metric in parallel, selects the plateau
-    multiplier via :func:`select_penalty_adjust`, and assembles the final
+    columns: npt.ArrayLike | None = None,
+    executor: Executor | None = None,
+) -> tuple[ChangePointStore, float, dict]:
+    """Like :func:`detect_change_point_store`, but with ``penalty_adjust`` tuned.
+
+    Computes the penalty path of every metric in parallel -- together with its
+    adjacent tolerant-match counts, so the plateau search itself only sums them
+    -- selects the plateau multiplier via :func:`select_penalty_adjust`, and assembles the final
     change points from the already-computed path at the chosen grid point (no
     re-detection), unioned with the penalty-invariant missing-value boundaries.
 
-    Returns ``(flatten_change_points, cp_to_metrics, metric_to_cps,
-    resolved_penalty_adjust, diagnostics)``.
+    ``columns`` and ``executor`` are as in :func:`detect_change_point_store`.
+
+    Returns ``(store, resolved_penalty_adjust, diagnostics)``.
     """
-    metrics: list[str] = X.columns.tolist()
-    grid = tuple(float(a) for a in penalty_adjust_grid)
-    results = Parallel(n_jobs=n_jobs)(
-        delayed(_univariate_penalty_path)(
-            X[metric].to_numpy(), search_method, cost_model, penalty, grid, sigma_estimator
-        )
-        for metric in metrics
+    metrics, tasks = penalty_path_tasks(
+        X, search_method, cost_model, penalty, sigma_estimator, penalty_adjust_grid=penalty_adjust_grid, columns=columns
+    )
+    results = parallel.map_tasks(univariate_penalty_path_with_matches, tasks, n_jobs=n_jobs, executor=executor)
+    store, resolved, diagnostics = store_from_penalty_paths(
+        metrics, results, series_length=X.shape[0], penalty_adjust_grid=penalty_adjust_grid
     )
-    paths = [path for path, _ in results]
-    missing_value_cps = [mv_cps for _, mv_cps in results]
+    if store is None:
+        # A custom grid may not contain the fallback multiplier; detect once at it.
+        store = detect_change_point_store(
+            X,
+            search_method,
+            cost_model,
+            penalty,
+            resolved,
+            n_jobs=n_jobs,
+            sigma_estimator=sigma_estimator,
+            columns=columns,
+            executor=executor,
+        )
+    return store, resolved, diagnostics
 
-    resolved, diagnostics = select_penalty_adjust(paths, series_length=X.shape[0], penalty_adjust_grid=grid)
+
+def penalty_path_tasks(
+    X: pd.DataFrame,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    sigma_estimator: str = "std",
+    penalty_adjust_grid: tuple[float, ...] = PENALTY_ADJUST_GRID,
+    columns: npt.ArrayLike | None = None,
+) -> tuple[list[str], list[tuple]]:
+    """The per-column work of :func:`detect_change_point_store_with_penalty_tuning`, unscheduled.
+
+    Returns ``(metrics, tasks)``: every task is the argument tuple of one
+    :func:`univariate_penalty_path_with_matches` call;
+    :func:`store_from_penalty_paths` assembles their results.
+    """
+    metrics, positions = _selected_columns(X, columns)
+    grid = tuple(float(a) for a in penalty_adjust_grid)
+    tolerance = _plateau_tolerance(X.shape[0])
+    tasks = [
+        (X.iloc[:, j].to_numpy(), search_method, cost_model, penalty, grid, sigma_estimator, tolerance)
+        for j in positions
+    ]
+    return metrics, tasks
+
+
+def store_from_penalty_paths(
+    metrics: list[str],
+    results: list[tuple],
+    series_length: int,
+    penalty_adjust_grid: tuple[float, ...] = PENALTY_ADJUST_GRID,
+) -> tuple[ChangePointStore | None, float, dict]:
+    """Select the plateau ``penalty_adjust`` from computed penalty paths and assemble the store.
+
+    ``results`` are the outputs of the :func:`penalty_path_tasks` of
+    ``metrics``. The store is read off the paths at the chosen grid point,
+    unioned with the penalty-invariant missing-value boundaries. It is
+    ``None`` when the resolved multiplier is the fallback and not on the grid;
+    the caller then detects once at it.
+
+    Returns ``(store, resolved_penalty_adjust, diagnostics)``.
+    """
+    grid = tuple(float(a) for a in penalty_adjust_grid)
+    paths = [path for path, _, _ in results]
+    missing_value_cps = [mv_cps for _, mv_cps, _ in results]
+    matched_counts = [matched for _, _, matched in results]
+
+    resolved, diagnostics = select_penalty_adjust(
+        paths, series_length=series_length, penalty_adjust_grid=grid, matched_counts=matched_counts
+    )
     if not metrics:
         diagnostics["reason"] = "no_metrics"
+    if resolved not in grid:
+        return None, resolved, diagnostics
 
-    if resolved in grid:
-        g_star = grid.index(resolved)
-        multi_change_points = [
-            sorted(set(path[g_star]) | set(mv_cps)) for path, mv_cps in zip(paths, missing_value_cps)
-        ]
-        flatten, cp_to_metrics, metric_to_cps = _aggregate_multi_changepoints(metrics, multi_change_points)
-    else:
-        # A custom grid may not contain the fallback multiplier; detect once at it.
-        flatten, cp_to_metrics, metric_to_cps = detect_multi_changepoints(
-            X, search_method, cost_model, penalty, resolved, n_jobs=n_jobs, sigma_estimator=sigma_estimator
-        )
-    return flatten, cp_to_metrics, metric_to_cps, resolved, diagnostics
+    g_star = grid.index(resolved)
+    multi_change_points = [sorted(set(path[g_star]) | set(mv_cps)) for path, mv_cps in zip(paths, missing_value_cps)]
+    return ChangePointStore.from_lists(metrics, multi_change_points), resolved, diagnostics
+
+
+def detect_multi_changepoints_with_penalty_tuning(
+    X: pd.DataFrame,
+    search_method: str,
+    cost_model: str,
+    penalty: str | float,
+    n_jobs: int = -1,
+    sigma_estimator: str = "std",
+    penalty_adjust_grid: tuple[float, ...] = PENALTY_ADJUST_GRID,
+) -> tuple[list[int], dict[int, list[str]], dict[str, list[int]], float, dict]:
+    """Like :func:`detect_multi_changepoints`, but with ``penalty_adjust`` tuned.
+
+    Dict-based front end of :func:`detect_change_point_store_with_penalty_tuning`.
+    Returns ``(flatten_change_points, cp_to_metrics, metric_to_cps,
+    resolved_penalty_adjust, diagnostics)``.
+    """
+    store, resolved, diagnostics = detect_change_point_store_with_penalty_tuning(
+        X,
+        search_method,
+        cost_model,
+        penalty,
+        n_jobs=n_jobs,
+        sigma_estimator=sigma_estimator,
+        penalty_adjust_grid=penalty_adjust_grid,
+    )
+    return store.flatten_change_points, store.cp_to_metrics, store.metric_to_cps, resolved, diagnostics
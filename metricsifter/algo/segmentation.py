@@ -1,12 +1,16 @@
 from collections import defaultdict
+from concurrent.futures import Executor
 from typing import Callable, Final
 
 import numpy as np
 import numpy.typing as npt
-import scipy.signal
-from statsmodels.nonparametric.kde import KDEUnivariate
+import scipy.sparse
+from joblib import effective_n_jobs
+from statsmodels.nonparametric import bandwidths
+from statsmodels.sandbox.nonparametric import kernels
 
-from metricsifter.algo.detection import NO_CHANGE_POINTS
+from metricsifter import parallel, utils
+from metricsifter.algo.detection import NO_CHANGE_POINTS, ChangePointStore
 
 #: Bandwidth used when the ``"auto"`` stability selection cannot run or finds
 #: no admissible candidate (matches the historical default).
@@ -18,18 +22,178 @@ N_BOOTSTRAP: Final[int] = 20
 #: Minimum distinct change points required to attempt bandwidth tuning.
 MIN_UNIQUE_CHANGE_POINTS: Final[int] = 3
 
+#: Resamples added per round when the bootstrap stops early.
+BOOTSTRAP_BATCH_SIZE: Final[int] = 5
+
+#: Normal quantile of the two-sided 95% confidence interval on a candidate's stability.
+BOOTSTRAP_CONFIDENCE_Z: Final[float] = 1.96
+
+
+class ScaleSpace:
+    """Change-point histogram of one sift, segmentable at any bandwidth on demand.
+
+    The same change-point multiset is segmented at many bandwidths -- every
+    candidate of the ``bandwidth="auto"`` search, the final segmentation and the
+    density plot. This object is built once per sift from the flattened change
+    points, keeps them as a histogram (unique positions + multiplicities) and
+    memoizes the resolved bandwidth, the KDE density and its minima per
+    bandwidth, so each of those is computed at most once.
+
+    The density is the one the segmentation has always used,
+    ``statsmodels``' ``KDEUnivariate(x).fit(kernel="gau", bw=h).evaluate``
+    on the row positions ``0..T-1``, bit for bit: the kernels of the change
+    points are summed in the order they were given, and the sum is scaled
+    by ``1 / (h * n)``. Only the kernel of each change point is evaluated
+    once per bandwidth over all offsets instead of once per point.
+    """
+
+    def __init__(self, change_points: npt.ArrayLike, time_series_length: int) -> None:
+        self.change_points = np.asarray(change_points, dtype=np.int64)
+        self.time_series_length = int(time_series_length)
+        self.n_change_points = int(self.change_points.size)
+        self.positions, self.counts = np.unique(self.change_points, return_counts=True)
+        self._bandwidths: dict[str, float] = {}
+        # Unnormalized kernel sums per bandwidth, kept so extended() can reuse them.
+        self._kernel_sums: dict[float, np.ndarray] = {}
+        self._densities: dict[float, np.ndarray] = {}
+        self._minima: dict[float, np.ndarray] = {}
+
+    def extended(self, change_points: npt.ArrayLike) -> "ScaleSpace":
+        """This scale space with ``change_points`` added (e.g. from newly detected metrics).
+
+        The kernel sums of the bandwidths evaluated so far are reused, so their
+        densities only cost the kernels of the new change points. The
+        rule-of-thumb bandwidths depend on every change point and are resolved
+        anew.
+        """
+        x = np.asarray(change_points, dtype=np.int64)
+        merged = ScaleSpace(np.concatenate([self.change_points, x]), self.time_series_length)
+        for h, kernel_sum in self._kernel_sums.items():
+            merged._kernel_sums[h] = _sequential_kernel_sum(x, h, self.time_series_length, kernel_sum)
+        return merged
+
+    @property
+    def n_evaluations(self) -> int:
+        """Number of KDE densities computed so far (one per distinct bandwidth)."""
+        return len(self._densities)
+
+    @property
+    def is_degenerate(self) -> bool:
+        """Whether no density can be formed (no change points, or a single unique position)."""
+        return self.positions.size < 2
+
+    def bandwidth(self, kde_bandwidth: float | str) -> float:
+        """Resolve a float or a rule-of-thumb name (``"scott"`` / ``"silverman"``) to a float."""
+        if not isinstance(kde_bandwidth, str):
+            return float(kde_bandwidth)
+        if kde_bandwidth not in self._bandwidths:
+            self._bandwidths[kde_bandwidth] = float(
+                bandwidths.select_bandwidth(self.change_points, kde_bandwidth, kernels.Gaussian())
+            )
+        return self._bandwidths[kde_bandwidth]
+
+    def density(self, kde_bandwidth: float | str) -> np.ndarray | None:
+        """KDE density at each row position, or ``None`` when :attr:`is_degenerate`."""
+        if self.is_degenerate:
+            return None
+        h = self.bandwidth(kde_bandwidth)
+        if h not in self._densities:
+            if h not in self._kernel_sums:
+                self._kernel_sums[h] = _sequential_kernel_sum(self.change_points, h, self.time_series_length)
+            self._densities[h] = 1.0 / (h * self.n_change_points) * self._kernel_sums[h]
+        return self._densities[h]
+
+    def minima(self, kde_bandwidth: float | str) -> np.ndarray:
+        """Row positions of the strict local minima of the density (empty when degenerate)."""
+        density = self.density(kde_bandwidth)
+        if density is None:
+            return np.empty(0, dtype=np.int64)
+        h = self.bandwidth(kde_bandwidth)
+        if h not in self._minima:
+            self._minima[h] = np.flatnonzero(_kde_minima(density[np.newaxis, :])[0])
+        return self._minima[h]
+
+
+def _gaussian_kernel(kde_bandwidth: float, time_series_length: int) -> tuple[np.ndarray, int]:
+    """The Gaussian kernel at every offset ``-(T-1)..T-1``, and the largest offset it has not underflowed at.
+
+    Evaluated as ``statsmodels``' Gaussian kernel evaluates it, so a sum of
+    these values is bit-identical to the kernel sum of ``KDEUnivariate``
+    taken in the same order.
+    """
+    length = int(time_series_length)
+    offsets = np.arange(-(length - 1), length, dtype=float)
+    kernel = 1.0 / np.sqrt(2.0 * np.pi) * np.exp(-((offsets / kde_bandwidth) ** 2) / 2.0)
+    return kernel, length - 1 - int(np.flatnonzero(kernel)[0])
+
+
+def _sequential_kernel_sum(
+    change_points: np.ndarray, kde_bandwidth: float, time_series_length: int, initial: np.ndarray | None = None
+) -> np.ndarray:
+    """Unnormalized Gaussian kernel sum at every row position, adding the change points one by one.
+
+    Continues from ``initial`` when given. Each change point only adds its
+    kernel over the steps where it has not underflowed to zero (adding the
+    zeros would not change the sum).
+    """
+    length = int(time_series_length)
+    kernel_sum = np.zeros(length) if initial is None else initial.copy()
+    kernel, reach = _gaussian_kernel(kde_bandwidth, length)
+    for position in np.asarray(change_points, dtype=np.int64).tolist():
+        start, stop = max(0, position - reach), min(length, position + reach + 1)
+        shift = length - 1 - position
+        kernel_sum[start:stop] += kernel[start + shift : stop + shift]
+    return kernel_sum
+
+
+def _kernel_sums(
+    positions: np.ndarray, weights: np.ndarray, kde_bandwidth: float, time_series_length: int
+) -> np.ndarray:
+    """Unnormalized Gaussian kernel sums at every row position, one row per row of ``weights``.
+
+    ``weights[:, k]`` are the multiplicities of ``positions[k]`` in the rows.
+    The kernel only depends on the offset between a position and a time step,
+    so it is evaluated once over all offsets and each position adds it over
+    the steps where it has not underflowed to zero. Positions are added in
+    ascending order, so a row's sums do not depend on the other rows:
+    identical rows get bit-identical sums (a tied valley may hinge on the
+    last bit).
+    """
+    length = int(time_series_length)
+    kernel_sums = np.zeros((weights.shape[0], length))
+    kernel, reach = _gaussian_kernel(kde_bandwidth, length)
+    for position, weight in zip(np.asarray(positions, dtype=np.int64).tolist(), weights.T):
+        start, stop = max(0, position - reach), min(length, position + reach + 1)
+        shift = length - 1 - position
+        kernel_sums[:, start:stop] += weight[:, np.newaxis] * kernel[start + shift : stop + shift]
+    return kernel_sums
+
+
+def _kde_minima(kernel_sums: np.ndarray) -> np.ndarray:
+    """Strict local minima of every row of a ``(B, T)`` density matrix as a boolean mask.
+
+    Same edge rule as ``scipy.signal.argrelextrema(e, np.less)``: the first and
+    last time steps are never minima.
+    """
+    minima = np.zeros(kernel_sums.shape, dtype=bool)
+    inner = kernel_sums[:, 1:-1]
+    minima[:, 1:-1] = (inner < kernel_sums[:, :-2]) & (inner < kernel_sums[:, 2:])
+    return minima
+
 
 def segment_nested_changepoints(
     flatten_change_points: list[int],
     cp_to_metrics: dict[int, list[str]],
     time_series_length: int,
     kde_bandwidth: float | str = 2.5,
+    scale_space: ScaleSpace | None = None,
 ) -> tuple[dict[int, set[str]], dict[int, npt.NDArray]]:
     _, label_to_change_points = segment_changepoints_with_kde(
         flatten_change_points,
         time_series_length=time_series_length,
         kde_bandwidth=kde_bandwidth,
         unique_values=True,
+        scale_space=scale_space,
     )
 
     label_to_metrics: dict[int, set[str]] = defaultdict(set)
@@ -42,31 +206,73 @@ def segment_nested_changepoints(
     return label_to_metrics, label_to_change_points
 
 
+def cluster_change_point_store(
+    store: ChangePointStore,
+    time_series_length: int,
+    kde_bandwidth: float | str = 2.5,
+    scale_space: ScaleSpace | None = None,
+) -> tuple[np.ndarray, list[np.ndarray], dict[int, npt.NDArray]]:
+    """Label every (metric, change point) pair of ``store`` into KDE clusters.
+
+    One vectorized pass over the store's arrays. Returns ``(labels, member_ids,
+    label_to_change_points)`` for the non-empty clusters in ascending label
+    order, where ``member_ids[i]`` are the ascending metric ids (positions in
+    ``store.metrics``) of cluster ``labels[i]``.
+    """
+    if scale_space is None:
+        scale_space = ScaleSpace(store.positions, time_series_length)
+    minima = np.zeros(time_series_length, dtype=bool)
+    minima[scale_space.minima(kde_bandwidth)] = True
+    labels, members, label_to_change_points = _segments_from_minima(
+        minima, store.metric_ids, store.positions, store.n_metrics
+    )
+    return labels, _unpack_bitsets(members), label_to_change_points
+
+
+def segment_change_point_store(
+    store: ChangePointStore,
+    time_series_length: int,
+    kde_bandwidth: float | str = 2.5,
+    scale_space: ScaleSpace | None = None,
+) -> tuple[dict[int, set[str]], dict[int, npt.NDArray]]:
+    """:func:`segment_nested_changepoints` on a :class:`ChangePointStore`.
+
+    Labels the store with :func:`cluster_change_point_store` instead of
+    walking ``cp_to_metrics`` per change point. Returns the same
+    ``(label_to_metrics, label_to_change_points)`` for the non-empty clusters.
+    """
+    labels, member_ids, label_to_change_points = cluster_change_point_store(
+        store, time_series_length, kde_bandwidth, scale_space
+    )
+    label_to_metrics: dict[int, set[str]] = {
+        int(label): {store.metrics[m] for m in ids} for label, ids in zip(labels, member_ids)
+    }
+    return label_to_metrics, label_to_change_points
+
+
 def compute_kde_density(
     change_points: list[int],
     time_series_length: int,
     kde_bandwidth: str | float = 2.5,
+    scale_space: ScaleSpace | None = None,
 ) -> tuple[np.ndarray, np.ndarray] | None:
     """Evaluate the change-point KDE on the time axis (for visualization).
 
-    This mirrors the exact density computation performed inside
-    :func:`segment_changepoints_with_kde` so that plots can overlay the same
-    curve the segmentation logic reasons about. It is a pure, additive helper:
-    the internal segmentation flow is unchanged.
+    This is the exact density :func:`segment_changepoints_with_kde` reasons
+    about, so plots can overlay the same curve. Pass the sift's
+    :class:`ScaleSpace` (``SiftResult.scale_space``) to reuse its memoized
+    density instead of recomputing it from ``change_points``.
 
     Returns ``(s, e)`` where ``s`` is the evaluation grid (row positions) and
     ``e`` is the estimated density, or ``None`` when a density cannot be formed
     (empty input or zero-variance change points, e.g. a single unique value).
     """
-    if len(change_points) == 0:
+    if scale_space is None:
+        scale_space = ScaleSpace(change_points, time_series_length)
+    e = scale_space.density(kde_bandwidth)
+    if e is None:
         return None
-    x = np.array(change_points, dtype=int)
-    if x.std() == 0.0:
-        return None
-    dens = KDEUnivariate(x)
-    dens.fit(kernel="gau", bw=kde_bandwidth, fft=True)
-    s = np.linspace(start=0, stop=time_series_length - 1, num=time_series_length)
-    e = dens.evaluate(s)
+    s = np.linspace(start=0, stop=scale_space.time_series_length - 1, num=scale_space.time_series_length)
     return s, e
 
 
@@ -75,6 +281,7 @@ def segment_changepoints_with_kde(
     time_series_length: int,
     kde_bandwidth: str | float,
     unique_values: bool = True,
+    scale_space: ScaleSpace | None = None,
 ) -> tuple[np.ndarray, dict[int, npt.NDArray]]:
     if len(change_points) == 0:
         raise ValueError("change_points should not be empty")
@@ -85,12 +292,10 @@ def segment_changepoints_with_kde(
             0: np.unique(x) if unique_values else x
         }  # the all change points belongs to cluster 0.
 
-    dens = KDEUnivariate(x)
-    dens.fit(kernel="gau", bw=kde_bandwidth, fft=True)
+    if scale_space is None:
+        scale_space = ScaleSpace(x, time_series_length)
     s = np.linspace(start=0, stop=time_series_length - 1, num=time_series_length)
-    e = dens.evaluate(s)
-
-    mi = scipy.signal.argrelextrema(e, np.less)[0]
+    mi = scale_space.minima(kde_bandwidth)
     clusters = []
     if len(mi) <= 0:
         clusters.append(np.arange(len(x)))
@@ -114,49 +319,214 @@ def _bandwidth_grid(time_series_length: int) -> list[float]:
     return [float(h) for h in np.geomspace(1.0, upper, num=12)]
 
 
-def _rebuild_aggregates(
-    sampled_metrics: list[str], metric_to_cps: dict[str, list[int]]
-) -> tuple[list[int], dict[int, list[str]]]:
-    """Rebuild ``(flatten_change_points, cp_to_metrics)`` from a bootstrap sample.
-
-    A metric drawn multiple times contributes its change points that many times
-    to the flattened list (raising its KDE density weight, as in the full run),
-    while ``cp_to_metrics`` stays name-based so the segment membership keeps set
-    semantics.
-    """
-    flatten: list[int] = []
-    cp_to_metrics: dict[int, list[str]] = defaultdict(list)
-    seen: set[str] = set()
-    for metric in sampled_metrics:
-        cps = metric_to_cps[metric]
-        flatten.extend(cps)
-        if metric not in seen:
-            seen.add(metric)
-            for cp in cps:
-                cp_to_metrics[cp].append(metric)
-    return flatten, cp_to_metrics
-
-
-def _mean_pairwise_jaccard(sets: list[frozenset[str]]) -> float:
-    total = 0.0
-    n_pairs = 0
-    for i in range(len(sets)):
-        for j in range(i + 1, len(sets)):
-            union = sets[i] | sets[j]
-            total += len(sets[i] & sets[j]) / len(union) if union else 1.0
-            n_pairs += 1
-    return total / n_pairs if n_pairs else 1.0
+def _resample_histograms(
+    weights: np.ndarray, cp_metric: np.ndarray, cp_pos: np.ndarray, time_series_length: int
+) -> np.ndarray:
+    """Change-point histograms of every resample as one ``(n_resamples, T)`` matrix.
 
+    ``weights[b, m]`` is how many times metric ``m`` was drawn in resample ``b``;
+    the product with the metric-by-time incidence gives, per time step, the
+    change-point multiplicity the resample's flattened list would have.
+    """
+    incidence = scipy.sparse.csr_matrix(
+        (np.ones(cp_pos.size), (cp_metric, cp_pos)), shape=(weights.shape[1], time_series_length)
+    )
+    return np.asarray((incidence.T @ weights.T).T)
 
-def select_bandwidth(
-    flatten_change_points: list[int],
-    cp_to_metrics: dict[int, list[str]],
+
+def _batched_kde_minima(histograms: np.ndarray, kde_bandwidth: float) -> np.ndarray:
+    """Local minima of the Gaussian KDE of every histogram row, as a boolean ``(B, T)`` mask.
+
+    Every row's density is the exact Gaussian kernel sum :class:`ScaleSpace`
+    segments the full data with, evaluated for all rows at once over the
+    positions any row holds. (A discrete FFT convolution would be cheaper, but
+    its round-off in the flat or underflowed tails creates spurious minima the
+    exact sum does not have.) It is summed per position, weighted by the
+    row's multiplicities, so it can differ from :class:`ScaleSpace` in the
+    last bits, which only decides whether a valley with an exactly tied
+    bottom splits. Normalization is dropped since it does not move the
+    minima.
+    """
+    positions = np.flatnonzero(histograms.any(axis=0))
+    return _kde_minima(_kernel_sums(positions, histograms[:, positions], kde_bandwidth, histograms.shape[1]))
+
+
+def _n_words(n_bits: int) -> int:
+    """Number of uint64 words in a packed bitset of ``n_bits`` bits (at least one)."""
+    return max(1, -(-n_bits // 64))
+
+
+def _pack_bitsets(rows: np.ndarray, bits: np.ndarray, n_rows: int, n_bits: int) -> np.ndarray:
+    """Pack ``(row, bit)`` pairs into an ``(n_rows, ceil(n_bits / 64))`` uint64 bitset matrix."""
+    words = np.zeros((n_rows, _n_words(n_bits)), dtype=np.uint64)
+    bits = np.asarray(bits, dtype=np.uint64)
+    np.bitwise_or.at(
+        words, (np.asarray(rows, dtype=np.intp), (bits // 64).astype(np.intp)), np.uint64(1) << (bits % 64)
+    )
+    return words
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Number of set bits per bitset (summed over the last, word, axis)."""
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words, dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, axis=-1).sum(axis=-1, dtype=np.int64)
+
+
+def _unpack_bitsets(bitsets: np.ndarray) -> list[np.ndarray]:
+    """Set bit (metric id) positions of every row of a packed bitset matrix, ascending."""
+    as_bytes = np.ascontiguousarray(bitsets, dtype="<u8").view(np.uint8)
+    rows, ids = np.nonzero(np.unpackbits(as_bytes, axis=-1, bitorder="little"))
+    return np.split(ids, np.searchsorted(rows, np.arange(1, len(bitsets))))
+
+
+def _segments_from_minima(
+    minima: np.ndarray,
+    cp_metric: np.ndarray,
+    cp_pos: np.ndarray,
+    n_metrics: int,
+) -> tuple[np.ndarray, np.ndarray, dict[int, npt.NDArray]]:
+    """Assign change points to KDE clusters given one row of minima.
+
+    Mirrors :func:`segment_changepoints_with_kde`: cluster ``k`` spans the
+    closed interval between the ``k-1``-th and ``k``-th minimum, so a change
+    point sitting exactly on a minimum belongs to both neighboring clusters
+    (except on the first one, which closes the half-open leftmost cluster).
+
+    Returns ``(labels, members, label_to_change_points)`` for the non-empty
+    clusters in ascending label order, where ``members[i]`` is the packed
+    bitset (see :func:`_pack_bitsets`) of metric ids in cluster ``labels[i]``.
+    """
+    n_before = np.cumsum(minima) - minima  # minima strictly left of each time step
+    on_minimum = minima[cp_pos]
+    # The leftmost cluster is open on the right (``x < first minimum``), so a
+    # point on the first minimum only joins the cluster to its right.
+    left = ~(on_minimum & (n_before[cp_pos] == 0))
+    labels = np.concatenate([n_before[cp_pos][left], n_before[cp_pos][on_minimum] + 1])
+    metric_ids = np.concatenate([cp_metric[left], cp_metric[on_minimum]])
+    positions = np.concatenate([cp_pos[left], cp_pos[on_minimum]])
+
+    unique_labels, rows = np.unique(labels, return_inverse=True)
+    members = _pack_bitsets(rows, metric_ids, len(unique_labels), n_metrics)
+    label_to_change_points: dict[int, npt.NDArray] = dict(_group_unique(labels, positions))
+    return unique_labels, members, label_to_change_points
+
+
+def _group_unique(keys: np.ndarray, values: np.ndarray) -> list[tuple[int, np.ndarray]]:
+    """Group ``values`` by ``keys`` (ascending), de-duplicating and sorting each group."""
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+    keep = np.ones(keys.size, dtype=bool)
+    keep[1:] = (keys[1:] != keys[:-1]) | (values[1:] != values[:-1])
+    keys, values = keys[keep], values[keep]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+    return [
+        (int(group[0]), vals) for group, vals in zip(np.split(keys, bounds), np.split(values, bounds)) if group.size
+    ]
+
+
+def _pairwise_jaccard(bitsets: np.ndarray) -> np.ndarray:
+    """Jaccard similarity of every pair of rows of a packed bitset matrix as a square matrix.
+
+    Intersection and union sizes of all pairs come from one vectorized
+    popcount; two empty sets count as identical (similarity 1).
+    """
+    intersection = _popcount(bitsets[:, np.newaxis] & bitsets[np.newaxis, :])
+    union = _popcount(bitsets[:, np.newaxis] | bitsets[np.newaxis, :])
+    return np.where(union > 0, intersection / np.maximum(union, 1), 1.0)
+
+
+def _mean_pairwise_jaccard(bitsets: np.ndarray) -> float:
+    """Mean Jaccard similarity over all distinct pairs of rows of a packed bitset matrix."""
+    if len(bitsets) < 2:
+        return 1.0
+    i, j = np.triu_indices(len(bitsets), k=1)
+    return float(_pairwise_jaccard(bitsets)[i, j].mean())
+
+
+def _stability_interval(bitsets: np.ndarray, z: float = BOOTSTRAP_CONFIDENCE_Z) -> tuple[float, float, float]:
+    """``(mean, low, high)`` confidence interval of the mean pairwise Jaccard.
+
+    The mean pairwise similarity is a U-statistic of order two, whose variance
+    is approximately ``4 * Var(r_i) / k`` where ``r_i`` is the mean similarity
+    of resample ``i`` to all others (Hoeffding decomposition).
+    """
+    k = len(bitsets)
+    if k < 2:
+        return 1.0, 0.0, 1.0
+    similarity = _pairwise_jaccard(bitsets)
+    per_resample = (similarity.sum(axis=1) - np.diag(similarity)) / (k - 1)
+    mean = float(per_resample.mean())
+    half_width = z * float(np.sqrt(4.0 * per_resample.var(ddof=1) / k)) if k > 2 else 1.0
+    return mean, max(0.0, mean - half_width), min(1.0, mean + half_width)
+
+
+def _select_resamples(
+    tasks: list[tuple[int, int]],
+    candidate_minima: dict[int, np.ndarray],
+    cp_metric: np.ndarray,
+    cp_pos: np.ndarray,
+    drawn: np.ndarray,
+    metrics: list[str],
     metric_to_cps: dict[str, list[int]],
+    selector: Callable,
+) -> np.ndarray:
+    """Segment histogram row ``b`` at candidate ``c`` for every ``(c, b)`` task.
+
+    Returns one bitset row per task holding the segment picked by ``selector``.
+    """
+    selected = np.zeros((len(tasks), _n_words(len(metrics))), dtype=np.uint64)
+    for i, (c, b) in enumerate(tasks):
+        labels_b, members_b, label_to_cps_b = _segments_from_minima(
+            candidate_minima[c][b], cp_metric[drawn[b]], cp_pos[drawn[b]], len(metrics)
+        )
+        # Metric names are only materialized for the selector's dict interface.
+        label_to_metrics_b = {
+            int(label): {metrics[m] for m in ids} for label, ids in zip(labels_b, _unpack_bitsets(members_b))
+        }
+        selected_label, _ = selector(label_to_metrics_b, metric_to_cps, label_to_cps_b)
+        if selected_label is not None:
+            selected[i] = members_b[np.searchsorted(labels_b, selected_label)]
+    return selected
+
+
+def _select_resamples_parallel(
+    tasks: list[tuple[int, int]], n_jobs: int, executor: Executor | None, *shared
+) -> np.ndarray:
+    """Run :func:`_select_resamples` over ``tasks`` split evenly across ``n_jobs`` workers.
+
+    Each worker receives one contiguous slice of the task list, so the
+    read-only change-point structures in ``shared`` are pickled once per worker
+    rather than once per task. Results are concatenated in task order, which
+    keeps the outcome independent of the worker count. The slices run on
+    ``executor`` when given.
+    """
+    n_workers = getattr(executor, "max_workers", None) or effective_n_jobs(n_jobs)
+    n_workers = min(n_workers, len(tasks))
+    if n_workers <= 1:
+        return _select_resamples(tasks, *shared)
+    chunks = parallel.map_tasks(
+        _select_resamples,
+        [(tasks[s], *shared) for s in utils.gen_even_slices(len(tasks), n_workers)],
+        n_jobs=n_workers,
+        executor=executor,
+    )
+    return np.concatenate(chunks)
+
+
+def select_bandwidth_for_store(
+    store: ChangePointStore,
     time_series_length: int,
     selector: Callable[[dict[int, set[str]], dict[str, list[int]], dict[int, npt.NDArray]], tuple],
     random_state: int | None = None,
     n_bootstrap: int = N_BOOTSTRAP,
     grid: list[float] | None = None,
+    early_stopping: bool = False,
+    batch_size: int = BOOTSTRAP_BATCH_SIZE,
+    n_jobs: int = 1,
+    scale_space: ScaleSpace | None = None,
+    executor: Executor | None = None,
 ) -> tuple[float, dict]:
     """Pick the KDE bandwidth by bootstrap stability of the final selection.
 
@@ -169,16 +539,30 @@ def select_bandwidth(
     The same resample indices are shared across all candidates (a paired
     design: differences in score reflect the bandwidth, not resampling luck).
 
+    A bootstrap resample is just a multinomial reweighting of the metrics, so
+    the full data and all resamples are turned into one ``(n_bootstrap + 1, T)``
+    histogram matrix up front (see :func:`_resample_histograms`) and each
+    candidate bandwidth evaluates the densities of every row in one batched
+    kernel sum (see :func:`_batched_kde_minima`); only the selector runs per
+    resample.
+
     A candidate is only admissible when the segmentation of the **full** data
     yields at least two segments -- otherwise a large-enough bandwidth always
     wins with a trivially perfect score by merging everything into one segment.
     Ties prefer the smaller bandwidth (finer granularity is more selective,
     matching the feature-reduction goal).
 
+    With ``early_stopping`` the resamples are consumed sequentially, in rounds
+    of ``batch_size``, while a confidence interval on each candidate's
+    stability is kept (see :func:`_stability_interval`). After every round,
+    candidates whose upper bound falls below the current leader's lower bound
+    are dropped, and a perfectly stable candidate (every pair identical) stops
+    drawing. ``n_bootstrap`` stays the cap, and the resamples are the same
+    prefix of the shared draw, so a candidate that runs to the cap scores
+    exactly as without early stopping.
+
     Args:
-        flatten_change_points: Change points of all metrics, with multiplicity.
-        cp_to_metrics: Change point -> metric names (from detection).
-        metric_to_cps: Metric name -> its change points (from detection).
+        store: The detected change points (see :class:`ChangePointStore`).
         time_series_length: Length of the time axis.
         selector: The segment-selection routine, called as
             ``selector(label_to_metrics, metric_to_cps, label_to_change_points)``
@@ -186,61 +570,149 @@ def select_bandwidth(
             :meth:`metricsifter.sifter.Sifter.select_largest_segment_with_label`
             has exactly this shape.
         random_state: Seed for the bootstrap resampling (``None`` = OS entropy).
-        n_bootstrap: Number of resamples per candidate.
+        n_bootstrap: Number of resamples per candidate (the cap with
+            ``early_stopping``).
         grid: Candidate bandwidths (default: :func:`_bandwidth_grid`).
+        early_stopping: Add resamples in rounds and drop dominated candidates.
+        batch_size: Resamples added per candidate and round with ``early_stopping``.
+        n_jobs: Parallelism for the candidate x resample evaluations (joblib
+            convention). The resample draw happens up front in this process,
+            so the result for a given ``random_state`` does not depend on it.
+        executor: Run those evaluations on this executor (e.g. a warm
+            :class:`metricsifter.parallel.WorkerPool`) instead of ``n_jobs``
+            joblib workers.
+        scale_space: The sift's :class:`ScaleSpace` over the store's
+            change points; its memoized minima decide admissibility
+            (built here when omitted), so the final segmentation at the chosen
+            bandwidth reuses them.
 
     Returns:
         ``(resolved, diagnostics)`` where diagnostics carries ``grid``,
-        ``stability`` (``None`` for inadmissible candidates), ``n_segments``
-        and ``reason``.
+        ``stability`` (``None`` for inadmissible candidates), ``n_segments``,
+        ``n_resamples`` (resamples actually drawn per candidate) and ``reason``.
     """
-    unique_cps = set(flatten_change_points)
-    if len(unique_cps) < MIN_UNIQUE_CHANGE_POINTS:
+    if np.unique(store.positions).size < MIN_UNIQUE_CHANGE_POINTS:
         return BANDWIDTH_FALLBACK, {
             "grid": [],
             "stability": [],
             "n_segments": [],
+            "n_resamples": [],
             "reason": "too_few_change_points",
         }
 
     grid = grid if grid is not None else _bandwidth_grid(time_series_length)
-    metrics = sorted(metric for metric, cps in metric_to_cps.items() if len(cps) > 0)
+    if scale_space is None:
+        scale_space = ScaleSpace(store.positions, time_series_length)
+    # Bootstrap over the metrics with change points, in name order (the draw
+    # is defined on that order, so it does not depend on the column order).
+    metrics = sorted(metric for metric, count in zip(store.metrics, store.counts) if count > 0)
     n_metrics = len(metrics)
+    sorted_id = np.full(store.n_metrics, -1)
+    sorted_id[[store.metric_index[metric] for metric in metrics]] = np.arange(n_metrics)
+    cp_metric, cp_pos = sorted_id[store.metric_ids], store.positions.astype(np.int64)
+    metric_to_cps = store.metric_to_cps
     rng = np.random.default_rng(random_state)
     # One shared set of resample indices for every candidate bandwidth.
-    bootstrap_indices = [rng.integers(0, n_metrics, size=n_metrics) for _ in range(n_bootstrap)]
+    bootstrap_indices = np.array([rng.integers(0, n_metrics, size=n_metrics) for _ in range(n_bootstrap)])
 
-    stability: list[float | None] = []
-    n_segments: list[int] = []
-    best: tuple[tuple[float, float], float] | None = None  # ((stab, -h), h)
-    for h in grid:
-        _, label_to_cps_full = segment_nested_changepoints(
-            flatten_change_points, cp_to_metrics, time_series_length, kde_bandwidth=h
-        )
-        n_seg = sum(1 for cps in label_to_cps_full.values() if len(cps) > 0)
-        n_segments.append(n_seg)
-        if n_seg < 2:
-            stability.append(None)
-            continue
+    # Row 0 is the full data (every metric once), rows 1.. are the resamples.
+    weights = np.ones((n_bootstrap + 1, n_metrics))
+    weights[1:] = 0.0
+    np.add.at(weights, (np.repeat(np.arange(1, n_bootstrap + 1), n_metrics), bootstrap_indices.ravel()), 1.0)
+    histograms = _resample_histograms(weights, cp_metric, cp_pos, time_series_length)
+    drawn = weights[:, cp_metric] > 0  # which (metric, cp) pairs take part in each row
 
-        selected_sets: list[frozenset[str]] = []
-        for indices in bootstrap_indices:
-            sampled = [metrics[i] for i in indices]
-            flatten_b, cp_to_metrics_b = _rebuild_aggregates(sampled, metric_to_cps)
-            label_to_metrics_b, label_to_cps_b = segment_nested_changepoints(
-                flatten_b, cp_to_metrics_b, time_series_length, kde_bandwidth=h
-            )
-            _, selected = selector(label_to_metrics_b, metric_to_cps, label_to_cps_b)
-            selected_sets.append(frozenset(selected))
-        score = _mean_pairwise_jaccard(selected_sets)
-        stability.append(score)
-        candidate = ((score, -h), h)
-        if best is None or candidate[0] > best[0]:
-            best = candidate
-
-    diagnostics: dict = {"grid": list(grid), "stability": stability, "n_segments": n_segments}
+    n_segments: list[int] = []
+    candidate_minima: dict[int, np.ndarray] = {}
+    for c, h in enumerate(grid):
+        minima = np.zeros(histograms.shape, dtype=bool)
+        minima[0, scale_space.minima(h)] = True
+        minima[1:] = _batched_kde_minima(histograms[1:], h)
+        labels_full, _, _ = _segments_from_minima(minima[0], cp_metric, cp_pos, n_metrics)
+        n_segments.append(len(labels_full))
+        if len(labels_full) >= 2:
+            candidate_minima[c] = minima
+
+    selected = {c: np.zeros((0, _n_words(n_metrics)), dtype=np.uint64) for c in candidate_minima}
+
+    shared = (candidate_minima, cp_metric, cp_pos, drawn, metrics, metric_to_cps, selector)
+
+    def draw(stops: dict[int, int]) -> None:
+        """Extend every candidate ``c`` in ``stops`` up to ``stops[c]`` resamples, in one parallel pass."""
+        tasks = [(c, b) for c, stop in stops.items() for b in range(len(selected[c]) + 1, stop + 1)]
+        new = _select_resamples_parallel(tasks, n_jobs, executor, *shared)
+        start = 0
+        for c, stop in stops.items():
+            n_new = stop - len(selected[c])
+            selected[c] = np.concatenate([selected[c], new[start : start + n_new]])
+            start += n_new
+
+    active = set(candidate_minima)
+    if not early_stopping:
+        draw({c: n_bootstrap for c in sorted(active)})
+    else:
+        settled: set[int] = set()
+        while pending := [c for c in sorted(active - settled) if len(selected[c]) < n_bootstrap]:
+            draw({c: min(n_bootstrap, len(selected[c]) + batch_size) for c in pending})
+            intervals = {c: _stability_interval(selected[c]) for c in active}
+            leader = max(active, key=lambda c: (intervals[c][0], -grid[c]))
+            active = {c for c in active if intervals[c][2] >= intervals[leader][1]}
+            settled = {c for c in active if intervals[c][1] == 1.0}
+
+    stability: list[float | None] = [None] * len(grid)
+    n_resamples = [0] * len(grid)
+    for c, bitsets in selected.items():
+        stability[c] = _mean_pairwise_jaccard(bitsets)
+        n_resamples[c] = len(bitsets)
+    best = max(active, key=lambda c: (stability[c], -grid[c]), default=None)
+
+    diagnostics: dict = {
+        "grid": list(grid),
+        "stability": stability,
+        "n_segments": n_segments,
+        "n_resamples": n_resamples,
+    }
     if best is None:
         diagnostics["reason"] = "unimodal"
         return BANDWIDTH_FALLBACK, diagnostics
     diagnostics["reason"] = "stability"
-    return best[1], diagnostics
+    return grid[best], diagnostics
+
+
+def select_bandwidth(
+    flatten_change_points: list[int],
+    cp_to_metrics: dict[int, list[str]],
+    metric_to_cps: dict[str, list[int]],
+    time_series_length: int,
+    selector: Callable[[dict[int, set[str]], dict[str, list[int]], dict[int, npt.NDArray]], tuple],
+    random_state: int | None = None,
+    n_bootstrap: int = N_BOOTSTRAP,
+    grid: list[float] | None = None,
+    early_stopping: bool = False,
+    batch_size: int = BOOTSTRAP_BATCH_SIZE,
+    n_jobs: int = 1,
+    scale_space: ScaleSpace | None = None,
+) -> tuple[float, dict]:
+    """Dict-based front end of :func:`select_bandwidth_for_store`.
+
+    ``flatten_change_points`` / ``cp_to_metrics`` / ``metric_to_cps`` are the
+    detection aggregates (see :class:`ChangePointStore` for their views); the
+    other arguments and the return value are those of
+    :func:`select_bandwidth_for_store`.
+    """
+    metrics = list(metric_to_cps)
+    store = ChangePointStore.from_lists(metrics, [sorted(metric_to_cps[metric]) for metric in metrics])
+    if scale_space is None:
+        scale_space = ScaleSpace(flatten_change_points, time_series_length)
+    return select_bandwidth_for_store(
+        store,
+        time_series_length,
+        selector,
+        random_state=random_state,
+        n_bootstrap=n_bootstrap,
+        grid=grid,
+        early_stopping=early_stopping,
+        batch_size=batch_size,
+        n_jobs=n_jobs,
+        scale_space=scale_space,
+    )
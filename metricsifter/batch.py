@@ -0,0 +1,150 @@
+"""Sifting several frames at once on shared workers.
+
+:meth:`~metricsifter.sifter.Sifter.sift_many` schedules the change-point
+detection of every column of every frame as one job list, so many small frames
+keep all workers busy, and then segments the frames in parallel, one frame per
+task. Every frame's result is the :meth:`~metricsifter.sifter.Sifter.sift`
+result of that frame.
+"""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+
+from metricsifter import parallel, planner
+from metricsifter.algo import detection
+from metricsifter.profiling import StageRecorder
+from metricsifter.sifter import AUTO, Sifter, _store_counts
+from metricsifter.types import ChangePointDetection, PenaltyTuning, SiftResult, StageTiming
+
+__all__ = ["sift_many"]
+
+
+def sift_many(
+    sifter: Sifter, frames: list[pd.DataFrame], without_simple_filter: bool = False
+) -> Iterator[tuple[int, SiftResult]]:
+    """``(position, result)`` of every frame sifted by ``sifter``, as each is segmented."""
+    with sifter._entry_point():
+        yield from _sift_frames(sifter, frames, without_simple_filter)
+
+
+def _sift_frames(
+    sifter: Sifter, frames: list[pd.DataFrame], without_simple_filter: bool
+) -> Iterator[tuple[int, SiftResult]]:
+    timings = sifter._start_executor()
+    recorders = [StageRecorder(sifter.stage_hooks) for _ in frames]
+    frame_columns = [sifter._filter(data, without_simple_filter, recorder) for data, recorder in zip(frames, recorders)]
+    if sifter.search_method == AUTO:
+        # One plan for the whole batch, from every frame's columns.
+        lengths = [planner.trimmed_lengths(data, columns) for data, columns in zip(frames, frame_columns)]
+        n_rows = max((data.shape[0] for data in frames), default=0)
+        sifter = sifter._with_search_plan(
+            np.concatenate(lengths or [np.zeros(0)]), n_rows, StageRecorder(sifter.stage_hooks, timings)
+        )
+    yield from _sift_filtered_frames(sifter, frames, frame_columns, recorders, timings)
+
+
+def _sift_filtered_frames(
+    sifter: Sifter,
+    frames: list[pd.DataFrame],
+    frame_columns: list[np.ndarray],
+    recorders: list[StageRecorder],
+    timings: dict[str, StageTiming],
+) -> Iterator[tuple[int, SiftResult]]:
+    detected = _detect_changepoints_many(sifter, frames, frame_columns, recorders)
+
+    detected = [
+        ChangePointDetection(
+            data=data,
+            columns=columns,
+            store=store,
+            penalty_tuning=penalty_tuning,
+            execution_plan=sifter._execution_plan,
+            timings=recorder.timings,
+        )
+        for data, columns, (store, penalty_tuning), recorder in zip(frames, frame_columns, detected, recorders)
+    ]
+    pending = []
+    for i, frame_detected in enumerate(detected):
+        if frame_detected.store.n_change_points == 0:
+            yield i, sifter._build_result(frame_detected, None, {**timings, **frame_detected.timings})
+        else:
+            pending.append(i)
+
+    # Frames are the unit of parallelism here, so each one is segmented
+    # by a serial copy of the sifter.
+    frame_sifter = sifter._serial_copy()
+    tasks = [(detected[i].store, detected[i].time_series_length) for i in pending]
+    # Without the bootstrap, segmenting a frame takes milliseconds: never worth a worker.
+    n_cp = sum(detected[i].store.n_change_points for i in pending) if sifter.bandwidth == AUTO else 0
+    n_jobs, executor = sifter._stage_workers({}, len(tasks), lambda model: model.bootstrap_seconds * n_cp)
+    for k, segmented in parallel.imap_unordered(frame_sifter._segment, tasks, n_jobs=n_jobs, executor=executor):
+        i = pending[k]
+        yield i, sifter._build_result(detected[i], segmented, {**timings, **detected[i].timings})
+
+
+def _detect_changepoints_many(
+    sifter: Sifter, frames: list[pd.DataFrame], frame_columns: list[np.ndarray], recorders: list[StageRecorder]
+) -> list[tuple[detection.ChangePointStore, PenaltyTuning | None]]:
+    """STEP1 for several frames: the columns of all frames are scheduled as one job list.
+
+    Every frame's ``recorders`` entry gets the shared ``"detection"`` stage
+    (counted over all frames) and its own ``"penalty_tuning"``.
+    """
+    tuned = sifter.penalty_adjust == AUTO
+    shared = StageRecorder(sifter.stage_hooks)
+    with shared.stage("detection") as counts:
+        plans, flat_results = _detect_many(sifter, frames, frame_columns, tuned, counts)
+        counts["frames"] = len(frames)
+        counts["metrics"] = len(flat_results)
+
+    detected = []
+    offset = 0
+    for X, columns, (metrics, tasks), recorder in zip(frames, frame_columns, plans, recorders):
+        results = flat_results[offset : offset + len(tasks)]
+        offset += len(tasks)
+        recorder.timings["detection"] = shared.timings["detection"]
+        if not tuned:
+            detected.append((detection.ChangePointStore.from_lists(metrics, results), None))
+            continue
+        with recorder.stage("penalty_tuning") as counts:
+            store, tuning = sifter._store_from_penalty_paths(X, columns, metrics, results)
+            counts.update(_store_counts(store))
+        detected.append((store, tuning))
+    return detected
+
+
+def _detect_many(
+    sifter: Sifter, frames: list[pd.DataFrame], frame_columns: list[np.ndarray], tuned: bool, counts: dict[str, int]
+) -> tuple[list[tuple[list[str], list[tuple]]], list]:
+    """The per-frame ``(metrics, tasks)`` detection plans, and the results of all their tasks."""
+    plans = []
+    for X, columns in zip(frames, frame_columns):
+        if tuned:
+            plan = detection.penalty_path_tasks(
+                X, sifter.search_method, sifter.cost_model, sifter.penalty, sifter.sigma_estimator, columns=columns
+            )
+        else:
+            plan = detection.change_point_tasks(
+                X,
+                sifter.search_method,
+                sifter.cost_model,
+                sifter.penalty,
+                float(sifter.penalty_adjust),
+                sigma_estimator=sifter.sigma_estimator,
+                columns=columns,
+            )
+        plans.append(plan)
+
+    fn = detection.univariate_penalty_path_with_matches if tuned else detection.detect_univariate_changepoints
+    flat_tasks = [task for _, tasks in plans for task in tasks]
+    n_jobs, executor = sifter._stage_workers(
+        counts,
+        len(flat_tasks),
+        lambda model: sum(
+            model.column_seconds(sifter.search_method, planner.trimmed_lengths(X, columns), tuned)
+            for X, columns in zip(frames, frame_columns)
+        ),
+    )
+    return plans, parallel.map_tasks(fn, flat_tasks, n_jobs=n_jobs, executor=executor)
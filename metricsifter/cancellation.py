@@ -0,0 +1,62 @@
+"""Cooperative cancellation and deadlines for sifts.
+
+A :class:`CancellationToken` is passed to :meth:`metricsifter.sifter.Sifter.sift`
+(or created from ``ExecutionOptions(deadline=...)``). Detection (STEP1, the
+dominant cost) then runs the metrics in decreasing order of a cheap
+change-magnitude score (see
+:func:`metricsifter.algo.detection.change_magnitude_scores`), stops
+dispatching metrics once the token is cancelled or its deadline passes, and
+cancels the tasks still queued on the workers. Segmentation runs on the
+metrics detected so far and the result is marked partial, listing the
+unprocessed metrics (see :attr:`metricsifter.types.SiftResult.partial`).
+
+Cancellation is cooperative: a metric already running on a worker is not
+interrupted, so a sift overshoots its deadline by at most one metric's
+detection plus the segmentation of what was detected.
+"""
+
+import threading
+import time
+
+__all__ = ["CancellationToken"]
+
+
+class CancellationToken:
+    """A thread-safe cancel flag with an optional deadline.
+
+    Args:
+        timeout: Seconds from now after which the token counts as cancelled
+            (``None`` = no deadline).
+        parent: A token whose cancellation (or deadline) also cancels this one.
+    """
+
+    def __init__(self, timeout: float | None = None, parent: "CancellationToken | None" = None) -> None:
+        self._event = threading.Event()
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.parent = parent
+
+    def cancel(self) -> None:
+        """Cancel the token (and every token it is the parent of); safe to call from any thread."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return True
+        return self.parent is not None and self.parent.cancelled
+
+    def remaining(self) -> float | None:
+        """Seconds until the nearest deadline (``0.0`` once cancelled, ``None`` without a deadline)."""
+        if self._event.is_set():
+            return 0.0
+        remaining = None if self.deadline is None else max(self.deadline - time.monotonic(), 0.0)
+        if self.parent is not None:
+            inherited = self.parent.remaining()
+            if inherited is not None:
+                remaining = inherited if remaining is None else min(remaining, inherited)
+        return remaining
+
+    def __reduce__(self):
+        raise TypeError("CancellationToken cannot be pickled; it is shared state of this interpreter.")
@@ -0,0 +1,135 @@
+"""On-disk checkpoints of pipeline stage outputs.
+
+With ``Sifter(checkpoint_dir=...)`` the expensive stage outputs of a sift are
+saved to a local directory as they complete: the STEP0 column mask, the
+change points of every chunk of metrics (or, with ``penalty_adjust="auto"``,
+their penalty paths), the final change-point store with its penalty tuning
+report, and the ``bandwidth="auto"`` tuning report. Rerunning the same sift
+after the process was killed loads every completed stage -- and every
+completed chunk of an unfinished detection -- instead of recomputing it.
+
+Each checkpoint is one uncompressed ``.npz`` file (flat integer arrays, the
+reports as JSON strings) named after its stage and a digest of everything the
+stage depends on: the input frame's fingerprint and the parameters that affect
+it. A changed input or parameter therefore never reads a stale checkpoint.
+Files are written to a temporary name and renamed into place, so a kill
+mid-write leaves no partial checkpoint behind. Nothing is ever deleted; remove
+the directory to reclaim the space.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from metricsifter.algo.detection import ChangePointStore
+
+__all__ = ["Checkpointer", "fingerprint_frame"]
+
+
+def _digest(*parts: Any) -> str:
+    """A stable hex digest of arrays (by dtype, shape and bytes) and scalars (by ``repr``)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            h.update(f"{part.dtype}{part.shape}".encode())
+            h.update(np.ascontiguousarray(part).tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def fingerprint_frame(data: pd.DataFrame) -> str:
+    """Digest of a frame's column names, index and values (row hashes via pandas)."""
+    row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+    return _digest(tuple(str(column) for column in data.columns), row_hashes)
+
+
+class Checkpointer:
+    """Loads and atomically saves stage outputs in ``directory`` (created on demand).
+
+    A checkpoint is addressed by its stage name plus the parts it depends on;
+    see :meth:`load` and :meth:`save`.
+    """
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path(self, stage: str, *parts: Any) -> Path:
+        return self.directory / f"{stage}-{_digest(stage, *parts)}.npz"
+
+    def load(self, stage: str, *parts: Any) -> dict[str, np.ndarray] | None:
+        """The arrays saved for ``(stage, *parts)``, or ``None`` when not checkpointed."""
+        path = self.path(stage, *parts)
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as saved:
+            return {name: saved[name] for name in saved.files}
+
+    def save(self, arrays: Mapping[str, npt.ArrayLike], stage: str, *parts: Any) -> None:
+        """Save ``arrays`` for ``(stage, *parts)``, replacing any previous checkpoint."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, **arrays)
+            os.replace(tmp, self.path(stage, *parts))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def pack_report(report: Any) -> np.ndarray:
+    """A tuning report (``to_dict()``-able) as a 0-d string array."""
+    return np.array(json.dumps(report.to_dict()))
+
+
+def unpack_report(array: np.ndarray) -> dict:
+    return json.loads(str(array))
+
+
+def pack_store(store: ChangePointStore) -> dict[str, np.ndarray]:
+    """The CSR arrays of a store (its metric names are known from the STEP0 columns)."""
+    return {"offsets": store.offsets, "positions": store.positions, "detected": store.detected}
+
+
+def unpack_store(metrics: list[str], arrays: Mapping[str, np.ndarray]) -> ChangePointStore:
+    return ChangePointStore(metrics, arrays["offsets"], arrays["positions"], arrays.get("detected"))
+
+
+def pack_penalty_paths(results: list[tuple], grid_size: int) -> dict[str, np.ndarray]:
+    """Flatten per-metric ``(path, missing_value_cps, matched_counts)`` penalty-path results."""
+    n = len(results)
+    return {
+        "path_counts": np.array([[len(cps) for cps in path] for path, _, _ in results], dtype=np.int64).reshape(
+            n, grid_size
+        ),
+        "path_positions": np.fromiter((cp for path, _, _ in results for cps in path for cp in cps), dtype=np.int32),
+        "missing_counts": np.array([len(mv_cps) for _, mv_cps, _ in results], dtype=np.int64),
+        "missing_positions": np.fromiter((cp for _, mv_cps, _ in results for cp in mv_cps), dtype=np.int32),
+        "matched": np.array([matched for _, _, matched in results], dtype=np.int64).reshape(n, max(grid_size - 1, 0)),
+    }
+
+
+def unpack_penalty_paths(arrays: Mapping[str, np.ndarray]) -> list[tuple[list[list[int]], list[int], list[int]]]:
+    """Inverse of :func:`pack_penalty_paths`."""
+    path_counts = arrays["path_counts"]
+    path_cps = np.split(arrays["path_positions"], np.cumsum(path_counts.ravel())[:-1])
+    missing_cps = np.split(arrays["missing_positions"], np.cumsum(arrays["missing_counts"])[:-1])
+    grid_size = path_counts.shape[1]
+    return [
+        (
+            [cps.tolist() for cps in path_cps[i * grid_size : (i + 1) * grid_size]],
+            missing_cps[i].tolist(),
+            arrays["matched"][i].tolist(),
+        )
+        for i in range(path_counts.shape[0])
+    ]
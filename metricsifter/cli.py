@@ -3,8 +3,16 @@
 Usage::
 
     metricsifter run INPUT.csv [--output OUT.csv] [--report REPORT.json] ...
+    metricsifter calibrate --output MODEL.json
+    metricsifter benchmark [--n-jobs N]
+    metricsifter worker [--host HOST] [--port PORT] [--workers N]
 
-The ``main(argv)`` entry point returns an exit code (0 success, 2 input error)
+``worker`` serves the parallel stages of ``run --remote-workers`` clients on
+other hosts (see :mod:`metricsifter.remote`); both sides read the shared
+secret from the ``METRICSIFTER_AUTHKEY`` environment variable.
+
+The ``main(argv)`` entry point returns an exit code (0 success, 2 input error,
+3 when no execution plan fits ``--max-memory``)
 instead of calling ``sys.exit`` directly, so it can be driven from tests without
 subprocesses.
 """
@@ -12,15 +20,26 @@ subprocesses.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import json
+import os
 import sys
 from typing import Sequence
 
 import pandas as pd
 
+from metricsifter import parallel, planner
+from metricsifter.execution import ExecutionOptions
+from metricsifter.memory import MemoryBudgetError
+from metricsifter.remote import RemoteExecutor, WorkerServer
 from metricsifter.sifter import Sifter
 
 EXIT_OK = 0
 EXIT_INPUT_ERROR = 2
+EXIT_MEMORY_BUDGET = 3
+
+#: Environment variable holding the shared secret of ``worker`` servers and their clients.
+AUTHKEY_ENV = "METRICSIFTER_AUTHKEY"
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -52,13 +71,79 @@ def _build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Seed for the 'auto' bandwidth bootstrap (default: nondeterministic).",
     )
+    run.add_argument(
+        "--bootstrap-early-stopping",
+        action="store_true",
+        help="Stop the 'auto' bandwidth bootstrap early for clearly dominated candidates.",
+    )
     run.add_argument(
         "--search-method",
         default="pelt",
-        choices=["pelt", "binseg", "bottomup"],
-        help="Change-point search method (default: pelt).",
+        choices=["pelt", "binseg", "bottomup", "auto"],
+        help="Change-point search method (default: pelt), or 'auto' to run the plan predicted fastest.",
+    )
+    run.add_argument(
+        "--runtime-model",
+        default=None,
+        help="Runtime model JSON written by 'metricsifter calibrate', for --search-method auto.",
+    )
+    run.add_argument(
+        "--time-budget",
+        type=float,
+        default=None,
+        help="Seconds --search-method auto may take: use the fewest workers predicted to meet it.",
     )
     run.add_argument("--n-jobs", type=int, default=1, help="Number of parallel jobs (default: 1).")
+    run.add_argument(
+        "--backend",
+        choices=parallel.BACKENDS,
+        default="auto",
+        help="Kind of --n-jobs workers: processes, threads, or auto (threads on a free-threaded Python).",
+    )
+    run.add_argument(
+        "--parallelism",
+        choices=planner.PARALLELISM,
+        default="auto",
+        help="auto: run small stages serially and size the others by their estimated work; "
+        "fixed: always use --n-jobs workers.",
+    )
+    run.add_argument(
+        "--threads-per-worker",
+        type=_threads_per_worker_value,
+        default="auto",
+        help="Native (OpenMP/BLAS) threads per worker: 'auto' splits the CPUs over the workers (default), "
+        "a number, or 'none' to leave them alone.",
+    )
+    run.add_argument(
+        "--remote-workers",
+        nargs="+",
+        default=None,
+        metavar="HOST:PORT",
+        help=f"Run the parallel stages on these 'metricsifter worker' servers (secret in ${AUTHKEY_ENV}).",
+    )
+    run.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        help="Directory to checkpoint stage outputs in; a rerun on the same input resumes from them.",
+    )
+    run.add_argument(
+        "--max-memory",
+        default=None,
+        help="Memory budget on top of the input (e.g. '2GiB'): run the first execution plan that fits, "
+        "or exit with code 3 before sifting when none does.",
+    )
+    run.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Seconds the sift may spend detecting; metrics left when it passes are listed as "
+        "unprocessed_metrics of a partial --report.",
+    )
+    run.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="Trace per-stage peak memory (reported under timings in --report).",
+    )
     run.add_argument(
         "--index-col",
         default="none",
@@ -68,9 +153,40 @@ def _build_parser() -> argparse.ArgumentParser:
     run.add_argument(
         "--parse-dates", action="store_true", help="Parse the index column (see --index-col) as datetimes."
     )
+
+    calibrate = subparsers.add_parser(
+        "calibrate", help="Time the search methods on this machine and save a runtime model."
+    )
+    calibrate.add_argument("--output", "-o", required=True, help="Path to write the runtime model JSON to.")
+    calibrate.add_argument(
+        "--repeats", type=int, default=3, help="Timings per search method and length; the fastest is kept."
+    )
+
+    benchmark = subparsers.add_parser(
+        "benchmark", help="Time detection serially and on process and thread workers, for a few frame sizes."
+    )
+    benchmark.add_argument("--n-jobs", type=int, default=-1, help="Workers of the parallel runs (default: -1).")
+    benchmark.add_argument(
+        "--repeats", type=int, default=3, help="Timings per frame size and backend; the fastest is kept."
+    )
+
+    worker = subparsers.add_parser(
+        "worker", help=f"Serve the parallel stages of remote sifts (secret in ${AUTHKEY_ENV})."
+    )
+    worker.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1).")
+    worker.add_argument("--port", type=int, default=7075, help="Port to listen on (0 = any free port).")
+    worker.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1; -1 = all CPUs).")
     return parser
 
 
+def _authkey() -> bytes | None:
+    value = os.environ.get(AUTHKEY_ENV)
+    if not value:
+        print(f"error: set the shared worker secret in ${AUTHKEY_ENV}.", file=sys.stderr)
+        return None
+    return value.encode()
+
+
 def _penalty_adjust_value(value: str) -> float | str:
     if value == "auto":
         return value
@@ -89,6 +205,16 @@ def _bandwidth_value(value: str) -> float | str:
         raise argparse.ArgumentTypeError(f"expected a float, 'scott', 'silverman' or 'auto', got {value!r}")
 
 
+def _threads_per_worker_value(value: str) -> int | str | None:
+    if value == "auto":
+        return value
+    if value.lower() == "none":
+        return None
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    raise argparse.ArgumentTypeError(f"expected a positive int, 'auto' or 'none', got {value!r}")
+
+
 def _resolve_index_col(value: str) -> int | str | None:
     if value is None or value.lower() == "none":
         return None
@@ -117,14 +243,43 @@ def _run(args: argparse.Namespace) -> int:
         print(f"error: input {args.input!r} has no metric columns.", file=sys.stderr)
         return EXIT_INPUT_ERROR
 
+    executor = None
+    if args.remote_workers:
+        authkey = _authkey()
+        if authkey is None:
+            return EXIT_INPUT_ERROR
+        try:
+            executor = RemoteExecutor(args.remote_workers, authkey=authkey)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return EXIT_INPUT_ERROR
+
     sifter = Sifter(
         search_method=args.search_method,
         penalty_adjust=args.penalty_adjust,
         bandwidth=args.bandwidth,
         n_jobs=args.n_jobs,
         random_state=args.random_state,
+        bootstrap_early_stopping=args.bootstrap_early_stopping,
+        checkpoint_dir=args.checkpoint_dir,
+        memory_profile=args.memory_profile,
+        execution=ExecutionOptions(
+            executor=executor,
+            max_memory=args.max_memory,
+            runtime_model=args.runtime_model,
+            time_budget=args.time_budget,
+            deadline=args.deadline,
+            backend=args.backend,
+            parallelism=args.parallelism,
+            threads_per_worker=args.threads_per_worker,
+        ),
     )
-    result = sifter.sift(data)
+    try:
+        with executor if executor is not None else contextlib.nullcontext():
+            result = sifter.sift(data)
+    except MemoryBudgetError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return EXIT_MEMORY_BUDGET
 
     out_df = result.data if result.data is not None else pd.DataFrame()
     if args.output:
@@ -139,12 +294,47 @@ def _run(args: argparse.Namespace) -> int:
     return EXIT_OK
 
 
+def _calibrate(args: argparse.Namespace) -> int:
+    model = planner.calibrate(repeats=args.repeats)
+    model.save(args.output)
+    print(json.dumps(model.to_dict(), indent=2))
+    return EXIT_OK
+
+
+def _benchmark(args: argparse.Namespace) -> int:
+    print(f"{'metrics':>8} {'rows':>6} {'serial':>9} {'processes':>9} {'threads':>9}")
+    for row in planner.benchmark_backends(n_jobs=args.n_jobs, repeats=args.repeats):
+        seconds = " ".join(f"{row[name]:>8.3f}s" for name in ("serial", "processes", "threads"))
+        print(f"{row['n_metrics']:>8} {row['n_rows']:>6} {seconds}")
+    return EXIT_OK
+
+
+def _worker(args: argparse.Namespace) -> int:
+    authkey = _authkey()
+    if authkey is None:
+        return EXIT_INPUT_ERROR
+    with WorkerServer((args.host, args.port), authkey=authkey, max_workers=args.workers) as server:
+        host, port = server.address
+        print(f"metricsifter worker listening on {host}:{port}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return EXIT_OK
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     """CLI entry point. Returns the process exit code."""
     parser = _build_parser()
     args = parser.parse_args(argv)
     if args.command == "run":
         return _run(args)
+    if args.command == "calibrate":
+        return _calibrate(args)
+    if args.command == "benchmark":
+        return _benchmark(args)
+    if args.command == "worker":
+        return _worker(args)
     parser.error(f"unknown command: {args.command}")  # pragma: no cover - argparse guards this
     return EXIT_INPUT_ERROR  # pragma: no cover
 
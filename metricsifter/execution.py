@@ -0,0 +1,116 @@
+"""How a sift runs: its workers, execution plans and limits.
+
+The algorithm of a :class:`~metricsifter.sifter.Sifter` (search method,
+penalty, bandwidth, ...) is configured on the sifter itself; everything that
+only changes how fast, where and within which limits it runs is grouped in
+one :class:`ExecutionOptions`::
+
+    options = ExecutionOptions(executor=pool, max_memory="4GiB", deadline=20.0)
+    Sifter(n_jobs=8, execution=options).sift(frame)
+"""
+
+import os
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from metricsifter import memory, parallel, planner
+
+__all__ = ["ExecutionOptions"]
+
+
+@dataclass(frozen=True)
+class ExecutionOptions:
+    """Execution settings of a :class:`~metricsifter.sifter.Sifter`.
+
+    Attributes:
+        executor: A long-lived :class:`concurrent.futures.Executor` that
+            runs the parallel stages of every sift instead of per-stage
+            ``joblib`` workers: typically a warm
+            :class:`metricsifter.parallel.WorkerPool` (processes), a
+            :class:`metricsifter.parallel.ThreadPool`, or a
+            :class:`metricsifter.remote.RemoteExecutor` (worker servers
+            on other hosts).
+            Without one, ``with Sifter(...) as sifter:`` starts a pool of
+            ``n_jobs`` workers that lives until the block exits.
+        max_memory: Memory budget of ``sift`` / ``detect`` on top of the
+            input frame, in bytes or as e.g. ``"2GiB"``. Before running, the
+            sifter picks the first execution plan whose estimated peak fits
+            (fewer workers, chunked detection; see :mod:`metricsifter.memory`),
+            reported as the ``"memory_plan"`` stage of ``SiftResult.timings``;
+            when none fits it raises
+            :class:`~metricsifter.memory.MemoryBudgetError` right away.
+        runtime_model: The calibrated :class:`~metricsifter.planner.RuntimeModel`
+            behind ``Sifter.estimate_cost``, or the path of one saved by
+            ``metricsifter calibrate`` (default: the bundled model).
+        time_budget: Seconds a ``search_method="auto"`` detection should
+            take: the plan with the fewest workers predicted to meet it is
+            chosen (the fastest plan when none is, or without a budget).
+        deadline: Seconds a ``sift`` / ``detect`` call may spend on
+            detection: the metrics most likely to change are detected
+            first, and the metrics left when the deadline passes are
+            reported as ``SiftResult.unprocessed_metrics`` of a partial
+            result (see :mod:`metricsifter.cancellation`).
+        backend: The kind of ``n_jobs`` workers without an ``executor``:
+            ``"processes"`` (every task is pickled to a worker process),
+            ``"threads"`` (no pickling, and STEP0 runs on the threads too;
+            faster where the native code of detection releases the GIL,
+            see :func:`metricsifter.planner.benchmark_backends`), or
+            ``"auto"`` (threads on a free-threaded interpreter, processes
+            otherwise).
+        parallelism: ``"auto"`` sizes every parallel stage (detection,
+            bandwidth tuning, the frames of ``sift_many``, the shards of
+            ``sift_sharded``) from its estimated work, the ``runtime_model``,
+            the CPUs and the available memory: small stages run in the
+            calling process, since starting and feeding workers would cost
+            more than they save (see :func:`metricsifter.planner.choose_workers`).
+            ``"fixed"`` always runs them on ``n_jobs`` workers or the
+            executor. Either way the workers a stage ran on are its
+            ``workers`` count in ``SiftResult.timings``.
+        threads_per_worker: Native (OpenMP / BLAS / numexpr) threads each
+            worker may run, so numpy / scipy calls on many workers do not
+            oversubscribe the CPUs: ``"auto"`` splits the sift's CPU budget
+            evenly over the workers of each stage (workers x threads per
+            worker <= CPUs), an int is used as is, and ``None`` leaves the
+            thread pools alone. The budget shrinks when the sift is nested
+            in an already-parallel caller (a worker process, or several
+            sifts at once in this process), and ``parallelism="auto"`` sizes
+            the stages within it (see
+            :func:`metricsifter.parallel.sift_budget`). The limit is set
+            inside worker processes. Thread workers share this process's
+            pools, and lowering them (with threadpoolctl installed) also
+            throttles the caller's own threads. So this only happens with an
+            int, for the duration of the sift.
+
+    Raises:
+        ValueError: If ``max_memory``, ``deadline``, ``backend``, ``parallelism``
+            or ``threads_per_worker`` is not one of the supported values.
+    """
+
+    executor: Executor | None = None
+    max_memory: int | str | None = None
+    runtime_model: planner.RuntimeModel | str | os.PathLike | None = None
+    time_budget: float | None = None
+    deadline: float | None = None
+    backend: str = "auto"
+    parallelism: str = "auto"
+    threads_per_worker: int | str | None = "auto"
+
+    def __post_init__(self) -> None:
+        if self.max_memory is not None:
+            memory.parse_memory(self.max_memory)
+        if self.deadline is not None and not self.deadline > 0:
+            raise ValueError(f"deadline must be a positive number of seconds, got {self.deadline!r}.")
+        parallel.resolve_backend(self.backend)
+        if self.parallelism not in planner.PARALLELISM:
+            raise ValueError(
+                f"parallelism={self.parallelism!r} is not supported. Choose one of {list(planner.PARALLELISM)}."
+            )
+        parallel.check_threads_per_worker(self.threads_per_worker)
+
+    def load_runtime_model(self) -> planner.RuntimeModel:
+        """The :class:`~metricsifter.planner.RuntimeModel` of ``runtime_model`` (loaded from its path)."""
+        if self.runtime_model is None:
+            return planner.DEFAULT_RUNTIME_MODEL
+        if isinstance(self.runtime_model, planner.RuntimeModel):
+            return self.runtime_model
+        return planner.RuntimeModel.load(self.runtime_model)
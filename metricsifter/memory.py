@@ -0,0 +1,211 @@
+"""Memory budgets: estimating a sift's peak memory and planning within a budget.
+
+With ``ExecutionOptions(max_memory=...)`` a sift first estimates the peak
+memory each candidate execution plan would allocate on top of the input frame,
+and runs the first plan that fits:
+
+1. the configured workers, detecting every column in one job list;
+2. the configured workers, detecting the columns in chunks (of
+   :data:`CHUNK_SIZES` metrics), so only one chunk's column copies and
+   in-flight task pickles exist at a time;
+3. the same with half the workers, and so on down to a serial sift.
+
+When not even the serial, most finely chunked plan fits, the sift raises
+:class:`MemoryBudgetError` before doing any work instead of being OOM-killed
+halfway through. The estimate is a conservative model of the pipeline's large
+allocations (worker processes, per-task column copies, Python-object
+detection results, the ``bandwidth="auto"`` bootstrap arrays), not a
+measurement; ``Sifter(memory_profile=True)`` measures the real per-stage peaks
+(see :class:`metricsifter.types.StageTiming`) to calibrate a budget against.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Final
+
+from metricsifter.algo import detection, segmentation
+
+__all__ = ["MemoryBudgetError", "MemoryPlan", "available_memory", "estimate_memory", "parse_memory", "plan_memory"]
+
+#: Assumed resident memory of one spawned worker process (interpreter plus the
+#: numpy / pandas / scipy / ruptures imports).
+WORKER_OVERHEAD: Final[int] = 160 << 20
+
+#: Change points per metric assumed before detection has run.
+CHANGE_POINTS_PER_METRIC: Final[int] = 16
+
+#: Detection chunk sizes (metrics per job list) tried by :func:`plan_memory`, coarsest first.
+CHUNK_SIZES: Final[tuple[int, ...]] = (4096, 1024, 256, 64)
+
+# Python-object footprint of one metric's detection result (list, tuple and
+# dict slots) and of one change point in it (an int object plus its slot).
+_RESULT_BYTES_PER_METRIC: Final[int] = 512
+_BYTES_PER_CHANGE_POINT: Final[int] = 40
+
+_UNITS: Final[dict[str, int]] = {"": 1, "k": 10**3, "m": 10**6, "g": 10**9, "t": 10**12}
+_MEMORY_PATTERN: Final = re.compile(r"^\s*(\d+(?:\.\d*)?)\s*([kmgt]?)(i?)b?\s*$", re.IGNORECASE)
+
+
+class MemoryBudgetError(MemoryError):
+    """No execution plan of a sift fits its ``max_memory`` budget."""
+
+
+@dataclass(frozen=True)
+class MemoryPlan:
+    """The execution plan :func:`plan_memory` picked for a budget.
+
+    Attributes:
+        n_jobs: Workers the sift runs on (unchanged when an executor is set).
+        chunk_size: Metrics per detection job list (``None`` = all at once).
+        estimate: Estimated peak bytes of the plan on top of the input frame.
+        budget: The ``max_memory`` budget, in bytes.
+    """
+
+    n_jobs: int
+    chunk_size: int | None
+    estimate: int
+    budget: int
+
+
+def parse_memory(value: int | str) -> int:
+    """A memory size in bytes: an int, or a string such as ``"512MB"``, ``"1.5GiB"`` or ``"800Mi"``.
+
+    ``K`` / ``M`` / ``G`` / ``T`` are decimal units and ``Ki`` / ``Mi`` /
+    ``Gi`` / ``Ti`` binary ones (with or without a trailing ``B``).
+
+    Raises:
+        ValueError: If ``value`` is not a positive size.
+    """
+    if isinstance(value, str):
+        match = _MEMORY_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Cannot parse memory size {value!r}. Use bytes or e.g. '512MB', '2GiB'.")
+        number, unit, binary = match.groups()
+        unit = unit.lower()
+        scale = 1 << (10 * "_kmgt".index(unit)) if binary and unit else _UNITS[unit]
+        size = int(float(number) * scale)
+    else:
+        size = int(value)
+    if size <= 0:
+        raise ValueError(f"Memory size must be positive, got {value!r}.")
+    return size
+
+
+def available_memory() -> int | None:
+    """Bytes of memory new processes can use right now, or ``None`` when the platform does not tell.
+
+    ``MemAvailable`` of ``/proc/meminfo`` on Linux (free memory plus reclaimable
+    caches), the free physical pages elsewhere.
+    """
+    try:
+        with open("/proc/meminfo", encoding="ascii") as fp:
+            for line in fp:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) << 10
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def estimate_memory(
+    n_metrics: int,
+    time_series_length: int,
+    n_workers: int = 1,
+    spawns_workers: bool = False,
+    chunk_size: int | None = None,
+    penalty_tuning: bool = False,
+    bandwidth_tuning: bool = False,
+) -> int:
+    """Estimated peak bytes a sift allocates on top of its input frame.
+
+    Args:
+        n_metrics: Columns entering detection.
+        time_series_length: Rows of the frame.
+        n_workers: Workers detection is spread over.
+        spawns_workers: Whether the sift starts those workers itself (a
+            running executor's workers are not charged to the sift).
+        chunk_size: Metrics per detection job list (``None`` = all at once).
+        penalty_tuning: ``penalty_adjust="auto"`` (every metric keeps a
+            penalty path of ``len(PENALTY_ADJUST_GRID)`` results until the
+            plateau is chosen).
+        bandwidth_tuning: ``bandwidth="auto"`` (the bootstrap histograms and
+            per-candidate minima of every resample).
+    """
+    column_bytes = 8 * time_series_length
+    chunk = n_metrics if chunk_size is None else min(chunk_size, n_metrics)
+    result_bytes = _RESULT_BYTES_PER_METRIC + CHANGE_POINTS_PER_METRIC * _BYTES_PER_CHANGE_POINT
+    store_bytes = n_metrics * (8 + 4 * CHANGE_POINTS_PER_METRIC)
+
+    workers = n_workers * WORKER_OVERHEAD if spawns_workers and n_workers > 1 else 0
+    # STEP1: a chunk's column copies, the task pickles in flight to the
+    # workers (joblib pre-dispatches two per worker), and the results. Fixed
+    # penalties compact every chunk into the store; penalty paths are all kept.
+    in_flight = min(2 * n_workers, chunk) * column_bytes if n_workers > 1 else 0
+    if penalty_tuning:
+        results = n_metrics * len(detection.PENALTY_ADJUST_GRID) * result_bytes
+    else:
+        results = chunk * result_bytes + store_bytes
+    detect = chunk * column_bytes + in_flight + results
+
+    # STEP2 + STEP3: per-metric change-point dicts, a few memoized densities,
+    # and the bootstrap arrays of the bandwidth tuner.
+    segment = n_metrics * result_bytes + store_bytes + 4 * column_bytes
+    if bandwidth_tuning:
+        rows = segmentation.N_BOOTSTRAP + 1
+        n_candidates = len(segmentation._bandwidth_grid(time_series_length))
+        segment += rows * (column_bytes + 8 * n_metrics + n_metrics * CHANGE_POINTS_PER_METRIC)
+        segment += n_candidates * rows * time_series_length
+    return workers + max(detect, segment)
+
+
+def plan_memory(
+    max_memory: int | str,
+    n_metrics: int,
+    time_series_length: int,
+    n_jobs: int = 1,
+    fixed_workers: bool = False,
+    penalty_tuning: bool = False,
+    bandwidth_tuning: bool = False,
+) -> MemoryPlan:
+    """The first plan (see the module docstring) whose estimate fits ``max_memory``.
+
+    Args:
+        max_memory: The budget (see :func:`parse_memory`).
+        n_metrics: Columns entering detection.
+        time_series_length: Rows of the frame.
+        n_jobs: Configured workers (the effective count, ``>= 1``).
+        fixed_workers: The workers belong to a running executor, so only the
+            chunking can be planned.
+        penalty_tuning: See :func:`estimate_memory`.
+        bandwidth_tuning: See :func:`estimate_memory`.
+
+    Raises:
+        MemoryBudgetError: If no plan fits.
+    """
+    budget = parse_memory(max_memory)
+    chunk_sizes = [None] + [size for size in CHUNK_SIZES if size < n_metrics]
+    worker_counts = [n_jobs] if fixed_workers else [n_jobs >> k for k in range(n_jobs.bit_length())]
+    estimate = 0
+    for n_workers in worker_counts:
+        for chunk_size in chunk_sizes:
+            estimate = estimate_memory(
+                n_metrics,
+                time_series_length,
+                n_workers=n_workers,
+                spawns_workers=not fixed_workers,
+                chunk_size=chunk_size,
+                penalty_tuning=penalty_tuning,
+                bandwidth_tuning=bandwidth_tuning,
+            )
+            if estimate <= budget:
+                return MemoryPlan(n_jobs=n_workers, chunk_size=chunk_size, estimate=estimate, budget=budget)
+    raise MemoryBudgetError(
+        f"No execution plan fits max_memory={max_memory!r} ({budget} bytes): sifting {n_metrics} metrics x "
+        f"{time_series_length} rows needs an estimated {estimate} bytes even with {worker_counts[-1]} worker(s) "
+        f"and chunked detection. Raise max_memory, or sift fewer metrics or a shorter window"
+        + (" (penalty_adjust='auto' keeps every metric's penalty path)." if penalty_tuning else ".")
+    )
@@ -0,0 +1,598 @@
+"""Long-lived worker pools for the parallel pipeline stages.
+
+By default every parallel stage of a sift opens its own ``joblib.Parallel``
+context. A :class:`WorkerPool` is started once instead -- its workers pre-import
+the detection stack and pre-build the change-point searchers -- and then serves
+every stage of every sift that uses it, so a service running many small sifts
+pays the worker start-up only once::
+
+    with Sifter(n_jobs=8) as sifter:  # owns a warm pool until the block exits
+        for frame in frames:
+            sifter.sift(frame)
+
+    pool = WorkerPool(max_workers=8)  # or share one pool between sifters
+    Sifter(execution=ExecutionOptions(executor=pool)).sift(frame)
+
+Without an executor, ``ExecutionOptions(backend=...)`` picks joblib's worker kind:
+``"processes"`` (loky, every task pickled) or ``"threads"`` (no pickling; pays
+off where the work runs in native code that releases the GIL, and everywhere
+on a free-threaded interpreter, where ``"auto"`` picks threads).
+
+Any :class:`concurrent.futures.Executor` can serve a sifter: a
+:class:`ThreadPool` runs the stages on threads of this process, and a
+:class:`metricsifter.remote.RemoteExecutor` on worker servers of other hosts.
+An executor that does not declare its ``max_workers`` is used as ``n_jobs``
+workers: a stage keeps at most that many of its tasks submitted at once.
+On an executor, detection ships its metrics as column blocks and receives
+compact change-point arrays back (see
+:func:`metricsifter.algo.detection.detect_column_block`).
+
+Native thread pools (OpenMP, BLAS, numexpr) are governed so that workers times
+threads per worker stays within the CPUs: process workers are started with
+:data:`THREAD_LIMIT_VARS` set, sized from the workers of the stage that starts
+them (see :func:`worker_threads`). Thread workers share this process's pools;
+:func:`native_thread_limit` lowers those with threadpoolctl, which also
+throttles every other thread of the process, so a sift only does it for an
+explicit ``threads_per_worker``. A sift nested in an already-parallel caller
+gets a smaller CPU budget (see :func:`sift_budget`).
+"""
+
+import contextlib
+import contextvars
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, TypeVar
+
+from joblib import Parallel, delayed, effective_n_jobs, parallel_config
+from joblib.externals.loky import ProcessPoolExecutor
+from joblib.parallel import get_active_backend
+
+try:  # optional: lowers the native thread pools of this process
+    from threadpoolctl import ThreadpoolController
+except ImportError:  # pragma: no cover - depends on the environment
+    ThreadpoolController = None
+
+from metricsifter.cancellation import CancellationToken
+
+#: Search methods whose searchers a :class:`WorkerPool` pre-builds in every worker.
+WARM_SEARCH_METHODS: tuple[str, ...] = ("pelt", "binseg", "bottomup")
+
+#: Worker kinds of ``ExecutionOptions(backend=...)``; ``"auto"`` resolves with :func:`resolve_backend`.
+BACKENDS: tuple[str, ...] = ("auto", "processes", "threads")
+
+#: Environment variables that size the native thread pools of a new process.
+THREAD_LIMIT_VARS: tuple[str, ...] = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+#: Environment variable set in the worker processes of a :class:`WorkerPool`.
+WORKER_ENV_VAR: str = "METRICSIFTER_WORKER"
+
+#: Seconds to wait for every worker of a starting pool to report ready.
+_STARTUP_TIMEOUT: float = 120.0
+
+# Longest wait for an executor task before re-checking a cancellation token
+# without a deadline (which may be cancelled from another thread).
+_CANCEL_POLL_INTERVAL: float = 0.1
+
+
+def gil_disabled() -> bool:
+    """Whether this interpreter runs without the GIL (a free-threaded build with the GIL off)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)  # Python 3.13+
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_backend(backend: str) -> str:
+    """``"processes"`` or ``"threads"``: ``"auto"`` is threads exactly when the GIL is disabled."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend={backend!r} is not supported. Choose one of {list(BACKENDS)}.")
+    if backend == "auto":
+        return "threads" if gil_disabled() else "processes"
+    return backend
+
+
+def backend_config(backend: str, threads_per_worker: int | None = None) -> contextlib.AbstractContextManager:
+    """A context in which ``joblib.Parallel(n_jobs=...)`` uses the workers of ``backend``.
+
+    Threads are only a preference, so a backend the caller configured with
+    :func:`joblib.parallel_config` still wins. Worker processes get
+    ``threads_per_worker`` native threads each (joblib's default,
+    ``cpu_count() // n_jobs``, when ``None``), unless the caller configured
+    another backend.
+    """
+    if resolve_backend(backend) == "threads":
+        return parallel_config(prefer="threads")
+    active, _ = get_active_backend()
+    if threads_per_worker is not None and type(active).__name__ == "LokyBackend" and active.nesting_level == 0:
+        return parallel_config(backend="loky", inner_max_num_threads=threads_per_worker)
+    return contextlib.nullcontext()
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (its affinity mask, where the platform has one)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def _process_cpus() -> int:
+    """:func:`available_cpus`, or the share a parallel parent gave this process when it is a worker.
+
+    joblib and :class:`WorkerPool` start their workers with
+    :data:`THREAD_LIMIT_VARS` set to the worker's share, which caps a child
+    process that has them. A :class:`WorkerPool` worker (marked by
+    :data:`WORKER_ENV_VAR`) started without them gets one CPU; any other
+    child process, e.g. of the caller's own ``multiprocessing`` pool, gets
+    :func:`available_cpus`.
+    """
+    cpus = available_cpus()
+    if multiprocessing.parent_process() is None:
+        return cpus
+    limits = [int(os.environ[var]) for var in THREAD_LIMIT_VARS if os.environ.get(var, "").isdigit()]
+    if limits:
+        return max(1, min([cpus, *limits]))
+    return 1 if os.environ.get(WORKER_ENV_VAR) else cpus
+
+
+# The CPU budget of the sift running in this context (None outside a sift),
+# and the number of sifts running in this process.
+_budget: contextvars.ContextVar[int | None] = contextvars.ContextVar("metricsifter_cpu_budget", default=None)
+_running_sifts = 0
+_running_lock = threading.Lock()
+
+
+def cpu_budget() -> int:
+    """CPUs the running sift may use (see :func:`sift_budget`); this process's share outside a sift."""
+    budget = _budget.get()
+    return _process_cpus() if budget is None else budget
+
+
+@contextlib.contextmanager
+def sift_budget() -> Iterator[int]:
+    """Run a sift under its CPU budget, counting it as running in this process.
+
+    The budget is the process's CPUs, shrunk when the sift is nested in an
+    already-parallel caller: in a worker process of a parallel parent it is
+    the worker's share (see :func:`_process_cpus`), and with ``k`` sifts
+    running at once in this process (e.g. on the threads of a web server or of
+    ``joblib.Parallel``) it is a ``1 / k`` share. A sift entered from within
+    a sift keeps the outer budget.
+    """
+    global _running_sifts
+    if _budget.get() is not None:
+        yield _budget.get()
+        return
+    with _running_lock:
+        _running_sifts += 1
+        running = _running_sifts
+    token = _budget.set(max(1, _process_cpus() // running))
+    try:
+        yield _budget.get()
+    finally:
+        _budget.reset(token)
+        with _running_lock:
+            _running_sifts -= 1
+
+
+def check_threads_per_worker(policy: int | str | None) -> None:
+    """Raise ``ValueError`` unless ``policy`` is ``"auto"``, a positive int or ``None``."""
+    if policy is None or policy == "auto":
+        return
+    if isinstance(policy, bool) or not isinstance(policy, int) or policy < 1:
+        raise ValueError(f"threads_per_worker must be 'auto', a positive int or None, got {policy!r}.")
+
+
+def threads_per_worker(policy: int | str | None, n_workers: int, cpus: int | None = None) -> int | None:
+    """Native threads each of ``n_workers`` workers may run under ``policy``.
+
+    ``"auto"`` splits the ``cpus`` (default: :func:`cpu_budget`) evenly, so
+    that workers x threads per worker does not exceed them; an int is used as
+    is, and ``None`` leaves the thread pools alone. Only workers of a parallel
+    parent get a smaller budget (see :func:`_process_cpus`): a sift in any
+    other child process splits all of its CPUs.
+    """
+    if policy != "auto":
+        return policy
+    return max(1, (cpu_budget() if cpus is None else cpus) // max(1, n_workers))
+
+
+# The threads_per_worker policy of the sift running in this context (None
+# outside a sift): the joblib worker processes of every stage get its share.
+_worker_policy: contextvars.ContextVar[int | str | None] = contextvars.ContextVar(
+    "metricsifter_threads_per_worker", default=None
+)
+
+
+@contextlib.contextmanager
+def worker_threads(policy: int | str | None) -> Iterator[None]:
+    """Size the native threads of the joblib worker processes started in this context.
+
+    Every ``joblib.Parallel`` of :func:`map_tasks`, :func:`imap_unordered` and
+    :func:`imap_cancellable` starts its workers with :data:`THREAD_LIMIT_VARS`
+    set to ``threads_per_worker(policy, n_jobs)`` for its own ``n_jobs`` (see
+    :func:`backend_config`), so a stage sized down to a few workers gives
+    each of them more threads. Only the workers are limited, not this process.
+    """
+    token = _worker_policy.set(policy)
+    try:
+        yield
+    finally:
+        _worker_policy.reset(token)
+
+
+def _joblib_parallel(n_jobs: int, **kwargs: Any) -> Parallel:
+    """``joblib.Parallel(n_jobs=n_jobs, **kwargs)`` under the thread policy of :func:`worker_threads`."""
+    threads = threads_per_worker(_worker_policy.get(), effective_n_jobs(n_jobs))
+    with backend_config("processes", threads):
+        return Parallel(n_jobs=n_jobs, **kwargs)
+
+
+# The native thread limits of the contexts in native_thread_limit (the lowest
+# one applies), and the threadpoolctl limiter applying it.
+_native_limits: list[int] = []
+_native_limiter: Any = None
+_native_lock = threading.Lock()
+_controller: Any = None
+
+
+def _thread_controller() -> Any:
+    """This process's (cached) threadpoolctl controller, or ``None`` without threadpoolctl."""
+    global _controller
+    if _controller is None and ThreadpoolController is not None:
+        _controller = ThreadpoolController()
+    return _controller
+
+
+def _apply_native_limit() -> None:
+    global _native_limiter
+    if _native_limiter is not None:
+        _native_limiter.restore_original_limits()
+        _native_limiter = None
+    if _native_limits:
+        controller = _thread_controller()
+        limit = min(_native_limits)
+        over = [lib.filepath for lib in controller.lib_controllers if lib.num_threads > limit]
+        if over:
+            _native_limiter = controller.select(filepath=over).limit(limits=limit)
+
+
+@contextlib.contextmanager
+def native_thread_limit(threads: int | None) -> Iterator[None]:
+    """Lower this process's native thread pools to at most ``threads`` for the duration of the context.
+
+    The pools are process-wide, so this throttles every thread of the process,
+    not only the sift's. Pools that are already smaller keep their size. Limits of overlapping
+    contexts (e.g. concurrent sifts) combine to the lowest one, and the
+    original sizes come back when the last context exits. A no-op for
+    ``threads=None`` or without threadpoolctl.
+    """
+    if threads is None or _thread_controller() is None:
+        yield
+        return
+    with _native_lock:
+        changed = not _native_limits or threads < min(_native_limits)
+        _native_limits.append(threads)
+        if changed:
+            _apply_native_limit()
+    try:
+        yield
+    finally:
+        with _native_lock:
+            _native_limits.remove(threads)
+            if not _native_limits or threads < min(_native_limits):
+                _apply_native_limit()
+
+
+def _warm_worker(search_methods: tuple[str, ...], cost_model: str) -> None:
+    """Worker initializer: import the detection stack and build its searchers."""
+    from metricsifter.algo import detection, segmentation  # noqa: F401
+
+    detection.warm_up_searchers(search_methods, cost_model)
+
+
+def _worker_ready(delay: float) -> int:
+    # The short sleep keeps an early worker from draining every probe, so each
+    # worker has to pick one up (and therefore has finished its initializer).
+    time.sleep(delay)
+    return os.getpid()
+
+
+_WorkerPoolT = TypeVar("_WorkerPoolT", bound="WorkerPool")
+
+
+class WorkerPool(Executor):
+    """A warm, reusable process pool for :class:`metricsifter.sifter.Sifter`.
+
+    The pool starts lazily (on the first task, on :meth:`start` or on entering
+    a ``with`` block) and blocks until every worker has run its initializer, so
+    the start-up cost is paid up front and measured in :attr:`startup_seconds`.
+    It implements the :class:`concurrent.futures.Executor` protocol on top of
+    loky's process executor, which pickles tasks with cloudpickle (custom
+    selection strategies may be lambdas).
+
+    Args:
+        max_workers: Number of worker processes (joblib ``n_jobs`` convention:
+            ``-1`` = all CPUs).
+        search_methods: Searchers to pre-build in every worker.
+        cost_model: Cost model of the pre-built ``binseg`` / ``bottomup`` searchers.
+        threads_per_worker: Native (OpenMP / BLAS) threads of every worker:
+            ``"auto"`` (this process's CPUs split evenly over the workers), an
+            int, or ``None`` to leave them unset (see :func:`threads_per_worker`).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = -1,
+        search_methods: Sequence[str] = WARM_SEARCH_METHODS,
+        cost_model: str = "l2",
+        threads_per_worker: int | str | None = "auto",
+    ) -> None:
+        check_threads_per_worker(threads_per_worker)
+        self.max_workers = effective_n_jobs(max_workers)
+        self.search_methods = tuple(search_methods)
+        self.cost_model = cost_model
+        self.threads_per_worker = threads_per_worker
+        self.startup_seconds: float | None = None
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> "WorkerPool":
+        """Spawn and warm up every worker (no-op when already started).
+
+        Waits up to ``_STARTUP_TIMEOUT`` seconds for the workers. Raises
+        ``RuntimeError`` when none of them started by then, and warns
+        (``RuntimeWarning``) when only some did.
+        """
+        if self._executor is not None:
+            return self
+        started_at = time.perf_counter()
+        threads = threads_per_worker(self.threads_per_worker, self.max_workers, _process_cpus())
+        executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_warm_worker,
+            initargs=(self.search_methods, self.cost_model),
+            env={WORKER_ENV_VAR: "1", **({} if threads is None else {var: str(threads) for var in THREAD_LIMIT_VARS})},
+        )
+        ready: set[int] = set()
+        while len(ready) < self.max_workers:
+            remaining = started_at + _STARTUP_TIMEOUT - time.perf_counter()
+            if remaining <= 0:
+                break
+            probes = [executor.submit(_worker_ready, 0.01) for _ in range(self.max_workers)]
+            done, _ = wait(probes, timeout=remaining)
+            ready.update(probe.result() for probe in done)
+        if not ready:
+            executor.shutdown(wait=False, kill_workers=True)
+            raise RuntimeError(f"No worker of the pool started within {_STARTUP_TIMEOUT:g} seconds")
+        if len(ready) < self.max_workers:
+            warnings.warn(
+                f"Only {len(ready)} of {self.max_workers} pool workers started within {_STARTUP_TIMEOUT:g} seconds; "
+                "the others keep starting while the pool runs tasks",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        self._executor = executor
+        self.startup_seconds = time.perf_counter() - started_at
+        return self
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self.start()._executor.submit(fn, *args, **kwargs)
+
+    def map(self, fn: Callable, *iterables: Iterable, timeout: float | None = None, chunksize: int = 1):
+        return self.start()._executor.map(fn, *iterables, timeout=timeout, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Stop the workers; the pool can be started again afterwards."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, kill_workers=cancel_futures)
+            self._executor = None
+
+    def __enter__(self: _WorkerPoolT) -> _WorkerPoolT:  # noqa: PYI019 -- typing.Self needs Python 3.11
+        self.start()
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "WorkerPool":
+        # A pool is a handle on shared processes (e.g. sklearn.clone copies
+        # estimator params): copies refer to the same workers.
+        return self
+
+    def __reduce__(self):
+        raise TypeError("WorkerPool cannot be pickled; it is a handle on the processes of this interpreter.")
+
+
+class ThreadPool(ThreadPoolExecutor):
+    """A thread pool for :class:`metricsifter.sifter.Sifter` (tasks are not pickled).
+
+    Every thread builds its own searchers, so the detection stack is warmed as
+    in a :class:`WorkerPool`. Threads only run in parallel where the work
+    releases the GIL (numpy reductions, native code).
+
+    Args:
+        max_workers: Number of threads (joblib ``n_jobs`` convention: ``-1`` = all CPUs).
+        search_methods: Searchers to pre-build in every thread.
+        cost_model: Cost model of the pre-built ``binseg`` / ``bottomup`` searchers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = -1,
+        search_methods: Sequence[str] = WARM_SEARCH_METHODS,
+        cost_model: str = "l2",
+    ) -> None:
+        self.max_workers = effective_n_jobs(max_workers)
+        super().__init__(
+            max_workers=self.max_workers,
+            thread_name_prefix="metricsifter",
+            initializer=_warm_worker,
+            initargs=(tuple(search_methods), cost_model),
+        )
+
+    def __deepcopy__(self, memo: dict) -> "ThreadPool":
+        return self
+
+    def __reduce__(self):
+        raise TypeError("ThreadPool cannot be pickled; it is a handle on the threads of this interpreter.")
+
+
+def executor_workers(executor: Executor, n_jobs: int = 1) -> int:
+    """The number of tasks ``executor`` runs at once (``n_jobs`` workers when it does not say)."""
+    return getattr(executor, "max_workers", None) or effective_n_jobs(n_jobs)
+
+
+def _submission_limit(executor: Executor, n_jobs: int) -> int | None:
+    """How many tasks to keep submitted to ``executor`` at once (``None``: no limit).
+
+    An executor that declares its ``max_workers`` never runs more than that, so
+    everything is submitted up front; any other executor may be wider than the
+    ``n_jobs`` workers a stage was planned for.
+    """
+    return None if getattr(executor, "max_workers", None) else effective_n_jobs(n_jobs)
+
+
+def _run_chunk(fn: Callable, chunk: Sequence[tuple]) -> list:
+    return [fn(*args) for args in chunk]
+
+
+def _imap_bounded(fn: Callable, tasks: Iterable[tuple], executor: Executor, limit: int) -> Iterator[tuple[int, Any]]:
+    """Yield ``(i, fn(*args))`` pairs in completion order, with at most ``limit`` tasks submitted at once."""
+    tasks = enumerate(tasks)
+    pending: dict[Future, int] = {}
+    try:
+        while True:
+            for i, args in itertools.islice(tasks, limit - len(pending)):
+                pending[executor.submit(fn, *args)] = i
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def map_tasks(
+    fn: Callable,
+    tasks: Sequence[tuple],
+    n_jobs: int = 1,
+    executor: Executor | None = None,
+) -> list:
+    """``[fn(*args) for args in tasks]``, in task order, run in parallel.
+
+    Uses ``executor`` when one is given (tasks are batched into a few chunks
+    per worker), and a ``joblib.Parallel(n_jobs=n_jobs)`` context otherwise.
+    """
+    if executor is None:
+        return _joblib_parallel(n_jobs)(delayed(fn)(*args) for args in tasks)
+    if not tasks:
+        return []
+    chunksize = max(1, len(tasks) // (4 * executor_workers(executor, n_jobs)))
+    limit = _submission_limit(executor, n_jobs)
+    if limit is None:
+        return list(executor.map(fn, *zip(*tasks), chunksize=chunksize))
+    chunks = [(fn, tasks[start : start + chunksize]) for start in range(0, len(tasks), chunksize)]
+    results = dict(_imap_bounded(_run_chunk, chunks, executor, limit))
+    return [result for k in range(len(chunks)) for result in results[k]]
+
+
+def _indexed(fn: Callable, i: int, args: tuple) -> tuple[int, Any]:
+    return i, fn(*args)
+
+
+def imap_unordered(
+    fn: Callable,
+    tasks: Sequence[tuple],
+    n_jobs: int = 1,
+    executor: Executor | None = None,
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(i, fn(*tasks[i]))`` pairs in completion order.
+
+    The streaming counterpart of :func:`map_tasks`: ``executor`` tasks are
+    submitted one by one, and a ``joblib.Parallel(n_jobs=n_jobs)`` context
+    returns its results as they arrive otherwise.
+    """
+    if executor is None:
+        yield from _joblib_parallel(n_jobs, return_as="generator_unordered")(
+            delayed(_indexed)(fn, i, args) for i, args in enumerate(tasks)
+        )
+        return
+    limit = _submission_limit(executor, n_jobs)
+    if limit is not None:
+        yield from _imap_bounded(fn, tasks, executor, limit)
+        return
+    futures = {executor.submit(fn, *args): i for i, args in enumerate(tasks)}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def imap_cancellable(
+    fn: Callable,
+    tasks: Iterable[tuple],
+    token: CancellationToken,
+    n_jobs: int = 1,
+    executor: Executor | None = None,
+) -> Iterator[tuple[int, Any]]:
+    """:func:`imap_unordered` that stops once ``token`` is cancelled.
+
+    Tasks are dispatched in order, a few per worker at a time, and no new task
+    is dispatched after the token is cancelled; tasks still queued on the
+    workers are then cancelled, and tasks already running are abandoned (their
+    results are discarded). The results completed so far have been yielded.
+    """
+    tasks = enumerate(tasks)
+    if executor is None:
+
+        def dispatch():
+            for i, args in tasks:
+                if token.cancelled:
+                    return
+                yield delayed(_indexed)(fn, i, args)
+
+        results = _joblib_parallel(n_jobs, return_as="generator_unordered")(dispatch())
+        try:
+            for item in results:
+                yield item
+                if token.cancelled:
+                    return
+        finally:
+            results.close()  # aborts the tasks joblib has queued
+        return
+
+    # A few tasks queue behind every worker, unless that would let an
+    # executor of unknown width run more than n_jobs of them at once.
+    max_in_flight = _submission_limit(executor, n_jobs) or 2 * executor_workers(executor, n_jobs)
+    pending: dict[Future, int] = {}
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_in_flight and not token.cancelled:
+                task = next(tasks, None)
+                if task is None:
+                    exhausted = True
+                else:
+                    pending[executor.submit(fn, *task[1])] = task[0]
+            if not pending or token.cancelled:
+                return
+            remaining = token.remaining()
+            timeout = _CANCEL_POLL_INTERVAL if remaining is None else min(remaining, _CANCEL_POLL_INTERVAL)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+    finally:
+        for future in pending:
+            future.cancel()
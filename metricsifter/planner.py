@@ -0,0 +1,391 @@
+"""Runtime cost model of change-point detection, and execution plan selection.
+
+Which search method and how many workers sift a frame fastest depends on the
+series length, the number of metrics and the missing values (leading and
+trailing NaN runs are trimmed before detection, so they cost nothing). A
+:class:`RuntimeModel` predicts the per-column detection time of every search
+method as a power law of the (trimmed) series length::
+
+    seconds = exp(log_scale) * length ** exponent
+
+fitted by :func:`calibrate`, a micro-benchmark that times each searcher on
+synthetic piecewise-constant series. :data:`DEFAULT_RUNTIME_MODEL` was
+calibrated on a reference machine; rerun ``metricsifter calibrate`` (or
+:func:`calibrate`) on the target hardware for sharper predictions and pass the
+saved model as ``ExecutionOptions(runtime_model=...)``.
+
+:func:`estimate_plans` combines the column predictions with a parallel model
+(worker start-up, per-task dispatch overhead, at most ``os.cpu_count()``
+useful workers) and the memory model of :mod:`metricsifter.memory` into one
+:class:`~metricsifter.types.ExecutionPlan` per search method and worker count;
+:func:`choose_plan` picks one for ``Sifter(search_method="auto")``.
+
+The same parallel model sizes every parallel stage of a sift with
+``ExecutionOptions(parallelism="auto")``: :func:`choose_workers` keeps a stage
+in the calling process unless its predicted work outweighs the start-up and
+dispatch overhead of workers, which on small frames it rarely does.
+"""
+
+import json
+import math
+import os
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from typing import Final
+
+import numpy as np
+import pandas as pd
+
+from metricsifter import memory
+from metricsifter.algo import detection
+from metricsifter.types import ExecutionPlan
+
+__all__ = [
+    "DEFAULT_RUNTIME_MODEL",
+    "RuntimeModel",
+    "benchmark_backends",
+    "calibrate",
+    "choose_plan",
+    "choose_workers",
+    "estimate_plans",
+]
+
+#: Search methods ``search_method="auto"`` chooses from.
+SEARCH_METHODS: Final[tuple[str, ...]] = ("pelt", "binseg", "bottomup")
+
+#: Modes of ``ExecutionOptions(parallelism=...)``: ``"auto"`` sizes every parallel stage
+#: with :func:`choose_workers`, ``"fixed"`` always runs it on ``n_jobs`` (or the executor).
+PARALLELISM: Final[tuple[str, ...]] = ("auto", "fixed")
+
+#: Series lengths :func:`calibrate` times by default.
+CALIBRATION_LENGTHS: Final[tuple[int, ...]] = (128, 512, 2048)
+
+#: ``(n_metrics, n_rows)`` frames :func:`benchmark_backends` times by default:
+#: many short series, a mid-sized frame, and few long series.
+BENCHMARK_SHAPES: Final[tuple[tuple[int, int], ...]] = ((50, 200), (500, 500), (100, 2000))
+
+# Upper bound on the (rows x columns) block read at once when measuring the
+# trimmed length of every column.
+_LENGTH_BLOCK_SIZE: Final[int] = 1 << 20
+
+
+@dataclass(frozen=True)
+class RuntimeModel:
+    """Calibrated per-column detection cost of every search method.
+
+    Attributes:
+        single: ``search_method -> (log_scale, exponent)`` of one detection at a
+            fixed ``penalty_adjust``.
+        path: The same for a ``penalty_adjust="auto"`` penalty path (one fit
+            plus a predict per grid point).
+        worker_startup: Seconds to start the workers of a parallel sift (not
+            charged when a running executor is used).
+        task_overhead: Seconds of dispatch overhead per column on a worker.
+        bootstrap_seconds: Serial seconds of a ``bandwidth="auto"`` bootstrap
+            per change point of the frame.
+    """
+
+    single: dict[str, tuple[float, float]] = field(default_factory=dict)
+    path: dict[str, tuple[float, float]] = field(default_factory=dict)
+    worker_startup: float = 1.0
+    task_overhead: float = 5e-4
+    bootstrap_seconds: float = 1.5e-4
+
+    def column_seconds(self, search_method: str, lengths: np.ndarray, penalty_tuning: bool = False) -> float:
+        """Predicted serial seconds to detect columns of the given trimmed ``lengths``."""
+        coefficients = (self.path if penalty_tuning else self.single).get(search_method)
+        if coefficients is None:
+            raise ValueError(f"The runtime model is not calibrated for search_method={search_method!r}.")
+        log_scale, exponent = coefficients
+        lengths = np.asarray(lengths, dtype=float)
+        lengths = lengths[lengths >= 2]  # shorter cores are not searched
+        return float(np.exp(log_scale) * np.sum(lengths**exponent))
+
+    def to_dict(self) -> dict:
+        return {
+            "single": {method: list(coefficients) for method, coefficients in self.single.items()},
+            "path": {method: list(coefficients) for method, coefficients in self.path.items()},
+            "worker_startup": float(self.worker_startup),
+            "task_overhead": float(self.task_overhead),
+            "bootstrap_seconds": float(self.bootstrap_seconds),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RuntimeModel":
+        return cls(
+            single={method: tuple(coefficients) for method, coefficients in d["single"].items()},
+            path={method: tuple(coefficients) for method, coefficients in d["path"].items()},
+            worker_startup=d.get("worker_startup", 1.0),
+            task_overhead=d.get("task_overhead", 5e-4),
+            bootstrap_seconds=d.get("bootstrap_seconds", 1.5e-4),
+        )
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Write the model as JSON (see :meth:`load`)."""
+        with open(path, "w", encoding="utf-8") as fp:
+            json.dump(self.to_dict(), fp, indent=2)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "RuntimeModel":
+        with open(path, encoding="utf-8") as fp:
+            return cls.from_dict(json.load(fp))
+
+
+#: Calibrated by :func:`calibrate` on a reference machine (one x86-64 core).
+DEFAULT_RUNTIME_MODEL: Final[RuntimeModel] = RuntimeModel(
+    single={
+        "pelt": (-15.766, 1.439),
+        "binseg": (-9.594, 1.016),
+        "bottomup": (-9.863, 0.97),
+    },
+    path={
+        "pelt": (-15.169, 1.707),
+        "binseg": (-9.154, 0.963),
+        "bottomup": (-8.833, 0.95),
+    },
+)
+
+
+def _synthetic_series(length: int, rng: np.random.Generator) -> np.ndarray:
+    """Noisy piecewise-constant series with a level shift every ~``length / 4`` rows."""
+    levels = rng.normal(0.0, 3.0, size=4)
+    return np.repeat(levels, -(-length // 4))[:length] + rng.normal(0.0, 1.0, size=length)
+
+
+def _fit_power_law(lengths: Sequence[int], seconds: Sequence[float]) -> tuple[float, float]:
+    """Least-squares ``(log_scale, exponent)`` of ``seconds = exp(log_scale) * length ** exponent``."""
+    exponent, log_scale = np.polyfit(np.log(lengths), np.log(np.maximum(seconds, 1e-9)), deg=1)
+    return round(float(log_scale), 3), round(float(exponent), 3)
+
+
+def calibrate(
+    lengths: Sequence[int] = CALIBRATION_LENGTHS,
+    search_methods: Sequence[str] = SEARCH_METHODS,
+    cost_model: str = "l2",
+    repeats: int = 3,
+    random_state: int | None = 0,
+) -> RuntimeModel:
+    """Fit a :class:`RuntimeModel` by timing every searcher on synthetic series.
+
+    Each ``(search_method, length)`` pair is timed ``repeats`` times (keeping
+    the fastest run) for a single detection and for a penalty path. Takes a
+    few seconds with the defaults. The parallel overheads and the bootstrap
+    cost keep their defaults.
+    """
+    rng = np.random.default_rng(random_state)
+    series = {length: _synthetic_series(length, rng) for length in lengths}
+    tolerance = detection._plateau_tolerance(max(lengths))
+    single, path = {}, {}
+    for search_method in search_methods:
+        detection.warm_up_searchers((search_method,), cost_model)
+        single_seconds, path_seconds = [], []
+        for length in lengths:
+            x = series[length]
+            single_seconds.append(
+                _fastest(repeats, detection.detect_univariate_changepoints, x, search_method, cost_model, "bic", 2.0)
+            )
+            path_seconds.append(
+                _fastest(
+                    repeats,
+                    detection.univariate_penalty_path_with_matches,
+                    x,
+                    search_method,
+                    cost_model,
+                    "bic",
+                    detection.PENALTY_ADJUST_GRID,
+                    "std",
+                    tolerance,
+                )
+            )
+        single[search_method] = _fit_power_law(lengths, single_seconds)
+        path[search_method] = _fit_power_law(lengths, path_seconds)
+    return RuntimeModel(single=single, path=path)
+
+
+def _fastest(repeats: int, fn, *args) -> float:
+    best = math.inf
+    for _ in range(max(repeats, 1)):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_backends(
+    shapes: Sequence[tuple[int, int]] = BENCHMARK_SHAPES,
+    n_jobs: int = -1,
+    search_method: str = "pelt",
+    repeats: int = 3,
+    random_state: int | None = 0,
+) -> list[dict[str, float]]:
+    """Time STEP0 + detection of synthetic frames serially and on ``n_jobs`` processes and threads.
+
+    Shows on the target hardware (and interpreter: free-threaded builds run
+    threads without the GIL) which ``ExecutionOptions(backend=...)`` to use for which
+    frame size. Every configuration is warmed up once (so process start-up is
+    not timed, as in a long-lived service) and timed ``repeats`` times,
+    keeping the fastest run.
+
+    Returns:
+        list[dict[str, float]]: One row per shape: ``n_metrics``, ``n_rows``
+        and the seconds of ``serial``, ``processes`` and ``threads``.
+    """
+    from metricsifter.execution import ExecutionOptions
+    from metricsifter.sifter import Sifter
+
+    rng = np.random.default_rng(random_state)
+    sifters = {"serial": Sifter(search_method=search_method, n_jobs=1)}
+    for backend in ("processes", "threads"):
+        options = ExecutionOptions(backend=backend, parallelism="fixed")
+        sifters[backend] = Sifter(search_method=search_method, n_jobs=n_jobs, execution=options)
+    rows = []
+    for n_metrics, n_rows in shapes:
+        frame = pd.DataFrame({f"m{i}": _synthetic_series(n_rows, rng) for i in range(n_metrics)})
+        row = {"n_metrics": n_metrics, "n_rows": n_rows}
+        for name, sifter in sifters.items():
+            sifter.detect(frame)
+            row[name] = _fastest(repeats, sifter.detect, frame)
+        rows.append(row)
+    return rows
+
+
+def trimmed_lengths(data: pd.DataFrame, columns: np.ndarray) -> np.ndarray:
+    """Length of every column in ``columns`` after trimming leading and trailing NaN."""
+    n_rows = data.shape[0]
+    lengths = np.zeros(len(columns), dtype=np.int64)
+    if n_rows == 0:
+        return lengths
+    step = max(1, _LENGTH_BLOCK_SIZE // n_rows)
+    for start in range(0, len(columns), step):
+        block = columns[start : start + step]
+        valid = ~np.isnan(data.iloc[:, block].to_numpy(dtype=float))
+        first = valid.argmax(axis=0)
+        last = n_rows - 1 - valid[::-1].argmax(axis=0)
+        lengths[start : start + len(block)] = np.where(valid.any(axis=0), last - first + 1, 0)
+    return lengths
+
+
+def estimate_plans(
+    lengths: np.ndarray,
+    n_rows: int,
+    model: RuntimeModel = DEFAULT_RUNTIME_MODEL,
+    search_methods: Sequence[str] = SEARCH_METHODS,
+    worker_counts: Sequence[int] = (1,),
+    warm_workers: bool = False,
+    penalty_tuning: bool = False,
+    bandwidth_tuning: bool = False,
+) -> list[ExecutionPlan]:
+    """Predicted detection seconds and peak memory of every (search method, worker count) plan.
+
+    Args:
+        lengths: Trimmed length of every column entering detection (see
+            :func:`trimmed_lengths`).
+        n_rows: Rows of the frame.
+        model: The runtime model.
+        search_methods: Search methods to plan for.
+        worker_counts: Worker counts to plan for.
+        warm_workers: The workers belong to a running executor (no start-up
+            cost, and not charged to the sift's memory).
+        penalty_tuning: ``penalty_adjust="auto"`` (penalty paths per column).
+        bandwidth_tuning: ``bandwidth="auto"`` (see :func:`memory.estimate_memory`).
+
+    Returns:
+        list[ExecutionPlan]: Sorted by predicted seconds, fewer workers first on ties.
+    """
+    n_tasks = len(lengths)
+    plans = []
+    for search_method in search_methods:
+        serial = model.column_seconds(search_method, lengths, penalty_tuning)
+        for n_jobs in worker_counts:
+            seconds = _parallel_seconds(serial, n_tasks, n_jobs, model, warm_workers)
+            peak = memory.estimate_memory(
+                n_tasks,
+                n_rows,
+                n_workers=n_jobs,
+                spawns_workers=not warm_workers,
+                penalty_tuning=penalty_tuning,
+                bandwidth_tuning=bandwidth_tuning,
+            )
+            plans.append(ExecutionPlan(search_method=search_method, n_jobs=n_jobs, seconds=seconds, memory=peak))
+    return sorted(plans, key=lambda plan: (plan.seconds, plan.n_jobs))
+
+
+def _parallel_seconds(
+    serial: float, n_tasks: int, n_jobs: int, model: RuntimeModel, warm_workers: bool, cpus: int | None = None
+) -> float:
+    """Predicted seconds of ``n_tasks`` tasks worth ``serial`` seconds on ``n_jobs`` workers sharing ``cpus``."""
+    if n_jobs <= 1 or n_tasks == 0:
+        return serial
+    useful = min(n_jobs, cpus or os.cpu_count() or 1, n_tasks)
+    startup = 0.0 if warm_workers else model.worker_startup
+    return startup + (serial + n_tasks * model.task_overhead) / useful
+
+
+def choose_workers(
+    serial: float,
+    n_tasks: int,
+    worker_counts: Sequence[int],
+    model: RuntimeModel = DEFAULT_RUNTIME_MODEL,
+    warm_workers: bool = False,
+    available_memory: int | None = None,
+    cpus: int | None = None,
+) -> int:
+    """The worker count predicted to run a parallel stage fastest (``1`` = in the calling process).
+
+    Args:
+        serial: Predicted serial seconds of the stage.
+        n_tasks: Tasks the stage splits into.
+        worker_counts: Worker counts to choose from (``1`` is always a candidate).
+        model: The runtime model (its parallel overheads).
+        warm_workers: The workers are already running (no start-up cost).
+        available_memory: Bytes free for new worker processes (see
+            :func:`memory.available_memory`); counts whose spawned workers
+            (:data:`memory.WORKER_OVERHEAD` each) do not fit are skipped.
+        cpus: CPUs the workers share (default: this host's; e.g. the total
+            workers of remote worker servers).
+
+    Returns:
+        int: The fastest count, the fewest workers on ties.
+    """
+    candidates = {1, *worker_counts}
+    if available_memory is not None and not warm_workers:
+        cap = max(1, available_memory // memory.WORKER_OVERHEAD)
+        candidates = {n for n in candidates if n <= cap}
+    return min(candidates, key=lambda n: (_parallel_seconds(serial, n_tasks, n, model, warm_workers, cpus), n))
+
+
+def choose_plan(
+    plans: Sequence[ExecutionPlan],
+    max_memory: int | str | None = None,
+    time_budget: float | None = None,
+) -> ExecutionPlan:
+    """Pick the plan a ``search_method="auto"`` sift runs.
+
+    Plans over ``max_memory`` are never chosen. Without a ``time_budget`` the
+    fastest plan wins (``reason="fastest"``); with one, the plan with the
+    fewest workers that is predicted to meet it (then the fastest such plan,
+    ``reason="time_budget"``), or the fastest plan when none is
+    (``reason="over_time_budget"``).
+
+    Raises:
+        MemoryBudgetError: If every plan exceeds ``max_memory``.
+    """
+    candidates = sorted(plans, key=lambda plan: (plan.seconds, plan.n_jobs))
+    if max_memory is not None:
+        budget = memory.parse_memory(max_memory)
+        candidates = [plan for plan in candidates if plan.memory <= budget]
+        if not candidates:
+            smallest = min(plan.memory for plan in plans) if plans else 0
+            raise memory.MemoryBudgetError(
+                f"No search plan fits max_memory={max_memory!r} ({budget} bytes); "
+                f"the smallest needs an estimated {smallest} bytes."
+            )
+    if not candidates:
+        raise ValueError("No execution plans to choose from.")
+    if time_budget is None:
+        return replace(candidates[0], reason="fastest")
+    within = [plan for plan in candidates if plan.seconds <= time_budget]
+    if not within:
+        return replace(candidates[0], reason="over_time_budget")
+    return replace(min(within, key=lambda plan: (plan.n_jobs, plan.seconds)), reason="time_budget")
@@ -162,7 +162,13 @@ def plot_change_point_density(
     ax.set_yticks([])
 
     # Overlay the internal KDE density curve when it is well-defined.
-    density = segmentation.compute_kde_density(_flatten_change_points(result), time_series_length, kde_bandwidth)
+    # Reuse the sift's memoized scale space when it covers the same time axis.
+    scale_space = result.scale_space
+    if scale_space is not None and scale_space.time_series_length != time_series_length:
+        scale_space = None
+    density = segmentation.compute_kde_density(
+        _flatten_change_points(result), time_series_length, kde_bandwidth, scale_space=scale_space
+    )
     if density is not None:
         s, e = density
         ax_density = ax.twinx()
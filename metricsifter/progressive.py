@@ -0,0 +1,113 @@
+"""Progressive sifts: snapshots of the result while change points are detected.
+
+:meth:`~metricsifter.sifter.Sifter.sift_iter` detects the metrics in priority
+order and, every ``interval`` seconds, segments the change points collected so
+far into a partial :class:`~metricsifter.types.SiftResult`. With a fixed
+penalty the change points only grow, so each snapshot's KDE extends the
+previous one (see :meth:`~metricsifter.algo.segmentation.ScaleSpace.extended`)
+instead of being rebuilt; the last snapshot is segmented from scratch, exactly
+like :meth:`~metricsifter.sifter.Sifter.sift`.
+"""
+
+import copy
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import replace
+from typing import Any
+
+import pandas as pd
+
+from metricsifter import parallel
+from metricsifter.algo import segmentation
+from metricsifter.cancellation import CancellationToken
+from metricsifter.profiling import StageRecorder
+from metricsifter.sifter import AUTO, Sifter
+from metricsifter.types import BandwidthTuning, SiftResult, StageTiming
+
+__all__ = ["sift_iter"]
+
+
+def sift_iter(
+    sifter: Sifter,
+    data: pd.DataFrame,
+    without_simple_filter: bool = False,
+    priority: Sequence[str] = (),
+    interval: float = 1.0,
+    cancel_token: CancellationToken | None = None,
+) -> Iterator[SiftResult]:
+    """The snapshots of :meth:`~metricsifter.sifter.Sifter.sift_iter` (``interval`` already validated)."""
+    with sifter._entry_point():
+        token = sifter._cancellation(cancel_token)
+        sifter, timings = sifter._plan(data, without_simple_filter)
+        timings.update(sifter._start_executor())
+        sifter = sifter._with_cancel_token(token)
+        yield from _snapshots(sifter, data, without_simple_filter, priority, interval, timings)
+
+
+def _snapshots(
+    sifter: Sifter,
+    data: pd.DataFrame,
+    without_simple_filter: bool,
+    priority: Sequence[str],
+    interval: float,
+    timings: dict[str, StageTiming],
+) -> Iterator[SiftResult]:
+    recorder = StageRecorder(sifter.stage_hooks, timings)
+    order = sifter._priority_order(data, sifter._filter(data, without_simple_filter, recorder), priority)
+    fn, tasks = sifter._column_tasks(data, order)
+    token = sifter._cancel_token if sifter._cancel_token is not None else CancellationToken()
+    workers: dict[str, int] = {}  # counted in every snapshot's "detection" stage
+    n_jobs, executor = sifter._detection_workers(workers, data, order)
+    completed = parallel.imap_cancellable(fn, tasks, token, n_jobs=n_jobs, executor=executor)
+    # Fixed penalties only ever add change points, so each snapshot's KDE
+    # extends the previous one; a tuned penalty may change every metric's.
+    incremental = sifter.penalty_adjust != AUTO
+    snapshot_sifter = sifter
+    if sifter.bandwidth == AUTO:
+        snapshot_sifter = copy.copy(sifter)
+        snapshot_sifter.bandwidth = segmentation.BANDWIDTH_FALLBACK
+
+    results: dict[int, Any] = {}
+    scale_space = None
+    last = False
+    try:
+        while not last:
+            recorder = StageRecorder(sifter.stage_hooks, dict(timings))
+            with recorder.stage("detection") as counts:
+                due = time.monotonic() + interval
+                new = []
+                for i, result in completed:
+                    results[i] = result
+                    new.append(i)
+                    if time.monotonic() >= due:
+                        break
+                else:
+                    last = True
+                last = last or len(results) == len(order)
+                counts["metrics"] = len(new)
+                counts["unprocessed"] = len(order) - len(results)
+                counts.update(workers)
+            detected = sifter._partial_detection(data, order, results, recorder)
+            if detected.store.n_change_points == 0:
+                scale_space = None
+                yield sifter._build_result(detected, None, recorder.timings)
+                continue
+            if last:
+                # Segmented from scratch, exactly like sift().
+                yield sifter._build_result(detected, sifter._segment_detection(detected), recorder.timings)
+                continue
+            if incremental and scale_space is not None:
+                scale_space = scale_space.extended([cp for i in new for cp in results[i]])
+            else:
+                scale_space = segmentation.ScaleSpace(detected.store.positions, detected.time_series_length)
+            segmented = snapshot_sifter._segment(detected.store, detected.time_series_length, scale_space)
+            if snapshot_sifter is not sifter:
+                segmented = replace(
+                    segmented,
+                    bandwidth_tuning=BandwidthTuning(
+                        requested=AUTO, resolved=snapshot_sifter.bandwidth, reason="snapshot"
+                    ),
+                )
+            yield sifter._build_result(detected, segmented, recorder.timings)
+    finally:
+        completed.close()
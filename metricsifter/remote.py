@@ -0,0 +1,359 @@
+"""Socket worker servers, to spread the parallel stages of a sift over several hosts.
+
+A :class:`WorkerServer` runs on every worker host and executes the tasks it
+receives on its own worker processes. A :class:`RemoteExecutor` is the
+:class:`concurrent.futures.Executor` over a list of servers, so a sifter uses
+the hosts like a local pool::
+
+    # on every worker host
+    METRICSIFTER_AUTHKEY=... metricsifter worker --host 0.0.0.0 --port 7075 --workers 8
+
+    # on the client
+    with RemoteExecutor(["10.0.0.1:7075", "10.0.0.2:7075"], authkey=key) as executor:
+        Sifter(execution=ExecutionOptions(executor=executor)).sift(frame)
+
+The client opens one connection per worker of every server, and each
+connection carries one task (or one ``map`` chunk) at a time, so a slow host
+simply takes fewer tasks. Detection sends its metrics as column blocks and
+receives compact change-point arrays back (see
+:func:`metricsifter.algo.detection.detect_column_block`).
+
+Tasks travel pickled (functions with cloudpickle, as on a
+:class:`~metricsifter.parallel.WorkerPool`) over :mod:`multiprocessing.connection`
+sockets. The ``authkey`` handshake rejects clients without the key, but the
+traffic is neither encrypted nor sandboxed: unpickling a task runs arbitrary
+code, so only expose servers on a trusted network. Every host needs the same
+metricsifter version.
+"""
+
+import pickle
+import queue
+import threading
+import time
+import traceback
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, TypeVar
+
+from joblib import effective_n_jobs
+from joblib.externals.loky.backend.reduction import dumps as cloudpickle_dumps
+
+from metricsifter.parallel import WARM_SEARCH_METHODS, WorkerPool, _warm_worker
+
+__all__ = ["RemoteExecutor", "WorkerServer", "parse_address"]
+
+Address = tuple[str, int]
+
+_WorkerServerT = TypeVar("_WorkerServerT", bound="WorkerServer")
+_RemoteExecutorT = TypeVar("_RemoteExecutorT", bound="RemoteExecutor")
+
+
+def parse_address(address: "str | Address") -> Address:
+    """``"host:port"`` (or a ``(host, port)`` pair) as a ``(host, port)`` pair."""
+    if isinstance(address, str):
+        host, sep, port = address.rpartition(":")
+        if not sep or not host or not port.isdigit():
+            raise ValueError(f"Expected a worker address as 'host:port', got {address!r}")
+        return host, int(port)
+    host, port = address
+    return host, int(port)
+
+
+class _RemoteTraceback(Exception):
+    def __init__(self, tb: str) -> None:
+        self.tb = tb
+
+    def __str__(self) -> str:
+        return self.tb
+
+
+def _error_reply(exc: BaseException) -> bytes:
+    """The pickled ``("error", exc, traceback)`` reply of a failed task.
+
+    The client raises ``exc`` with the server-side traceback as its cause. An
+    exception that does not pickle travels as a ``RuntimeError`` naming it,
+    and the traceback still shows the original.
+    """
+    tb = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    try:
+        return cloudpickle_dumps(("error", exc, tb))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return pickle.dumps(("error", RuntimeError(f"{type(exc).__qualname__}: {exc}"), tb))
+
+
+def _run_payload(payload: bytes) -> bytes:
+    """Run a pickled ``(fn, calls)`` task; return its pickled ``(status, value, traceback)`` reply."""
+    try:
+        fn, calls = pickle.loads(payload)
+        return pickle.dumps(("ok", [fn(*args, **kwargs) for args, kwargs in calls], None))
+    except Exception as exc:  # noqa: BLE001 -- any task error is sent back and raised by the client
+        return _error_reply(exc)
+
+
+class WorkerServer:
+    """Serve the tasks of :class:`RemoteExecutor` clients on this host.
+
+    The server binds on construction (port ``0`` picks a free port, see
+    :attr:`address`) and accepts clients in :meth:`serve_forever`. Tasks run
+    on a warm :class:`~metricsifter.parallel.WorkerPool` of ``max_workers``
+    processes, or in the server process itself when ``max_workers`` is 1.
+
+    Args:
+        address: ``(host, port)`` or ``"host:port"`` to listen on.
+        authkey: Shared secret that clients must present.
+        max_workers: Tasks run at once (joblib ``n_jobs`` convention: ``-1`` = all CPUs).
+        search_methods: Searchers to pre-build in every worker.
+        cost_model: Cost model of the pre-built ``binseg`` / ``bottomup`` searchers.
+    """
+
+    def __init__(
+        self,
+        address: "str | Address" = ("127.0.0.1", 0),
+        *,
+        authkey: bytes,
+        max_workers: int = 1,
+        search_methods: Sequence[str] = WARM_SEARCH_METHODS,
+        cost_model: str = "l2",
+    ) -> None:
+        self.max_workers = effective_n_jobs(max_workers)
+        self.search_methods = tuple(search_methods)
+        self.cost_model = cost_model
+        self._authkey = authkey
+        self._listener = Listener(parse_address(address), authkey=authkey)
+        self._pool = WorkerPool(self.max_workers, self.search_methods, cost_model) if self.max_workers > 1 else None
+        self._closed = threading.Event()
+        self._serving = threading.Event()
+
+    @property
+    def address(self) -> Address:
+        """The ``(host, port)`` the server listens on."""
+        return self._listener.address
+
+    def serve_forever(self) -> None:
+        """Accept clients (each connection on its own thread) until :meth:`close`."""
+        if self._pool is not None:
+            self._pool.start()
+        self._serving.set()
+        while not self._closed.is_set():
+            try:
+                connection = self._listener.accept()
+            except (AuthenticationError, OSError):  # a client without the key, or a closed listener
+                if self._closed.is_set():
+                    break
+                continue
+            threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+
+    def _serve_connection(self, connection: Connection) -> None:
+        with connection:
+            if self._closed.is_set():
+                return
+            if self._pool is None:
+                _warm_worker(self.search_methods, self.cost_model)  # searchers are per thread
+            try:
+                connection.send(self.max_workers)
+                while True:
+                    payload = connection.recv_bytes()
+                    if self._pool is None:
+                        reply = _run_payload(payload)
+                    else:
+                        try:
+                            reply = self._pool.submit(_run_payload, payload).result()
+                        except (BrokenProcessPool, OSError) as exc:  # the pool itself failed (e.g. a worker died)
+                            reply = _error_reply(exc)
+                    connection.send_bytes(reply)
+            except (EOFError, OSError):  # the client went away
+                return
+
+    def close(self) -> None:
+        """Stop accepting clients and shut the worker pool down."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._serving.is_set():
+            try:  # wake up the pending accept()
+                Client(self.address, authkey=self._authkey).close()
+            except OSError:
+                pass
+        self._listener.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def __enter__(self: _WorkerServerT) -> _WorkerServerT:  # noqa: PYI019 -- typing.Self needs Python 3.11
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RemoteExecutor(Executor):
+    """A :class:`concurrent.futures.Executor` running tasks on :class:`WorkerServer` hosts.
+
+    Connects lazily (on the first task, on :meth:`start` or on entering a
+    ``with`` block), opening one connection per worker of every server;
+    :attr:`max_workers` is their total. Tasks are queued here and taken by
+    the first idle connection. A connection that breaks fails its task with a
+    :class:`ConnectionError`, and the other connections carry on.
+
+    Args:
+        addresses: The servers, as ``"host:port"`` or ``(host, port)``.
+        authkey: The servers' shared secret.
+    """
+
+    def __init__(self, addresses: Sequence["str | Address"], *, authkey: bytes) -> None:
+        if not addresses:
+            raise ValueError("RemoteExecutor needs at least one worker server address")
+        self.addresses = [parse_address(address) for address in addresses]
+        self._authkey = authkey
+        self._lock = threading.Lock()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: list[threading.Thread] = []
+        self._alive = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._threads)
+
+    @property
+    def max_workers(self) -> int:
+        """Connections to the servers, i.e. tasks run at once (connects when not started)."""
+        self.start()
+        return len(self._threads)
+
+    def start(self) -> "RemoteExecutor":
+        """Connect to every server (no-op when already connected)."""
+        with self._lock:
+            if self._threads:
+                return self
+            connections = []
+            try:
+                for address in self.addresses:
+                    connections.append(Client(address, authkey=self._authkey))
+                    slots = connections[-1].recv()
+                    for _ in range(slots - 1):
+                        connections.append(Client(address, authkey=self._authkey))
+                        connections[-1].recv()
+            except BaseException:
+                for connection in connections:
+                    connection.close()
+                raise
+            self._alive = len(connections)
+            self._threads = [
+                threading.Thread(target=self._dispatch, args=(connection, self._queue), daemon=True)
+                for connection in connections
+            ]
+            for thread in self._threads:
+                thread.start()
+        return self
+
+    def _dispatch(self, connection: Connection, tasks: queue.SimpleQueue) -> None:
+        """Send the queued tasks over ``connection`` one at a time, until the shutdown sentinel."""
+        lost: Future | None = None
+        with connection:
+            while (task := tasks.get()) is not None:
+                future, payload, single = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    connection.send_bytes(payload)
+                    reply = connection.recv_bytes()
+                except (EOFError, OSError) as exc:
+                    lost, error = future, ConnectionError(f"Lost the connection to a worker server: {exc!r}")
+                    break
+                try:
+                    status, value, tb = pickle.loads(reply)
+                except Exception as exc:  # noqa: BLE001 -- e.g. a result class this process cannot import
+                    failure = RuntimeError(f"Cannot unpickle the reply of a worker server: {exc!r}")
+                    failure.__cause__ = exc
+                    future.set_exception(failure)
+                    continue
+                if status == "ok":
+                    future.set_result(value[0] if single else value)
+                else:
+                    value.__cause__ = _RemoteTraceback(tb)
+                    future.set_exception(value)
+        with self._lock:
+            if tasks is self._queue:
+                self._alive -= 1
+                if self._alive == 0:  # nobody is left to run the queued tasks
+                    self._fail_queued(ConnectionError("Lost the connections to every worker server"))
+        # Fail the task only once the connection is counted out, so a caller
+        # reacting to the error sees the executor without it.
+        if lost is not None:
+            lost.set_exception(error)
+
+    def _fail_queued(self, exc: BaseException) -> None:
+        while True:
+            try:
+                task = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if task is not None and task[0].set_running_or_notify_cancel():
+                task[0].set_exception(exc)
+
+    def _submit_calls(self, fn: Callable, calls: list[tuple[tuple, dict]], single: bool) -> Future:
+        payload = cloudpickle_dumps((fn, calls))
+        self.start()
+        with self._lock:
+            if self._alive == 0:
+                raise RuntimeError("Cannot submit tasks: every worker server connection is closed")
+            future: Future = Future()
+            self._queue.put((future, payload, single))
+        return future
+
+    def submit(self, fn: Callable, /, *args: Any, **kwargs: Any) -> Future:
+        return self._submit_calls(fn, [(args, kwargs)], single=True)
+
+    def map(
+        self, fn: Callable, *iterables: Iterable, timeout: float | None = None, chunksize: int = 1
+    ) -> Iterator[Any]:
+        """Like :meth:`concurrent.futures.Executor.map`; every chunk of ``chunksize`` calls is one round trip."""
+        calls = [(args, {}) for args in zip(*iterables)]
+        futures = [
+            self._submit_calls(fn, calls[start : start + chunksize], single=False)
+            for start in range(0, len(calls), max(1, chunksize))
+        ]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def results() -> Iterator[Any]:
+            try:
+                for future in futures:
+                    yield from future.result(None if deadline is None else deadline - time.monotonic())
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return results()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Finish (or with ``cancel_futures``, cancel) the queued tasks and disconnect; :meth:`start` reconnects."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            if cancel_futures:
+                while True:
+                    try:
+                        task = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if task is not None:
+                        task[0].cancel()
+            for _ in threads:
+                self._queue.put(None)
+            # The exiting connections drain the old queue; a restart gets a new one.
+            self._queue = queue.SimpleQueue()
+            self._alive = 0
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def __enter__(self: _RemoteExecutorT) -> _RemoteExecutorT:  # noqa: PYI019 -- typing.Self needs Python 3.11
+        self.start()
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "RemoteExecutor":
+        return self
+
+    def __reduce__(self):
+        raise TypeError("RemoteExecutor cannot be pickled; it is a handle on the connections of this interpreter.")
@@ -0,0 +1,112 @@
+"""Sifting one frame in column shards with a global segmentation.
+
+:meth:`~metricsifter.sifter.Sifter.sift_sharded` runs STEP0 and STEP1 of every
+column shard (e.g. the metrics of one service) as one task, so a worker only
+ever holds one shard, and merges the shards' compact change-point stores, in
+column order, for a single global segmentation and selection: the result is
+the :meth:`~metricsifter.sifter.Sifter.sift` result of the whole frame.
+"""
+
+from collections.abc import Hashable, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from metricsifter import parallel
+from metricsifter.adapters import prometheus
+from metricsifter.algo import detection
+from metricsifter.profiling import StageRecorder
+from metricsifter.sifter import AUTO, Sifter, _store_counts
+from metricsifter.types import ChangePointDetection, SiftResult
+
+__all__ = ["sift_sharded"]
+
+
+def sift_sharded(
+    sifter: Sifter,
+    data: pd.DataFrame,
+    shards: Mapping[str, Hashable] | Sequence[str],
+    without_simple_filter: bool = False,
+) -> SiftResult:
+    """The :meth:`~metricsifter.sifter.Sifter.sift` result of ``data``, detected shard by shard."""
+    sifter, timings = sifter._plan(data, without_simple_filter)
+    timings.update(sifter._start_executor())
+    shard_columns = _shard_columns(data, shards)
+    recorder = StageRecorder(sifter.stage_hooks)
+
+    # STEP0 + STEP1 per shard, timed together as the "detection" stage
+    with recorder.stage("detection") as counts:
+        shard_sifter = sifter._serial_copy()
+        # STEP0 runs on the shards, so every column is assumed to be detected in full.
+        lengths = np.full(data.shape[1], data.shape[0])
+        n_jobs, executor = sifter._stage_workers(
+            counts,
+            len(shard_columns),
+            lambda model: model.column_seconds(sifter.search_method, lengths, sifter.penalty_adjust == AUTO),
+        )
+        outputs = parallel.map_tasks(
+            _detect_shard,
+            [(shard_sifter, data.iloc[:, positions], without_simple_filter) for positions in shard_columns],
+            n_jobs=n_jobs,
+            executor=executor,
+        )
+
+        # Merge the shards back into column order.
+        kept = [positions[local] for positions, (local, _) in zip(shard_columns, outputs)]
+        merged_columns = np.concatenate(kept) if kept else np.zeros(0, dtype=np.int64)
+        order = np.argsort(merged_columns, kind="stable")
+        columns = merged_columns[order]
+        counts["shards"] = len(shard_columns)
+        counts["metrics_in"] = data.shape[1]
+        counts["metrics_out"] = len(columns)
+    penalty_tuning = None
+    if sifter.penalty_adjust != AUTO:
+        store = detection.ChangePointStore.concat([shard_store for _, shard_store in outputs]).take(order)
+    else:
+        with recorder.stage("penalty_tuning") as counts:
+            metrics = [metric for _, (shard_metrics, _) in outputs for metric in shard_metrics]
+            results = [result for _, (_, shard_results) in outputs for result in shard_results]
+            store, penalty_tuning = sifter._store_from_penalty_paths(
+                data, columns, [metrics[i] for i in order], [results[i] for i in order]
+            )
+            counts.update(_store_counts(store))
+
+    # STEP2 + STEP3 on the merged change points
+    detected = ChangePointDetection(
+        data=data,
+        columns=columns,
+        store=store,
+        penalty_tuning=penalty_tuning,
+        execution_plan=sifter._execution_plan,
+        timings=recorder.timings,
+    )
+    return sifter._build_result(detected, sifter._segment_detection(detected), {**timings, **detected.timings})
+
+
+def _shard_columns(data: pd.DataFrame, shards: Mapping[str, Hashable] | Sequence[str]) -> list[np.ndarray]:
+    """Integer column positions of every shard of ``data``, in order of first appearance."""
+    if not isinstance(shards, Mapping):
+        shards = prometheus.shard_by_labels(data, [shards] if isinstance(shards, str) else shards)
+    groups: dict[Hashable, list[int]] = {}
+    for j, column in enumerate(data.columns):
+        groups.setdefault(shards.get(column), []).append(j)
+    return [np.asarray(positions, dtype=np.int64) for positions in groups.values()]
+
+
+def _detect_shard(
+    sifter: Sifter, shard: pd.DataFrame, without_simple_filter: bool
+) -> tuple[np.ndarray, detection.ChangePointStore | tuple[list[str], list[tuple]]]:
+    """STEP0 + STEP1 of one shard: its kept column positions and its detection output.
+
+    The output is the shard's store, or -- when ``penalty_adjust`` is tuned,
+    which needs every metric's penalty path -- the ``(metrics, results)`` of
+    its penalty-path tasks.
+    """
+    columns = sifter._input_columns(shard, without_simple_filter)
+    if sifter.penalty_adjust != AUTO:
+        store, _ = sifter._detect_changepoints(shard, columns, StageRecorder())
+        return columns, store
+    metrics, tasks = detection.penalty_path_tasks(
+        shard, sifter.search_method, sifter.cost_model, sifter.penalty, sifter.sigma_estimator, columns=columns
+    )
+    return columns, (metrics, [detection.univariate_penalty_path_with_matches(*task) for task in tasks])
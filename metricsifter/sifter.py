@@ -1,12 +1,41 @@
-from typing import Callable
+import asyncio
+import contextlib
+import copy
+import functools
+import math
+import os
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, TypeVar
 
 import numpy as np
 import pandas as pd
+from joblib import effective_n_jobs
 
-from metricsifter import utils
+from metricsifter import checkpoint, memory, parallel, planner
+from metricsifter.aio import AsyncSift
 from metricsifter.algo import detection, segmentation
 from metricsifter.algo.detection import SIGMA_ESTIMATORS
-from metricsifter.types import BandwidthTuning, PenaltyTuning, Segment, SegmentCandidate, SegmentInfo, SiftResult
+from metricsifter.cancellation import CancellationToken
+from metricsifter.execution import ExecutionOptions
+from metricsifter.parallel import ThreadPool, WorkerPool
+from metricsifter.profiling import StageRecorder, tracing_memory
+from metricsifter.remote import RemoteExecutor
+from metricsifter.types import (
+    BandwidthTuning,
+    BatchSegmentScorer,
+    ChangePointDetection,
+    ExecutionPlan,
+    PenaltyTuning,
+    Segment,
+    SegmentCandidate,
+    SegmentCandidateBatch,
+    SegmentInfo,
+    SiftResult,
+    StageHooks,
+    StageTiming,
+)
 
 #: KDE bandwidth rule-of-thumb names accepted by ``bandwidth`` (in addition to a float).
 BANDWIDTH_RULES: frozenset[str] = frozenset({"scott", "silverman"})
@@ -14,6 +43,56 @@ BANDWIDTH_RULES: frozenset[str] = frozenset({"scott", "silverman"})
 #: Sentinel that turns on stability-selection auto-tuning for a parameter.
 AUTO: str = "auto"
 
+#: Upper bound on the ``(rows x columns)`` block the STEP0 filter reduces at once.
+_FILTER_BLOCK_SIZE: int = 1 << 16
+
+#: Metrics per checkpointed chunk of change-point detection (see ``checkpoint_dir``).
+_CHECKPOINT_CHUNK_SIZE: int = 1024
+
+
+@dataclass(frozen=True)
+class _Segmentation:
+    """STEP2 + STEP3 output of one frame (see :meth:`Sifter._segment`)."""
+
+    scale_space: segmentation.ScaleSpace
+    bandwidth_tuning: BandwidthTuning | None
+    cluster_label_to_metrics: dict[int, set[str]]
+    label_to_change_points: dict[int, list[int]]
+    label_to_score: dict[int, float]
+    selected_label: int | None
+    remained_metrics: frozenset[str]
+    timings: dict[str, StageTiming]
+
+
+def _store_counts(store: detection.ChangePointStore) -> dict[str, int]:
+    """The counts a detection stage reports about its change-point store."""
+    return {
+        "metrics": store.n_metrics,
+        "change_points": store.n_change_points,
+        "metrics_with_change_points": int(np.count_nonzero(store.counts)),
+    }
+
+
+def _traced(method: Callable) -> Callable:
+    """Run a :class:`Sifter` entry point in its :meth:`Sifter._entry_point` context."""
+
+    @functools.wraps(method)
+    def wrapper(self: "Sifter", *args, **kwargs):
+        with self._entry_point():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _check_bandwidth(bandwidth: float | str) -> None:
+    if isinstance(bandwidth, str) and bandwidth not in BANDWIDTH_RULES | {AUTO}:
+        raise ValueError(
+            f"bandwidth={bandwidth!r} is not supported. " f"Pass a float or one of {sorted(BANDWIDTH_RULES | {AUTO})}."
+        )
+
+
+_SifterT = TypeVar("_SifterT", bound="Sifter")
+
 
 class Sifter:
     def __init__(
@@ -23,16 +102,25 @@ class Sifter:
         penalty: str | float = "bic",
         penalty_adjust: float | str = 2.0,
         bandwidth: float | str = 2.5,
-        segment_selection_method: str | Callable[[SegmentCandidate], float] = "weighted_max",
+        segment_selection_method: str | Callable[[SegmentCandidate], float] | BatchSegmentScorer = "weighted_max",
         n_jobs: int = 1,
         sigma_estimator: str = "std",
         random_state: int | None = None,
+        bootstrap_early_stopping: bool = False,
+        checkpoint_dir: str | os.PathLike | None = None,
+        stage_hooks: StageHooks | None = None,
+        memory_profile: bool = False,
+        execution: ExecutionOptions | None = None,
     ) -> None:
         """Configure the feature-reduction pipeline.
 
         Args:
             search_method: Change-point search algorithm (``"pelt"`` / ``"binseg"``
-                / ``"bottomup"``).
+                / ``"bottomup"``), or ``"auto"`` to run the plan (search method
+                and worker count up to ``n_jobs``) that :meth:`estimate_cost`
+                predicts fastest within the ``max_memory`` / ``time_budget``
+                of ``execution``; the chosen plan is reported in
+                ``SiftResult.execution_plan``.
             cost_model: Cost model for ``binseg`` / ``bottomup`` (e.g. ``"l2"``).
             penalty: ``"bic"``, ``"aic"``, or a numeric penalty passed to ruptures.
             penalty_adjust: Multiplier applied to the derived penalty (default
@@ -49,10 +137,15 @@ class Sifter:
                 the chosen value is reported in ``SiftResult.bandwidth_tuning``.
             segment_selection_method: How to pick the "densest" segment. Either a
                 built-in name (``"max"`` = most metrics, ``"weighted_max"`` =
-                sum of ``1 / len(change_points)`` per metric) or a custom
+                sum of ``1 / len(change_points)`` per metric), a custom
                 ``Callable[[SegmentCandidate], float]`` whose highest-scoring
-                segment is selected.
-            n_jobs: Parallelism for detection/filtering (joblib convention).
+                segment is selected, or a :class:`BatchSegmentScorer` that
+                scores all candidates at once from a
+                :class:`SegmentCandidateBatch`.
+            n_jobs: Parallelism for detection/filtering and for the
+                ``bandwidth="auto"`` / ``penalty_adjust="auto"`` tuners (joblib
+                convention): the most workers a stage may use (see
+                ``ExecutionOptions.parallelism``).
             sigma_estimator: Noise-scale estimator behind the AIC/BIC penalty
                 (``"std"`` / ``"mad"`` / ``"diff_std"``, default ``"std"``). Use
                 ``"mad"`` for spiky/outlier-prone metrics and ``"diff_std"`` for
@@ -60,10 +153,35 @@ class Sifter:
                 :func:`metricsifter.algo.detection._estimate_sigma`.
             random_state: Seed for the ``bandwidth="auto"`` bootstrap (``None``
                 = OS entropy). Fix it for reproducible auto-tuning.
+            bootstrap_early_stopping: Let the ``bandwidth="auto"`` bootstrap add
+                resamples in small rounds and drop candidates that are clearly
+                dominated (or stop those already perfectly stable) instead of
+                always drawing the full ``N_BOOTSTRAP``; the resamples used per
+                candidate are reported in ``BandwidthTuning.n_resamples``.
+            checkpoint_dir: A local directory to checkpoint the stage outputs of
+                :meth:`sift` / :meth:`detect` in (see :mod:`metricsifter.checkpoint`).
+                A rerun on the same data and parameters resumes from the last
+                completed stage, and an interrupted detection from its last
+                completed chunk of metrics. ``bandwidth="auto"`` tuning is only
+                checkpointed with a ``random_state`` and a named
+                ``segment_selection_method``.
+            stage_hooks: Callbacks notified as every pipeline stage starts and
+                ends (see :class:`metricsifter.types.StageHooks`), e.g. to feed
+                a tracer or a progress bar. Each stage's wall/CPU time and
+                counts are reported in ``SiftResult.timings`` either way; stages
+                run on workers (the per-frame segmentation of :meth:`sift_many`
+                and :meth:`sweep`) are only reported there.
+            memory_profile: Trace allocations with ``tracemalloc`` during every
+                sift, so each stage of ``SiftResult.timings`` reports its
+                ``peak_memory`` and the process's ``max_rss`` (tracing slows
+                the sift down; meant for diagnosing memory blow-ups).
+            execution: Where the parallel stages run and within which
+                limits (default: ``ExecutionOptions()``); see
+                :class:`metricsifter.execution.ExecutionOptions`.
 
         Raises:
-            ValueError: If ``sigma_estimator``, a string ``penalty_adjust`` or a
-                string ``bandwidth`` is not one of the supported values.
+            ValueError: If ``sigma_estimator``, a string ``penalty_adjust`` or
+                a string ``bandwidth`` is not one of the supported values.
         """
         if sigma_estimator not in SIGMA_ESTIMATORS:
             raise ValueError(
@@ -71,11 +189,7 @@ class Sifter:
             )
         if isinstance(penalty_adjust, str) and penalty_adjust != AUTO:
             raise ValueError(f"penalty_adjust={penalty_adjust!r} is not supported. Pass a float or {AUTO!r}.")
-        if isinstance(bandwidth, str) and bandwidth not in BANDWIDTH_RULES | {AUTO}:
-            raise ValueError(
-                f"bandwidth={bandwidth!r} is not supported. "
-                f"Pass a float or one of {sorted(BANDWIDTH_RULES | {AUTO})}."
-            )
+        _check_bandwidth(bandwidth)
         self.search_method = search_method
         self.cost_model = cost_model
         self.bandwidth = bandwidth
@@ -85,76 +199,458 @@ class Sifter:
         self.n_jobs = n_jobs
         self.sigma_estimator = sigma_estimator
         self.random_state = random_state
+        self.bootstrap_early_stopping = bootstrap_early_stopping
+        self.checkpoint_dir = checkpoint_dir
+        self.stage_hooks = stage_hooks
+        self.memory_profile = memory_profile
+        self.execution = execution if execution is not None else ExecutionOptions()
+        self._owned_pool: WorkerPool | ThreadPool | None = None
+        # The plan a search_method="auto" sifter resolved to (set on its planned copy).
+        self._execution_plan: ExecutionPlan | None = None
+        # Metrics per detection job list, set by a max_memory plan (None = all at once).
+        self._detection_chunk_size: int | None = None
+        # The token a cancellable sift runs under (set on its per-call copy).
+        self._cancel_token: CancellationToken | None = None
+
+    def __enter__(self: _SifterT) -> _SifterT:  # noqa: PYI019 -- typing.Self needs Python 3.11
+        """Start the executor for the duration of a ``with`` block (owning a pool when none was given)."""
+        if self.execution.executor is None and self._owned_pool is None:
+            search_methods = parallel.WARM_SEARCH_METHODS if self.search_method == AUTO else (self.search_method,)
+            if parallel.resolve_backend(self.execution.backend) == "threads":
+                self._owned_pool = ThreadPool(self.n_jobs, search_methods, self.cost_model)
+            else:
+                self._owned_pool = WorkerPool(
+                    self.n_jobs, search_methods, self.cost_model, self.execution.threads_per_worker
+                )
+        if isinstance(self._active_executor(), (WorkerPool, RemoteExecutor)):
+            self._active_executor().start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._owned_pool is not None:
+            self._owned_pool.shutdown()
+            self._owned_pool = None
+
+    def __getstate__(self) -> dict:
+        # Bound methods (the tuner's selector) ship the Sifter to workers; the
+        # executor is a handle on this process's pool and stays behind.
+        state = self.__dict__.copy()
+        state["execution"] = replace(self.execution, executor=None)
+        state["_owned_pool"] = None
+        state["stage_hooks"] = None
+        state["_cancel_token"] = None
+        return state
+
+    def __copy__(self) -> "Sifter":
+        # The per-call copies (plans, tokens) keep the executor and the hooks;
+        # __getstate__ only strips them for pickling.
+        clone = object.__new__(type(self))
+        clone.__dict__.update(self.__dict__)
+        return clone
+
+    @contextlib.contextmanager
+    def _entry_point(self) -> Iterator[None]:
+        """The context of every entry point.
+
+        Sets the sift's CPU budget, the joblib workers of the ``execution``
+        backend and the native threads of its worker processes (sized per
+        stage, see :func:`metricsifter.parallel.worker_threads`), and
+        ``tracemalloc`` with ``memory_profile``. An int ``threads_per_worker``
+        also lowers this process's native pools while thread workers run the
+        sift; those pools are process-wide, so ``"auto"`` leaves them alone.
+        """
+        with tracing_memory(self.memory_profile), parallel.sift_budget():
+            policy = self.execution.threads_per_worker
+            local_threads = policy if isinstance(policy, int) and self._filter_threads() > 1 else None
+            with (
+                parallel.backend_config(self.execution.backend),
+                parallel.worker_threads(policy),
+                parallel.native_thread_limit(local_threads),
+            ):
+                yield
+
+    def _active_executor(self) -> Executor | None:
+        return self.execution.executor if self.execution.executor is not None else self._owned_pool
+
+    @staticmethod
+    def _has_changes(values: np.ndarray, n_threads: int = 1) -> np.ndarray:
+        """STEP0 decision for every column of a 2D ``(time, metric)`` array.
+
+        A column is dropped when it is all-NaN, constant, changes by a constant
+        step, or only ever changes by zero/NaN. All-NaN and constant columns
+        have only zero/NaN differences, so two reductions over the differences
+        decide every rule; NaN never compares equal, so a NaN anywhere breaks
+        the constant-step rule exactly as in the former per-column pandas checks.
+        Columns are reduced in cache-sized blocks, on ``n_threads`` threads
+        (numpy releases the GIL in the reductions).
+        """
+        n_rows, n_cols = values.shape
+        keep = np.zeros(n_cols, dtype=bool)
+        if n_rows < 2:  # a single row is constant or all-NaN
+            return keep
+        step = max(1, _FILTER_BLOCK_SIZE // n_rows)
+
+        def reduce_block(start: int) -> None:
+            diff = np.diff(values[:, start : start + step], axis=0)
+            constant_step = (diff == diff[0]).all(axis=0)
+            only_zero_or_nan = ~(np.abs(diff) > 0).any(axis=0)
+            keep[start : start + step] = ~(constant_step | only_zero_or_nan)
+
+        starts = range(0, n_cols, step)
+        n_threads = min(n_threads, len(starts))
+        if n_threads > 1:
+            with ThreadPoolExecutor(max_workers=n_threads) as threads:
+                list(threads.map(reduce_block, starts))
+        else:
+            for start in starts:
+                reduce_block(start)
+        return keep
 
     @staticmethod
     def _filter_no_changes(X: pd.DataFrame, n_jobs: int = -1) -> pd.DataFrame:
-        vf: Callable = np.vectorize(lambda x: np.isnan(x) or x == 0)
+        """STEP0: drop the columns without any variation (see :meth:`_has_changes`).
 
-        def filter(x: pd.Series) -> bool:
-            # pd.Series.diff returns a series with the first element is NaN
-            if x.isna().all() or (x == x.iat[0]).all() or ((diff_x := np.diff(x)) == diff_x[0]).all():
-                return False
-            # remove an array including only the same value or nan
-            return not vf(diff_x).all()
+        ``n_jobs`` is accepted for backward compatibility; the filter is a few
+        vectorized reductions, far cheaper than dispatching columns to workers.
+        """
+        return X.iloc[:, Sifter._changing_columns(X)]
 
-        if n_jobs != 1:
-            return X.loc[:, utils.parallel_apply(X, filter, n_jobs)]
-        return X.loc[:, X.apply(filter)]
+    @staticmethod
+    def _changing_columns(X: pd.DataFrame, n_threads: int = 1) -> np.ndarray:
+        """Integer positions of the columns of ``X`` that pass the STEP0 filter.
+
+        For a frame backed by a single float64 block the values are read in
+        place, without copying.
+        """
+        return np.flatnonzero(Sifter._has_changes(X.to_numpy(dtype=np.float64, na_value=np.nan), n_threads))
+
+    def _input_columns(self, data: pd.DataFrame, without_simple_filter: bool) -> np.ndarray:
+        """Integer positions of the columns of ``data`` the pipeline works on (STEP0)."""
+        if without_simple_filter:
+            return np.arange(data.shape[1])
+        return self._changing_columns(data, self._filter_threads())
+
+    def _filter_threads(self) -> int:
+        """Threads for STEP0: the thread workers of the sift (1 when its workers are processes or remote)."""
+        executor = self._active_executor()
+        if executor is not None:
+            return executor.max_workers if isinstance(executor, ThreadPool) else 1
+        return effective_n_jobs(self.n_jobs) if parallel.resolve_backend(self.execution.backend) == "threads" else 1
+
+    def _start_executor(self) -> dict[str, StageTiming]:
+        """Make sure a :class:`WorkerPool` (or :class:`RemoteExecutor`) is started; return the timings of a sift so far.
+
+        Starting the pool (connecting to the worker servers) is timed as the
+        ``"pool_startup"`` stage; it takes ~0 s when the pool was already running.
+        """
+        recorder = StageRecorder(self.stage_hooks)
+        executor = self._active_executor()
+        if isinstance(executor, (WorkerPool, RemoteExecutor)):
+            with recorder.stage("pool_startup") as counts:
+                executor.start()
+                counts["workers"] = executor.max_workers
+        return recorder.timings
+
+    def _filter(self, data: pd.DataFrame, without_simple_filter: bool, recorder: StageRecorder) -> np.ndarray:
+        """STEP0, timed as the ``"filter"`` stage."""
+        with recorder.stage("filter") as counts:
+            columns = self._input_columns(data, without_simple_filter)
+            counts["metrics_in"] = data.shape[1]
+            counts["metrics_out"] = len(columns)
+        return columns
 
     def _detect_changepoints(
-        self, X: pd.DataFrame
-    ) -> tuple[list[int], dict[int, list[str]], dict[str, list[int]], PenaltyTuning | None]:
-        """STEP1: detect change points, tuning ``penalty_adjust`` when requested."""
+        self, X: pd.DataFrame, columns: np.ndarray | None = None, recorder: StageRecorder | None = None
+    ) -> tuple[detection.ChangePointStore, PenaltyTuning | None]:
+        """STEP1: detect change points in ``columns`` of ``X``, tuning ``penalty_adjust`` when requested.
+
+        Timed as the ``"detection"`` (and ``"penalty_tuning"``) stages of ``recorder``.
+        """
+        if recorder is None:
+            recorder = StageRecorder(self.stage_hooks)
+        chunks = self._detection_chunks(X, columns)
         if self.penalty_adjust == AUTO:
-            flatten, cp_to_metrics, metric_to_cps, resolved, diag = (
-                detection.detect_multi_changepoints_with_penalty_tuning(
+            with recorder.stage("detection") as counts:
+                n_jobs, executor = self._detection_workers(counts, X, columns)
+                metrics, results = [], []
+                for chunk in chunks:
+                    chunk_metrics, tasks = detection.penalty_path_tasks(
+                        X, self.search_method, self.cost_model, self.penalty, self.sigma_estimator, columns=chunk
+                    )
+                    metrics += chunk_metrics
+                    results += parallel.map_tasks(
+                        detection.univariate_penalty_path_with_matches, tasks, n_jobs=n_jobs, executor=executor
+                    )
+                counts["metrics"] = len(metrics)
+                counts["grid_points"] = len(detection.PENALTY_ADJUST_GRID)
+                counts["chunks"] = len(chunks)
+            with recorder.stage("penalty_tuning") as counts:
+                store, tuning = self._store_from_penalty_paths(X, columns, metrics, results)
+                counts.update(_store_counts(store))
+            return store, tuning
+
+        with recorder.stage("detection") as counts:
+            n_jobs, executor = self._detection_workers(counts, X, columns)
+            stores = [
+                detection.detect_change_point_store(
                     X,
                     search_method=self.search_method,
                     cost_model=self.cost_model,
                     penalty=self.penalty,
+                    penalty_adjust=float(self.penalty_adjust),
                     sigma_estimator=self.sigma_estimator,
-                    n_jobs=self.n_jobs,
+                    n_jobs=n_jobs,
+                    columns=chunk,
+                    executor=executor,
                 )
+                for chunk in chunks
+            ]
+            store = stores[0] if len(stores) == 1 else detection.ChangePointStore.concat(stores)
+            counts.update(_store_counts(store))
+            counts["chunks"] = len(chunks)
+        return store, None
+
+    def _detection_chunks(self, X: pd.DataFrame, columns: np.ndarray | None) -> list[np.ndarray | None]:
+        """``columns`` split into the job lists of a ``max_memory`` plan (one list without a plan)."""
+        if self._detection_chunk_size is None:
+            return [columns]
+        if columns is None:
+            columns = np.arange(X.shape[1])
+        size = self._detection_chunk_size
+        return [columns[start : start + size] for start in range(0, len(columns), size)] or [columns]
+
+    def _plan(self, data: pd.DataFrame, without_simple_filter: bool = False) -> tuple["Sifter", dict[str, StageTiming]]:
+        """This sifter, or a copy running the plans chosen for ``data`` before any work starts.
+
+        Resolves ``search_method="auto"`` (timed as ``"search_plan"``) and then
+        fits ``max_memory`` (timed as ``"memory_plan"``).
+
+        Raises:
+            MemoryBudgetError: If no plan fits ``max_memory``.
+        """
+        recorder = StageRecorder(self.stage_hooks)
+        planned = self
+        if self.search_method == AUTO:
+            columns = self._input_columns(data, without_simple_filter)
+            planned = self._with_search_plan(planner.trimmed_lengths(data, columns), data.shape[0], recorder)
+        if planned.execution.max_memory is not None:
+            planned = planned._with_memory_plan(data, recorder)
+        return planned, recorder.timings
+
+    def _worker_counts(self) -> tuple[list[int], bool]:
+        """The worker counts plans may use, and whether they are a running executor's (fixed) workers."""
+        executor = self._active_executor()
+        if executor is not None:
+            return [parallel.executor_workers(executor, self.n_jobs)], True
+        n_jobs = effective_n_jobs(self.n_jobs)
+        return sorted({1 << k for k in range(n_jobs.bit_length()) if 1 << k < n_jobs} | {n_jobs}), False
+
+    def _estimate_plans(self, lengths: np.ndarray, n_rows: int) -> list[ExecutionPlan]:
+        worker_counts, fixed = self._worker_counts()
+        return planner.estimate_plans(
+            lengths,
+            n_rows,
+            model=self.execution.load_runtime_model(),
+            search_methods=planner.SEARCH_METHODS if self.search_method == AUTO else (self.search_method,),
+            worker_counts=worker_counts,
+            warm_workers=fixed or parallel.resolve_backend(self.execution.backend) == "threads",
+            penalty_tuning=self.penalty_adjust == AUTO,
+            bandwidth_tuning=self.bandwidth == AUTO,
+        )
+
+    def _stage_workers(
+        self, counts: dict[str, int], n_tasks: int, serial: Callable[[planner.RuntimeModel], float]
+    ) -> tuple[int, Executor | None]:
+        """The ``(n_jobs, executor)`` a parallel stage of ``n_tasks`` tasks runs on, counted as its ``workers``.
+
+        ``serial`` predicts the stage's serial seconds from the runtime model;
+        it is only called with ``parallelism="auto"``. A stage the model cannot
+        predict (e.g. an uncalibrated search method) keeps the configured workers.
+        """
+        worker_counts, fixed = self._worker_counts()
+        n_jobs, executor = self.n_jobs, self._active_executor()
+        if self.execution.parallelism == "auto" and max(worker_counts) > 1:
+            warm = fixed or parallel.resolve_backend(self.execution.backend) == "threads"
+            model = self.execution.load_runtime_model()
+            try:
+                seconds = serial(model)
+            except ValueError:
+                pass
+            else:
+                n_jobs = planner.choose_workers(
+                    seconds,
+                    n_tasks,
+                    worker_counts,
+                    model,
+                    warm_workers=warm,
+                    available_memory=None if warm else memory.available_memory(),
+                    # Worker servers bring their own CPUs.
+                    cpus=max(worker_counts) if isinstance(executor, RemoteExecutor) else parallel.cpu_budget(),
+                )
+                if n_jobs == 1:
+                    executor = None
+        counts["workers"] = (
+            effective_n_jobs(n_jobs) if executor is None else parallel.executor_workers(executor, n_jobs)
+        )
+        return n_jobs, executor
+
+    def _detection_workers(
+        self, counts: dict[str, int], X: pd.DataFrame, columns: np.ndarray | None
+    ) -> tuple[int, Executor | None]:
+        """:meth:`_stage_workers` of detecting ``columns`` of ``X`` (one task per column)."""
+        if columns is None:
+            columns = np.arange(X.shape[1])
+        return self._stage_workers(
+            counts,
+            len(columns),
+            lambda model: model.column_seconds(
+                self.search_method, planner.trimmed_lengths(X, columns), self.penalty_adjust == AUTO
+            ),
+        )
+
+    def _with_search_plan(self, lengths: np.ndarray, n_rows: int, recorder: StageRecorder) -> "Sifter":
+        """A copy of this ``search_method="auto"`` sifter running the chosen plan."""
+        with recorder.stage("search_plan") as counts:
+            plans = self._estimate_plans(lengths, n_rows)
+            plan = planner.choose_plan(
+                plans, max_memory=self.execution.max_memory, time_budget=self.execution.time_budget
             )
-            tuning = PenaltyTuning(
-                requested=self.penalty_adjust,
-                resolved=resolved,
-                grid=diag["grid"],
-                n_change_points=diag["n_change_points"],
-                adjacent_jaccard=diag["adjacent_jaccard"],
-                plateau=diag["plateau"],
-                reason=diag["reason"],
+            counts["candidates"] = len(plans)
+            counts["n_jobs"] = plan.n_jobs
+        planned = copy.copy(self)
+        planned.search_method = plan.search_method
+        planned._execution_plan = plan
+        if self._active_executor() is None:
+            planned.n_jobs = plan.n_jobs
+        return planned
+
+    def _with_memory_plan(self, data: pd.DataFrame, recorder: StageRecorder) -> "Sifter":
+        """A copy of this sifter running the plan that fits ``max_memory``."""
+        executor = self._active_executor()
+        with recorder.stage("memory_plan") as counts:
+            plan = memory.plan_memory(
+                self.execution.max_memory,
+                n_metrics=data.shape[1],
+                time_series_length=data.shape[0],
+                n_jobs=(
+                    effective_n_jobs(self.n_jobs)
+                    if executor is None
+                    else parallel.executor_workers(executor, self.n_jobs)
+                ),
+                fixed_workers=executor is not None,
+                penalty_tuning=self.penalty_adjust == AUTO,
+                bandwidth_tuning=self.bandwidth == AUTO,
             )
-            return flatten, cp_to_metrics, metric_to_cps, tuning
-
-        flatten, cp_to_metrics, metric_to_cps = detection.detect_multi_changepoints(
-            X,
-            search_method=self.search_method,
-            cost_model=self.cost_model,
-            penalty=self.penalty,
-            penalty_adjust=float(self.penalty_adjust),
-            sigma_estimator=self.sigma_estimator,
-            n_jobs=self.n_jobs,
+            counts.update(budget=plan.budget, estimate=plan.estimate, n_jobs=plan.n_jobs)
+            counts["chunk_size"] = plan.chunk_size or 0
+        planned = copy.copy(self)
+        planned.execution = replace(self.execution, max_memory=None)
+        planned._detection_chunk_size = plan.chunk_size
+        if executor is None:
+            planned.n_jobs = plan.n_jobs
+        return planned
+
+    def estimate_cost(self, data: pd.DataFrame, without_simple_filter: bool = False) -> list[ExecutionPlan]:
+        """Predict the change-point detection runtime and peak memory of every execution plan.
+
+        One plan per search method (all of them for ``search_method="auto"``,
+        else the configured one) and worker count (powers of two up to
+        ``n_jobs``, or the executor's workers), predicted by the calibrated
+        ``execution.runtime_model`` from the series length, the metrics passing STEP0
+        and their leading/trailing missing values (see
+        :mod:`metricsifter.planner`). Nothing is detected.
+
+        Args:
+            data: Input time series data
+            without_simple_filter: If True, skip STEP0 simple filter
+
+        Returns:
+            list[ExecutionPlan]: The plans, fastest first
+        """
+        columns = self._input_columns(data, without_simple_filter)
+        return self._estimate_plans(planner.trimmed_lengths(data, columns), data.shape[0])
+
+    def _store_from_penalty_paths(
+        self, X: pd.DataFrame, columns: np.ndarray | None, metrics: list[str], results: list[tuple]
+    ) -> tuple[detection.ChangePointStore, PenaltyTuning]:
+        """Select the plateau ``penalty_adjust`` of computed penalty paths and assemble the store."""
+        store, resolved, diag = detection.store_from_penalty_paths(metrics, results, series_length=X.shape[0])
+        if store is None:
+            # A custom grid may not contain the fallback multiplier; detect once at it.
+            n_jobs, executor = self._detection_workers({}, X, columns)
+            store = detection.detect_change_point_store(
+                X,
+                self.search_method,
+                self.cost_model,
+                self.penalty,
+                resolved,
+                n_jobs=n_jobs,
+                sigma_estimator=self.sigma_estimator,
+                columns=columns,
+                executor=executor,
+            )
+        return store, self._penalty_tuning(resolved, diag)
+
+    def _penalty_tuning(self, resolved: float, diag: dict) -> PenaltyTuning:
+        return PenaltyTuning(
+            requested=self.penalty_adjust,
+            resolved=resolved,
+            grid=diag["grid"],
+            n_change_points=diag["n_change_points"],
+            adjacent_jaccard=diag["adjacent_jaccard"],
+            plateau=diag["plateau"],
+            reason=diag["reason"],
         )
-        return flatten, cp_to_metrics, metric_to_cps, None
 
     def _resolve_bandwidth(
         self,
-        flatten_change_points: list[int],
-        cp_to_metrics: dict[int, list[str]],
-        metric_to_cps: dict[str, list[int]],
+        store: detection.ChangePointStore,
         time_series_length: int,
+        scale_space: segmentation.ScaleSpace | None = None,
+        counts: dict[str, int] | None = None,
     ) -> tuple[float | str, BandwidthTuning | None]:
-        """Resolve the KDE bandwidth, tuning it when ``"auto"`` was requested."""
+        """Resolve the KDE bandwidth, tuning it when ``"auto"`` was requested.
+
+        The tuner's workers are counted in ``counts`` (the ``"bandwidth_tuning"`` stage).
+        """
         if self.bandwidth != AUTO:
             return self.bandwidth, None
-        resolved, diag = segmentation.select_bandwidth(
-            flatten_change_points,
-            cp_to_metrics,
-            metric_to_cps,
+        checkpointer, params = None, ()
+        if (
+            self.checkpoint_dir is not None
+            and self.random_state is not None
+            and isinstance(self.segment_selection_method, str)
+        ):
+            # Keyed by the change points themselves, so any sift that reaches
+            # the same store (sift, resegment, sift_many workers) shares it.
+            checkpointer = checkpoint.Checkpointer(self.checkpoint_dir)
+            params = (
+                store.metrics,
+                store.offsets,
+                store.positions,
+                time_series_length,
+                self.random_state,
+                self.bootstrap_early_stopping,
+                self.segment_selection_method,
+            )
+            saved = checkpointer.load("bandwidth", *params)
+            if saved is not None:
+                tuning = BandwidthTuning.from_dict(checkpoint.unpack_report(saved["bandwidth_tuning"]))
+                return tuning.resolved, tuning
+        # One task per candidate bandwidth and resample.
+        n_tasks = len(segmentation._bandwidth_grid(time_series_length)) * segmentation.N_BOOTSTRAP
+        n_jobs, executor = self._stage_workers(
+            {} if counts is None else counts, n_tasks, lambda model: model.bootstrap_seconds * store.n_change_points
+        )
+        resolved, diag = segmentation.select_bandwidth_for_store(
+            store,
             time_series_length=time_series_length,
             selector=self.select_largest_segment_with_label,
             random_state=self.random_state,
+            early_stopping=self.bootstrap_early_stopping,
+            n_jobs=n_jobs,
+            scale_space=scale_space,
+            executor=executor,
         )
         tuning = BandwidthTuning(
             requested=self.bandwidth,
@@ -162,22 +658,21 @@ class Sifter:
             grid=diag["grid"],
             stability=diag["stability"],
             n_segments=diag["n_segments"],
+            n_resamples=diag["n_resamples"],
             reason=diag["reason"],
         )
+        if checkpointer is not None:
+            checkpointer.save({"bandwidth_tuning": checkpoint.pack_report(tuning)}, "bandwidth", *params)
         return resolved, tuning
 
     def run_upto_cpd(self, data: pd.DataFrame, without_simple_filter: bool = False) -> pd.DataFrame:
         """Run up to change point detection"""
-        if without_simple_filter:
-            X = data
-        else:
-            # STEP0: simple filter
-            X = self._filter_no_changes(data, n_jobs=self.n_jobs)
+        # STEP0: simple filter
+        columns = self._input_columns(data, without_simple_filter)
 
         # STEP1: detect change points
-        _, _, metric_to_cps, _ = self._detect_changepoints(X)
-        remained_metrics = set(metric for metric, cps in metric_to_cps.items() if len(cps) > 0)
-        return X.loc[:, list(remained_metrics)]
+        store, _ = self._detect_changepoints(data, columns)
+        return data.iloc[:, columns[store.counts > 0]]
 
     def run(self, data: pd.DataFrame, without_simple_filter: bool = False) -> pd.DataFrame:
         """Run the feature reduction pipeline and return filtered metrics
@@ -219,7 +714,13 @@ class Sifter:
             selected_segment = Segment(label=s.label, start_time=s.start_index, end_time=s.end_index)
         return (result.data if result.data is not None else pd.DataFrame()), selected_segment
 
-    def sift(self, data: pd.DataFrame, without_simple_filter: bool = False) -> SiftResult:
+    @_traced
+    def sift(
+        self,
+        data: pd.DataFrame,
+        without_simple_filter: bool = False,
+        cancel_token: CancellationToken | None = None,
+    ) -> SiftResult:
         """Run the pipeline and return a diagnostic, explainable :class:`SiftResult`.
 
         The result contains the filtered DataFrame, per-metric change points, the
@@ -230,38 +731,603 @@ class Sifter:
         Args:
             data: Input time series data
             without_simple_filter: If True, skip STEP0 simple filter
+            cancel_token: Cancelling it (e.g. from another thread) stops
+                detection early, like passing the ``execution`` deadline; the
+                result is then partial (see :attr:`SiftResult.partial`)
 
         Returns:
             SiftResult: Diagnostic result of the feature reduction pipeline
+
+        Raises:
+            MemoryBudgetError: If no execution plan fits ``max_memory``.
         """
-        input_metrics = list(data.columns)
+        token = self._cancellation(cancel_token)
+        sifter, timings = self._plan(data, without_simple_filter)
+        timings.update(sifter._start_executor())
 
-        if without_simple_filter:
-            X = data
-        else:
-            # STEP0: simple filter
-            X = self._filter_no_changes(data, n_jobs=self.n_jobs)
+        # STEP0 + STEP1: filter and detect change points
+        sifter = sifter._with_cancel_token(token)
+        detected = sifter._detect(data, without_simple_filter, StageRecorder(self.stage_hooks))
 
-        filtered_no_change = frozenset(input_metrics) - frozenset(X.columns)
-        index = X.index
-        has_datetime = isinstance(index, pd.DatetimeIndex)
+        # STEP2 + STEP3: segment the change points and select a segment
+        return sifter._build_result(detected, sifter._segment_detection(detected), {**timings, **detected.timings})
+
+    def asift(
+        self,
+        data: pd.DataFrame,
+        without_simple_filter: bool = False,
+        semaphore: asyncio.Semaphore | None = None,
+    ) -> AsyncSift:
+        """Start :meth:`sift` in the background of the running event loop.
+
+        The returned :class:`~metricsifter.aio.AsyncSift` is awaited for the
+        result and iterated for ``(stage, timing)`` progress events; cancelling
+        it cancels the detection tasks queued on the workers and stops the sift
+        at its next stage boundary. See :mod:`metricsifter.aio`.
+
+        Args:
+            data: Input time series data
+            without_simple_filter: If True, skip STEP0 simple filter
+            semaphore: Shared by the sifts that may run at once; this one waits
+                for a slot before starting
+
+        Returns:
+            AsyncSift: The running sift
+
+        Raises:
+            RuntimeError: If no event loop is running.
+        """
+        return AsyncSift(self, data, without_simple_filter, semaphore)
+
+    def sift_iter(
+        self,
+        data: pd.DataFrame,
+        without_simple_filter: bool = False,
+        priority: Sequence[str] = (),
+        interval: float = 1.0,
+        cancel_token: CancellationToken | None = None,
+    ) -> Iterator[SiftResult]:
+        """Yield progressively refined snapshots of :meth:`sift` while change points are detected.
+
+        Metrics are detected in priority order -- the ``priority`` metrics
+        (e.g. SLIs) first, then by decreasing change magnitude -- and every
+        ``interval`` seconds the change points collected so far are segmented
+        into a snapshot: a partial :class:`SiftResult` whose ``coverage`` is
+        the fraction of metrics detected and whose ``unprocessed_metrics`` are
+        the rest. The last snapshot covers every metric and equals
+        :meth:`sift`.
+
+        Snapshots extend the KDE of the previous one with the new change points
+        only (see :meth:`~metricsifter.algo.segmentation.ScaleSpace.extended`).
+        With ``bandwidth="auto"`` the intermediate snapshots segment at the
+        fallback bandwidth and only the last one is tuned. Closing the
+        generator early cancels the outstanding detection tasks.
+
+        Args:
+            data: Input time series data
+            without_simple_filter: If True, skip STEP0 simple filter
+            priority: Metrics to detect first, in this order
+            interval: Seconds of detection between snapshots (``0`` = a
+                snapshot per detected metric)
+            cancel_token: See :meth:`sift`; the last snapshot is then partial
+
+        Yields:
+            SiftResult: Snapshots of increasing ``coverage``
+
+        Raises:
+            MemoryBudgetError: If no execution plan fits ``max_memory``.
+        """
+        from metricsifter.progressive import sift_iter
+
+        if interval < 0:
+            raise ValueError(f"interval must be non-negative, got {interval!r}.")
+        return sift_iter(self, data, without_simple_filter, priority, interval, cancel_token)
+
+    @_traced
+    def sweep(
+        self,
+        data: pd.DataFrame,
+        param_grid: Mapping[str, Sequence] | Iterable[Mapping[str, Sequence]],
+        without_simple_filter: bool = False,
+    ) -> list[tuple[dict, SiftResult]]:
+        """Sift ``data`` under every configuration of a parameter grid.
+
+        Equivalent to sifting once per configuration, but every stage output
+        that configurations share is computed once: one searcher fit per
+        ``(search_method, cost_model)`` serves every ``penalty`` /
+        ``sigma_estimator`` / ``penalty_adjust``, and one detection serves every
+        ``bandwidth`` / ``segment_selection_method``. See :mod:`metricsifter.sweep`.
+
+        Args:
+            data: Input time series data
+            param_grid: Parameter name -> candidate values (or a list of such
+                grids), as in scikit-learn's ``ParameterGrid``. Parameters not
+                in the grid keep this sifter's values.
+            without_simple_filter: If True, skip STEP0 simple filter
+
+        Returns:
+            list[tuple[dict, SiftResult]]: ``(configuration, result)`` pairs, in
+            grid order
+
+        Raises:
+            ValueError: If the grid names a parameter that cannot be swept, or
+                an unsupported value.
+        """
+        from metricsifter.sweep import sweep
+
+        return sweep(self, data, param_grid, without_simple_filter)
+
+    @_traced
+    def detect(
+        self,
+        data: pd.DataFrame,
+        without_simple_filter: bool = False,
+        cancel_token: CancellationToken | None = None,
+    ) -> ChangePointDetection:
+        """Run STEP0 and STEP1 only, for one or more :meth:`resegment` calls.
+
+        Args:
+            data: Input time series data
+            without_simple_filter: If True, skip STEP0 simple filter
+            cancel_token: See :meth:`sift`
+
+        Returns:
+            ChangePointDetection: The filtered columns and their change points
+
+        Raises:
+            MemoryBudgetError: If no execution plan fits ``max_memory``.
+        """
+        token = self._cancellation(cancel_token)
+        sifter, timings = self._plan(data, without_simple_filter)
+        sifter = sifter._with_cancel_token(token)
+        return sifter._detect(data, without_simple_filter, StageRecorder(self.stage_hooks, timings))
+
+    def _cancellation(self, cancel_token: CancellationToken | None) -> CancellationToken | None:
+        """The token a call runs under: ``cancel_token``, bounded by the ``execution`` deadline from now."""
+        if self.execution.deadline is None:
+            return cancel_token
+        return CancellationToken(timeout=self.execution.deadline, parent=cancel_token)
+
+    def _with_cancel_token(self, token: CancellationToken | None) -> "Sifter":
+        if token is self._cancel_token:
+            return self
+        sifter = copy.copy(self)
+        sifter._cancel_token = token
+        return sifter
+
+    def _detect(self, data: pd.DataFrame, without_simple_filter: bool, recorder: StageRecorder) -> ChangePointDetection:
+        if self.checkpoint_dir is not None:
+            checkpointer = checkpoint.Checkpointer(self.checkpoint_dir)
+            return self._detect_resumable(data, without_simple_filter, checkpointer, recorder)
+
+        # STEP0: simple filter. The pipeline carries integer column positions
+        # into ``data``; no sub-frame is built until ``SiftResult.data`` is read.
+        columns = self._filter(data, without_simple_filter, recorder)
 
         # STEP1: detect change points
-        flatten_change_points, cp_to_metrics, metric_to_cps, penalty_tuning = self._detect_changepoints(X)
+        if self._cancel_token is not None:
+            return self._detect_until_cancelled(data, columns, recorder)
+        store, penalty_tuning = self._detect_changepoints(data, columns, recorder)
+        return ChangePointDetection(
+            data=data,
+            columns=columns,
+            store=store,
+            penalty_tuning=penalty_tuning,
+            execution_plan=self._execution_plan,
+            timings=recorder.timings,
+        )
 
-        metric_to_change_points = {metric: [int(cp) for cp in cps] for metric, cps in metric_to_cps.items()}
-        filtered_no_change_points = frozenset(
-            metric for metric, cps in metric_to_change_points.items() if len(cps) == 0
+    def _detect_until_cancelled(
+        self, data: pd.DataFrame, columns: np.ndarray, recorder: StageRecorder
+    ) -> ChangePointDetection:
+        """STEP1 under ``self._cancel_token``: the columns by decreasing change magnitude, until cancelled.
+
+        The detection covers the columns detected in time; the others are its
+        ``unprocessed_metrics``.
+        """
+        with recorder.stage("detection") as counts:
+            order = self._priority_order(data, columns)
+            fn, tasks = self._column_tasks(data, order)
+            n_jobs, executor = self._detection_workers(counts, data, order)
+            results = dict(parallel.imap_cancellable(fn, tasks, self._cancel_token, n_jobs=n_jobs, executor=executor))
+            counts["metrics"] = len(results)
+            counts["unprocessed"] = len(order) - len(results)
+        return self._partial_detection(data, order, results, recorder)
+
+    @staticmethod
+    def _priority_order(data: pd.DataFrame, columns: np.ndarray, priority: Sequence[str] = ()) -> np.ndarray:
+        """``columns`` in detection order.
+
+        The ``priority`` metrics come first (in that order), then the others by
+        decreasing change magnitude.
+        """
+        order = columns[np.argsort(-detection.change_magnitude_scores(data, columns), kind="stable")]
+        if len(priority) > 0:
+            rank = {metric: k for k, metric in enumerate(priority)}
+            order = order[np.argsort([rank.get(metric, len(rank)) for metric in data.columns[order]], kind="stable")]
+        return order
+
+    def _column_tasks(self, data: pd.DataFrame, columns: np.ndarray) -> tuple[Callable, list[tuple]]:
+        """The per-column STEP1 function (penalty paths for ``penalty_adjust="auto"``) and its tasks."""
+        if self.penalty_adjust == AUTO:
+            _, tasks = detection.penalty_path_tasks(
+                data, self.search_method, self.cost_model, self.penalty, self.sigma_estimator, columns=columns
+            )
+            return detection.univariate_penalty_path_with_matches, tasks
+        _, tasks = detection.change_point_tasks(
+            data,
+            self.search_method,
+            self.cost_model,
+            self.penalty,
+            float(self.penalty_adjust),
+            sigma_estimator=self.sigma_estimator,
+            columns=columns,
         )
+        return detection.detect_univariate_changepoints, tasks
+
+    def _partial_detection(
+        self, data: pd.DataFrame, order: np.ndarray, results: dict[int, Any], recorder: StageRecorder
+    ) -> ChangePointDetection:
+        """The detection of the ``order`` positions with :meth:`_column_tasks` ``results``; the rest are unprocessed.
+
+        Penalty tuning on the detected columns is timed as ``"penalty_tuning"``.
+        """
+        done = np.zeros(len(order), dtype=bool)
+        done[list(results)] = True
+        # Back to column order, which the rest of the pipeline expects.
+        kept = np.flatnonzero(done)
+        kept = kept[np.argsort(order[kept], kind="stable")]
+        columns = order[kept]
+        metrics = data.columns[columns].tolist()
+        outputs = [results[i] for i in kept]
+        penalty_tuning = None
+        if self.penalty_adjust == AUTO:
+            with recorder.stage("penalty_tuning") as counts:
+                store, penalty_tuning = self._store_from_penalty_paths(data, columns, metrics, outputs)
+                counts.update(_store_counts(store))
+        else:
+            store = detection.ChangePointStore.from_lists(metrics, outputs)
+        return ChangePointDetection(
+            data=data,
+            columns=columns,
+            store=store,
+            penalty_tuning=penalty_tuning,
+            execution_plan=self._execution_plan,
+            unprocessed_metrics=tuple(data.columns[order[~done]]),
+            timings=recorder.timings,
+        )
+
+    def _detect_resumable(
+        self,
+        data: pd.DataFrame,
+        without_simple_filter: bool,
+        checkpointer: checkpoint.Checkpointer,
+        recorder: StageRecorder,
+    ) -> ChangePointDetection:
+        """:meth:`detect`, loading completed stages from ``checkpointer`` and saving the others.
+
+        Stages and chunks loaded from disk are counted as ``"checkpointed"``.
+        """
+        fingerprint = checkpoint.fingerprint_frame(data)
+
+        # STEP0
+        with recorder.stage("filter") as counts:
+            saved = checkpointer.load("step0", fingerprint, without_simple_filter)
+            if saved is None:
+                columns = self._input_columns(data, without_simple_filter)
+                checkpointer.save({"columns": columns}, "step0", fingerprint, without_simple_filter)
+            else:
+                columns = saved["columns"]
+            counts["metrics_in"] = data.shape[1]
+            counts["metrics_out"] = len(columns)
+            counts["checkpointed"] = int(saved is not None)
+        metrics = data.columns[columns].tolist()
+
+        # STEP1, resumed per chunk of metrics
+        params = (self.search_method, self.cost_model, self.penalty, self.penalty_adjust, self.sigma_estimator)
+        tuned = self.penalty_adjust == AUTO
+        with recorder.stage("detection") as counts:
+            saved = checkpointer.load("step1", fingerprint, columns, *params)
+            if saved is not None:
+                store = checkpoint.unpack_store(metrics, saved)
+                penalty_tuning = None
+                if "penalty_tuning" in saved:
+                    penalty_tuning = PenaltyTuning.from_dict(checkpoint.unpack_report(saved["penalty_tuning"]))
+                counts.update(_store_counts(store))
+                counts["checkpointed"] = 1
+                return ChangePointDetection(
+                    data=data,
+                    columns=columns,
+                    store=store,
+                    penalty_tuning=penalty_tuning,
+                    execution_plan=self._execution_plan,
+                    timings=recorder.timings,
+                )
+
+            # A cancelled sift stops between chunks (in column order), so only
+            # whole chunks are checkpointed and a rerun resumes after them.
+            token = self._cancel_token
+            n_jobs, executor = self._detection_workers(counts, data, columns)
+            # The chunks run on the workers chosen for the whole detection.
+            chunk_sifter = self._with_cancel_token(None)._with_workers(n_jobs, executor)
+            chunks, unprocessed = [], ()
+            for start in range(0, len(columns), _CHECKPOINT_CHUNK_SIZE):
+                if token is not None and token.cancelled:
+                    unprocessed = tuple(metrics[start:])
+                    columns, metrics = columns[:start], metrics[:start]
+                    break
+                chunk = columns[start : start + _CHECKPOINT_CHUNK_SIZE]
+                saved = checkpointer.load("step1-chunk", fingerprint, chunk, *params)
+                if saved is not None:
+                    chunks.append(saved)
+                    counts["checkpointed"] = counts.get("checkpointed", 0) + 1
+                    continue
+                if tuned:
+                    _, tasks = detection.penalty_path_tasks(
+                        data, self.search_method, self.cost_model, self.penalty, self.sigma_estimator, columns=chunk
+                    )
+                    results = parallel.map_tasks(
+                        detection.univariate_penalty_path_with_matches,
+                        tasks,
+                        n_jobs=n_jobs,
+                        executor=executor,
+                    )
+                    arrays = checkpoint.pack_penalty_paths(results, len(detection.PENALTY_ADJUST_GRID))
+                else:
+                    arrays = checkpoint.pack_store(chunk_sifter._detect_changepoints(data, chunk, StageRecorder())[0])
+                checkpointer.save(arrays, "step1-chunk", fingerprint, chunk, *params)
+                chunks.append(arrays)
+            counts["metrics"] = len(columns)
+            counts["chunks"] = len(chunks)
+            if token is not None:
+                counts["unprocessed"] = len(unprocessed)
+
+        arrays = {}
+        penalty_tuning = None
+        if tuned:
+            with recorder.stage("penalty_tuning") as counts:
+                results = [result for chunk in chunks for result in checkpoint.unpack_penalty_paths(chunk)]
+                store, penalty_tuning = self._store_from_penalty_paths(data, columns, metrics, results)
+                counts.update(_store_counts(store))
+            arrays["penalty_tuning"] = checkpoint.pack_report(penalty_tuning)
+        else:
+            store = detection.ChangePointStore.concat(
+                [
+                    checkpoint.unpack_store(metrics[start : start + _CHECKPOINT_CHUNK_SIZE], chunk)
+                    for start, chunk in zip(range(0, len(metrics), _CHECKPOINT_CHUNK_SIZE), chunks)
+                ]
+            )
+        if not unprocessed:
+            checkpointer.save({**checkpoint.pack_store(store), **arrays}, "step1", fingerprint, columns, *params)
+        return ChangePointDetection(
+            data=data,
+            columns=columns,
+            store=store,
+            penalty_tuning=penalty_tuning,
+            execution_plan=self._execution_plan,
+            unprocessed_metrics=unprocessed,
+            timings=recorder.timings,
+        )
+
+    @_traced
+    def resegment(
+        self,
+        detected: ChangePointDetection | SiftResult,
+        bandwidth: float | str | None = None,
+        segment_selection_method: str | Callable[[SegmentCandidate], float] | BatchSegmentScorer | None = None,
+    ) -> SiftResult:
+        """Rerun STEP2 and STEP3 on already detected change points.
+
+        Meant for interactive tuning: change detection is by far the most
+        expensive stage, while segmenting and selecting from the stored change
+        points takes milliseconds (densities are memoized per bandwidth, so
+        revisiting a bandwidth is cheaper still).
+
+        Args:
+            detected: The output of :meth:`detect`, or a :class:`SiftResult`
+                of :meth:`sift` (its ``detection``)
+            bandwidth: KDE bandwidth to segment with (default: this sifter's)
+            segment_selection_method: Segment selection strategy (default: this
+                sifter's)
+
+        Returns:
+            SiftResult: Diagnostic result of the feature reduction pipeline
+
+        Raises:
+            ValueError: If ``detected`` is a result without detection state
+                (e.g. restored with :meth:`SiftResult.from_dict`), or
+                ``bandwidth`` is not supported.
+        """
+        if isinstance(detected, SiftResult):
+            if detected.detection is None:
+                raise ValueError("This SiftResult carries no detection state (e.g. it was restored from a dict).")
+            detected = detected.detection
+        sifter = self
+        if bandwidth is not None or segment_selection_method is not None:
+            sifter = copy.copy(self)
+            if bandwidth is not None:
+                _check_bandwidth(bandwidth)
+                sifter.bandwidth = bandwidth
+            if segment_selection_method is not None:
+                sifter.segment_selection_method = segment_selection_method
+        timings = sifter._start_executor()
+        return sifter._build_result(detected, sifter._segment_detection(detected), timings)
+
+    def sift_many(
+        self,
+        frames: Iterable[pd.DataFrame],
+        without_simple_filter: bool = False,
+        as_completed: bool = False,
+    ) -> list[SiftResult] | Iterator[tuple[int, SiftResult]]:
+        """Sift several frames at once, sharing one set of workers.
+
+        Equivalent to ``[self.sift(frame) for frame in frames]``, but scheduled
+        across frames: the change-point detection of every column of every
+        frame is one job list (so many small frames keep all workers busy),
+        and then the frames are segmented in parallel, one frame per task.
+
+        Args:
+            frames: Input time series frames
+            without_simple_filter: If True, skip STEP0 simple filter
+            as_completed: If True, return a generator of ``(position, result)``
+                pairs that yields each frame's result as soon as it is
+                segmented, instead of the list of results in input order.
+
+        Returns:
+            list[SiftResult] | Iterator[tuple[int, SiftResult]]: One result per
+            frame, in input order (or as completed, see ``as_completed``)
+        """
+        from metricsifter.batch import sift_many
+
+        results = sift_many(self, list(frames), without_simple_filter)
+        return results if as_completed else [result for _, result in sorted(results, key=lambda pair: pair[0])]
+
+    @_traced
+    def sift_sharded(
+        self,
+        data: pd.DataFrame,
+        shards: Mapping[str, Hashable] | Sequence[str],
+        without_simple_filter: bool = False,
+    ) -> SiftResult:
+        """Sift ``data`` with STEP0 and STEP1 run independently per column shard.
+
+        Every shard (e.g. the metrics of one service, container or node) is
+        filtered and detected as one task on the executor (or one joblib
+        worker), so a worker only ever holds one shard. The shards' compact
+        change-point stores are then merged, in column order, for a single
+        global segmentation and selection: the result is identical to
+        :meth:`sift` on the whole frame.
+
+        Args:
+            data: Input time series data
+            shards: Either a column -> shard key mapping (unmapped columns form
+                one extra shard), or Prometheus label keys to shard a frame from
+                :func:`metricsifter.adapters.prometheus.from_query_range` by
+                (see :func:`~metricsifter.adapters.prometheus.shard_by_labels`).
+            without_simple_filter: If True, skip STEP0 simple filter
+
+        Returns:
+            SiftResult: Diagnostic result of the feature reduction pipeline
+        """
+        from metricsifter.sharding import sift_sharded
+
+        return sift_sharded(self, data, shards, without_simple_filter)
+
+    def _with_workers(self, n_jobs: int, executor: Executor | None) -> "Sifter":
+        """A copy of this sifter whose parallel stages all run on ``n_jobs`` workers or ``executor``."""
+        sifter = copy.copy(self)
+        sifter.execution = replace(self.execution, parallelism="fixed")
+        sifter.n_jobs = n_jobs
+        if executor is None:
+            sifter.execution = replace(sifter.execution, executor=None)
+            sifter._owned_pool = None
+        return sifter
+
+    def _serial_copy(self) -> "Sifter":
+        """A copy of this sifter that runs every stage in the calling process."""
+        serial = copy.copy(self)
+        serial.n_jobs = 1
+        serial.execution = replace(self.execution, executor=None)
+        serial._owned_pool = None
+        serial.stage_hooks = None
+        return serial
+
+    def _segment_detection(self, detected: ChangePointDetection) -> "_Segmentation | None":
+        if detected.store.n_change_points == 0:
+            return None
+        return self._segment(detected.store, detected.time_series_length, detected.scale_space)
+
+    def _segment(
+        self,
+        store: detection.ChangePointStore,
+        time_series_length: int,
+        scale_space: segmentation.ScaleSpace | None = None,
+    ) -> "_Segmentation":
+        """STEP2 and STEP3 on the change points of one frame (at least one change point)."""
+        recorder = StageRecorder(self.stage_hooks)
+        # STEP2: segment change points (resolving bandwidth="auto" first). The
+        # tuner and the final segmentation share one memoized scale space.
+        if scale_space is None:
+            scale_space = segmentation.ScaleSpace(store.positions, time_series_length)
+        if self.bandwidth == AUTO:
+            with recorder.stage("bandwidth_tuning") as counts:
+                n_evaluations = scale_space.n_evaluations
+                bandwidth, bandwidth_tuning = self._resolve_bandwidth(
+                    store, time_series_length=time_series_length, scale_space=scale_space, counts=counts
+                )
+                counts["candidates"] = len(bandwidth_tuning.grid)
+                counts["resamples"] = sum(bandwidth_tuning.n_resamples)
+                counts["kde_evaluations"] = scale_space.n_evaluations - n_evaluations
+        else:
+            bandwidth, bandwidth_tuning = self._resolve_bandwidth(
+                store, time_series_length=time_series_length, scale_space=scale_space
+            )
+        with recorder.stage("segmentation") as counts:
+            n_evaluations = scale_space.n_evaluations
+            labels, member_ids, label_to_change_points = segmentation.cluster_change_point_store(
+                store, time_series_length=time_series_length, kde_bandwidth=bandwidth, scale_space=scale_space
+            )
+            cluster_label_to_metrics = {
+                int(label): {store.metrics[m] for m in ids} for label, ids in zip(labels, member_ids)
+            }
+            counts["segments"] = len(label_to_change_points)
+            counts["kde_evaluations"] = scale_space.n_evaluations - n_evaluations
+
+        # STEP3: select the largest (densest) segment. The scores are computed
+        # once and reused for the report.
+        with recorder.stage("selection") as counts:
+            batch = SegmentCandidateBatch.from_store(store, labels, member_ids, label_to_change_points)
+            scores = self._score_segments(batch)
+            selected_label, remained_metrics = self._select_by_scores(cluster_label_to_metrics, batch, scores)
+            counts["candidates"] = batch.n_segments
+        return _Segmentation(
+            scale_space=scale_space,
+            bandwidth_tuning=bandwidth_tuning,
+            cluster_label_to_metrics=cluster_label_to_metrics,
+            label_to_change_points=label_to_change_points,
+            label_to_score=dict(zip(batch.labels.tolist(), scores.tolist())),
+            selected_label=selected_label,
+            remained_metrics=frozenset(remained_metrics),
+            timings=recorder.timings,
+        )
+
+    def _build_result(
+        self, detected: ChangePointDetection, segmented: "_Segmentation | None", timings: dict[str, StageTiming]
+    ) -> SiftResult:
+        """Assemble the :class:`SiftResult` of one frame, timed as the ``"assembly"`` stage.
+
+        ``timings`` are the stages that ran before segmentation; the
+        segmentation stages and the assembly itself are added to them.
+        """
+        if segmented is not None:
+            timings = {**timings, **segmented.timings}
+        recorder = StageRecorder(self.stage_hooks, timings)
+        with recorder.stage("assembly") as counts:
+            result = self._assemble_result(detected, segmented, recorder.timings)
+            counts["selected_metrics"] = len(result.selected_metrics)
+        return result
+
+    def _assemble_result(
+        self, detected: ChangePointDetection, segmented: "_Segmentation | None", timings: dict[str, StageTiming]
+    ) -> SiftResult:
+        data, columns, store = detected.data, detected.columns, detected.store
+        unprocessed_metrics = list(detected.unprocessed_metrics)
+        filtered_no_change = frozenset(data.columns) - frozenset(data.columns[columns]) - frozenset(unprocessed_metrics)
+        index = data.index
+        has_datetime = isinstance(index, pd.DatetimeIndex)
+
+        metric_to_change_points = store.metric_to_cps
+        has_cps = store.counts > 0
+        filtered_no_change_points = frozenset(metric for metric, has in zip(store.metrics, has_cps) if not has)
         metric_to_change_times = None
         if has_datetime:
             metric_to_change_times = {
                 metric: [index[cp] for cp in cps] for metric, cps in metric_to_change_points.items()
             }
 
-        if not flatten_change_points:
-            # Return a fully empty DataFrame (no index) to preserve the legacy
-            # behavior of run() / run_with_selected_segment().
+        if segmented is None:
+            # No change points: return a fully empty DataFrame (no index) to
+            # preserve the legacy behavior of run() / run_with_selected_segment().
             bandwidth_tuning = None
             if self.bandwidth == AUTO:
                 bandwidth_tuning = BandwidthTuning(
@@ -270,7 +1336,6 @@ class Sifter:
                     reason="no_change_points",
                 )
             return SiftResult(
-                data=pd.DataFrame(),
                 selected_metrics=frozenset(),
                 filtered_no_change=filtered_no_change,
                 filtered_no_change_points=filtered_no_change_points,
@@ -279,32 +1344,21 @@ class Sifter:
                 metric_to_change_times=metric_to_change_times,
                 segments=[],
                 selected_segment=None,
-                penalty_tuning=penalty_tuning,
+                penalty_tuning=detected.penalty_tuning,
                 bandwidth_tuning=bandwidth_tuning,
+                execution_plan=detected.execution_plan,
+                unprocessed_metrics=unprocessed_metrics,
+                timings=timings,
+                detection=detected,
+                _selected_columns=np.zeros(0, dtype=np.intp),
             )
 
-        # STEP2: segment change points (resolving bandwidth="auto" first)
-        bandwidth, bandwidth_tuning = self._resolve_bandwidth(
-            flatten_change_points, cp_to_metrics, metric_to_cps, time_series_length=X.shape[0]
-        )
-        cluster_label_to_metrics, label_to_change_points = segmentation.segment_nested_changepoints(
-            flatten_change_points=flatten_change_points,
-            cp_to_metrics=cp_to_metrics,
-            time_series_length=X.shape[0],
-            kde_bandwidth=bandwidth,
-        )
-
-        # STEP3: select the largest (densest) segment
-        selected_label, remained_metrics = self.select_largest_segment_with_label(
-            cluster_label_to_metrics, metric_to_cps, label_to_change_points
-        )
-
         segments: list[SegmentInfo] = []
         selected_segment: SegmentInfo | None = None
-        for label, change_points in sorted(label_to_change_points.items()):
+        for label, change_points in sorted(segmented.label_to_change_points.items()):
             if len(change_points) == 0:
                 continue
-            metrics = frozenset(cluster_label_to_metrics.get(label, set()))
+            metrics = frozenset(segmented.cluster_label_to_metrics.get(label, set()))
             start_index = int(min(change_points))
             end_index = int(max(change_points))
             segment = SegmentInfo(
@@ -314,22 +1368,22 @@ class Sifter:
                 end_index=end_index,
                 start_time=index[start_index] if has_datetime else None,
                 end_time=index[end_index] if has_datetime else None,
-                score=self._score_candidate(
-                    self._build_candidate(label, metrics, metric_to_cps, label_to_change_points)
-                ),
-                selected=(label == selected_label),
+                score=segmented.label_to_score.get(int(label), 0.0),
+                selected=(label == segmented.selected_label),
             )
             segments.append(segment)
             if segment.selected:
                 selected_segment = segment
 
-        has_change_points = frozenset(metric for metric, cps in metric_to_change_points.items() if len(cps) > 0)
-        filtered_out_of_segment = has_change_points - frozenset(remained_metrics)
+        remained_metrics = segmented.remained_metrics
+        has_change_points = frozenset(metric for metric, has in zip(store.metrics, has_cps) if has)
+        filtered_out_of_segment = has_change_points - remained_metrics
 
-        selected_columns = [c for c in X.columns if c in remained_metrics]
+        selected = np.fromiter(
+            (metric in remained_metrics for metric in store.metrics), dtype=bool, count=store.n_metrics
+        )
         return SiftResult(
-            data=X[selected_columns],
-            selected_metrics=frozenset(remained_metrics),
+            selected_metrics=remained_metrics,
             filtered_no_change=filtered_no_change,
             filtered_no_change_points=filtered_no_change_points,
             filtered_out_of_segment=filtered_out_of_segment,
@@ -337,49 +1391,57 @@ class Sifter:
             metric_to_change_times=metric_to_change_times,
             segments=segments,
             selected_segment=selected_segment,
-            penalty_tuning=penalty_tuning,
-            bandwidth_tuning=bandwidth_tuning,
+            penalty_tuning=detected.penalty_tuning,
+            bandwidth_tuning=segmented.bandwidth_tuning,
+            execution_plan=detected.execution_plan,
+            unprocessed_metrics=unprocessed_metrics,
+            timings=timings,
+            scale_space=segmented.scale_space,
+            detection=detected,
+            _selected_columns=columns[selected],
         )
 
-    @staticmethod
-    def _build_candidate(
-        label: int,
-        metrics,
-        metric_to_cps: dict[str, list[int]],
-        label_to_change_points: dict | None = None,
-    ) -> SegmentCandidate:
-        """Assemble the :class:`SegmentCandidate` view handed to a scoring strategy."""
-        metrics_fs = frozenset(metrics)
-        raw_cps = (label_to_change_points or {}).get(label, [])
-        change_points = sorted(int(cp) for cp in raw_cps)
-        # Restrict the change-point map to this segment's metrics (all of which are
-        # guaranteed to be present in metric_to_cps, since they originate from it).
-        sub_metric_to_cps = {m: list(metric_to_cps[m]) for m in metrics_fs if m in metric_to_cps}
-        return SegmentCandidate(
-            label=int(label),
-            metrics=metrics_fs,
-            change_points=change_points,
-            metric_to_cps=sub_metric_to_cps,
-        )
-
-    def _score_candidate(self, candidate: SegmentCandidate) -> float:
-        """Score a candidate segment under the configured selection method.
+    def _score_segments(self, batch: SegmentCandidateBatch) -> np.ndarray:
+        """Score every candidate segment of ``batch`` under the configured selection method.
 
-        Mirrors select_largest_segment_with_label() so that the selected segment
-        holds the maximum score among all candidates. Supports the built-in string
-        methods and any custom ``Callable[[SegmentCandidate], float]``.
+        ``"max"`` is one ``np.bincount`` over the segment memberships.
+        ``"weighted_max"`` adds each segment's ``1 / len(cps)`` terms with
+        ``math.fsum``, the correctly rounded exact sum: a score does not depend
+        on the order of the metrics, and segments whose scores are equal in
+        exact arithmetic tie exactly, so the first one wins.
         """
         method = self.segment_selection_method
+        if isinstance(method, BatchSegmentScorer):
+            scores = np.asarray(method.score_batch(batch), dtype=float)
+            if scores.shape != (batch.n_segments,):
+                raise ValueError(
+                    f"score_batch must return one score per segment ({batch.n_segments}), got shape {scores.shape}"
+                )
+            return scores
         if callable(method):
-            return float(method(candidate))
+            return np.array([float(method(candidate)) for candidate in batch.candidates()], dtype=float)
         match method:
             case "max" | "":
-                return float(len(candidate.metrics))
+                return np.bincount(batch.member_segment, minlength=batch.n_segments).astype(float)
             case "weighted_max":
-                return float(sum(1 / len(candidate.metric_to_cps[m]) for m in candidate.metrics))
+                weights = 1.0 / batch.n_change_points[batch.member_metric]
+                order = np.argsort(batch.member_segment, kind="stable")
+                bounds = np.cumsum(np.bincount(batch.member_segment, minlength=batch.n_segments))[:-1]
+                terms = np.split(weights[order], bounds) if batch.n_segments else []
+                return np.array([math.fsum(segment_terms) for segment_terms in terms], dtype=float)
             case _:
                 raise ValueError(f"Unknown segment_selection_method: {method!r}")
 
+    @staticmethod
+    def _select_by_scores(
+        cluster_label_to_metrics: dict, batch: SegmentCandidateBatch, scores: np.ndarray
+    ) -> tuple[int | None, set[str]]:
+        """Pick the highest-scoring segment (the first one on ties)."""
+        if batch.n_segments == 0:
+            return None, set()
+        selected_label = int(batch.labels[int(np.argmax(scores))])
+        return selected_label, set(cluster_label_to_metrics[selected_label])
+
     def select_largest_segment(
         self,
         cluster_label_to_metrics: dict,
@@ -412,39 +1474,16 @@ class Sifter:
             cluster_label_to_metrics: Mapping from segment ID to metrics set
             metric_to_cps: Mapping from metric name to change points list
             label_to_change_points: Mapping from segment ID to its change points.
-                Only needed by a custom ``Callable`` selection strategy so it can
-                read ``SegmentCandidate.change_points``; ignored by the built-in
-                string strategies and optional for backward compatibility.
+                Only needed by a custom (``Callable`` or batch) selection strategy
+                so it can read the segments' change points; ignored by the
+                built-in string strategies and optional for backward compatibility.
 
         Returns:
             tuple[int | None, set[str]]:
                 - Label of the selected segment (None if no segments exist)
                 - Set of metrics in the selected segment
         """
-        if not cluster_label_to_metrics:
-            return None, set()
-
-        method = self.segment_selection_method
-        if callable(method):
-            choiced_cluster = max(
-                cluster_label_to_metrics.items(),
-                key=lambda item: self._score_candidate(
-                    self._build_candidate(item[0], item[1], metric_to_cps, label_to_change_points)
-                ),
-            )
-        else:
-            match method:
-                case "max" | "":
-                    choiced_cluster = max(cluster_label_to_metrics.items(), key=lambda x: len(x[1]))
-                case "weighted_max":
-                    if metric_to_cps is None:
-                        raise ValueError("metric_to_cps should not be None")
-                    choiced_cluster = max(
-                        cluster_label_to_metrics.items(), key=lambda x: sum(1 / len(metric_to_cps[m]) for m in x[1])
-                    )
-                case _:
-                    raise ValueError(f"Unknown segment_selection_method: {method!r}")
-
-        selected_label: int = choiced_cluster[0]
-        remained_metrics: set[str] = set(choiced_cluster[1])
-        return selected_label, remained_metrics
+        if self.segment_selection_method == "weighted_max" and metric_to_cps is None:
+            raise ValueError("metric_to_cps should not be None")
+        batch = SegmentCandidateBatch.from_segments(cluster_label_to_metrics, metric_to_cps, label_to_change_points)
+        return self._select_by_scores(cluster_label_to_metrics, batch, self._score_segments(batch))
@@ -0,0 +1,204 @@
+"""Parameter sweeps that share pipeline stage outputs between configurations.
+
+A sweep expands a parameter grid into configurations and evaluates them as a
+DAG of stage computations, each computed once however many configurations
+share it:
+
+    STEP0 filter                                             (once per sweep)
+    -> searcher fit           per (search_method, cost_model) and column
+    -> change points          per (penalty, sigma_estimator, penalty_adjust)
+    -> segmentation/selection per (bandwidth, segment_selection_method,
+                                   random_state, bootstrap_early_stopping)
+
+The searcher fit does not depend on the penalty, so every penalty setting of a
+column is predicted from one fit; one detection output serves every
+segmentation setting. The per-column detection work of all fits is one job
+list, and the distinct segmentations run in parallel, on the sweeping
+:class:`~metricsifter.sifter.Sifter`'s executor or joblib workers.
+"""
+
+import inspect
+import itertools
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+import pandas as pd
+
+from metricsifter import parallel, planner
+from metricsifter.algo import detection, segmentation
+from metricsifter.profiling import StageRecorder
+from metricsifter.sifter import AUTO, Sifter, _store_counts
+from metricsifter.types import ChangePointDetection, SiftResult
+
+__all__ = ["expand_param_grid", "sweep"]
+
+#: Parameters keying the searcher fit of a configuration.
+FIT_PARAMS: tuple[str, ...] = ("search_method", "cost_model")
+
+#: Parameters keying the change points of a configuration (a superset of :data:`FIT_PARAMS`).
+DETECTION_PARAMS: tuple[str, ...] = FIT_PARAMS + ("penalty", "sigma_estimator", "penalty_adjust")
+
+#: Parameters keying the segmentation and selection on top of the change points.
+SEGMENTATION_PARAMS: tuple[str, ...] = (
+    "bandwidth",
+    "segment_selection_method",
+    "random_state",
+    "bootstrap_early_stopping",
+)
+
+
+def expand_param_grid(param_grid: Mapping[str, Sequence] | Iterable[Mapping[str, Sequence]]) -> list[dict[str, Any]]:
+    """Expand a scikit-learn style parameter grid into its configurations.
+
+    ``param_grid`` maps parameter names to candidate values (the configurations
+    are their Cartesian product, the last parameter varying fastest), or is a
+    sequence of such mappings whose expansions are concatenated.
+    """
+    grids = [param_grid] if isinstance(param_grid, Mapping) else list(param_grid)
+    configs = []
+    for grid in grids:
+        names = list(grid)
+        configs.extend(dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names)))
+    return configs
+
+
+def _configure(sifter: Sifter, overrides: Mapping[str, Any]) -> Sifter:
+    """A new sifter with ``sifter``'s parameters and ``overrides`` (validated by the constructor)."""
+    params = {name: getattr(sifter, name) for name in inspect.signature(Sifter).parameters}
+    params.update(overrides)
+    return Sifter(**params)
+
+
+def _segment(
+    sifter: Sifter,
+    store: detection.ChangePointStore,
+    time_series_length: int,
+    scale_space: segmentation.ScaleSpace,
+):
+    return sifter._segment(store, time_series_length, scale_space)
+
+
+def sweep(
+    sifter: Sifter,
+    data: pd.DataFrame,
+    param_grid: Mapping[str, Sequence] | Iterable[Mapping[str, Sequence]],
+    without_simple_filter: bool = False,
+) -> list[tuple[dict[str, Any], SiftResult]]:
+    """Sift ``data`` under every configuration of ``param_grid``, sharing stage outputs.
+
+    Parameters absent from the grid keep ``sifter``'s values. See
+    :meth:`metricsifter.sifter.Sifter.sweep`.
+
+    Raises:
+        ValueError: If the grid names a parameter that cannot be swept
+            (anything outside :data:`DETECTION_PARAMS` and
+            :data:`SEGMENTATION_PARAMS`), or an unsupported value.
+    """
+    configs = expand_param_grid(param_grid)
+    sweepable = set(DETECTION_PARAMS + SEGMENTATION_PARAMS)
+    unknown = sorted({name for config in configs for name in config} - sweepable)
+    if unknown:
+        raise ValueError(f"Cannot sweep {unknown}. Sweepable parameters: {sorted(sweepable)}.")
+    sifters = [_configure(sifter, config) for config in configs]
+    if any(configured.search_method == AUTO for configured in sifters):
+        raise ValueError("Cannot sweep search_method='auto'. List the search methods to compare instead.")
+    timings = sifter._start_executor()
+    shared = StageRecorder(sifter.stage_hooks)
+
+    # STEP0 once for every configuration.
+    columns = sifter._filter(data, without_simple_filter, shared)
+    metrics = data.columns[columns].tolist()
+    time_series_length = data.shape[0]
+
+    # STEP1: one searcher fit per (fit key, column), every penalty setting of
+    # that fit predicted from it.
+    fit_settings: dict[tuple, list[tuple]] = {}
+    detection_nodes: dict[tuple, tuple[tuple, int, Sifter]] = {}
+    for config_sifter in sifters:
+        detection_key = tuple(getattr(config_sifter, name) for name in DETECTION_PARAMS)
+        if detection_key in detection_nodes:
+            continue
+        fit_key = detection_key[: len(FIT_PARAMS)]
+        grid = (
+            detection.PENALTY_ADJUST_GRID
+            if config_sifter.penalty_adjust == AUTO
+            else (float(config_sifter.penalty_adjust),)
+        )
+        settings = fit_settings.setdefault(fit_key, [])
+        detection_nodes[detection_key] = (fit_key, len(settings), config_sifter)
+        settings.append((config_sifter.penalty, config_sifter.sigma_estimator, grid))
+
+    tolerance = detection._plateau_tolerance(time_series_length)
+    fit_keys = list(fit_settings)
+    with shared.stage("detection") as counts:
+        tasks = [
+            (data.iloc[:, j].to_numpy(), *fit_key, fit_settings[fit_key], tolerance)
+            for fit_key in fit_keys
+            for j in columns
+        ]
+        lengths = planner.trimmed_lengths(data, columns)
+        n_jobs, executor = sifter._stage_workers(
+            counts,
+            len(tasks),
+            lambda model: sum(model.column_seconds(fit_key[0], lengths, penalty_tuning=True) for fit_key in fit_keys),
+        )
+        flat_results = parallel.map_tasks(detection.univariate_penalty_sweep, tasks, n_jobs=n_jobs, executor=executor)
+        counts["fits"] = len(tasks)
+        counts["settings"] = len(detection_nodes)
+    fit_results = {
+        fit_key: flat_results[i * len(columns) : (i + 1) * len(columns)] for i, fit_key in enumerate(fit_keys)
+    }
+
+    detections: dict[tuple, ChangePointDetection] = {}
+    for detection_key, (fit_key, k, owner) in detection_nodes.items():
+        results = [column_results[k] for column_results in fit_results[fit_key]]
+        recorder = StageRecorder(sifter.stage_hooks, dict(shared.timings))
+        penalty_tuning = None
+        if owner.penalty_adjust == AUTO:
+            with recorder.stage("penalty_tuning") as counts:
+                store, penalty_tuning = owner._store_from_penalty_paths(data, columns, metrics, results)
+                counts.update(_store_counts(store))
+        else:
+            store = detection.ChangePointStore.from_lists(
+                metrics, [sorted(set(path[0]) | set(mv_cps)) for path, mv_cps, _ in results]
+            )
+        detections[detection_key] = ChangePointDetection(
+            data=data, columns=columns, store=store, penalty_tuning=penalty_tuning, timings=recorder.timings
+        )
+
+    # STEP2 + STEP3: one task per distinct segmentation of a detection.
+    segmentation_nodes: dict[tuple, int] = {}
+    segmentation_tasks = []
+    config_nodes = []
+    for config_sifter in sifters:
+        detection_key = tuple(getattr(config_sifter, name) for name in DETECTION_PARAMS)
+        detected = detections[detection_key]
+        node = None
+        if detected.store.n_change_points > 0:
+            segmentation_key = detection_key + tuple(getattr(config_sifter, name) for name in SEGMENTATION_PARAMS)
+            if segmentation_key not in segmentation_nodes:
+                segmentation_nodes[segmentation_key] = len(segmentation_tasks)
+                segmentation_tasks.append(
+                    (
+                        config_sifter._serial_copy(),
+                        detected.store,
+                        detected.time_series_length,
+                        detected.scale_space,
+                    )
+                )
+            node = segmentation_nodes[segmentation_key]
+        config_nodes.append((detected, node))
+    # Only the bandwidth="auto" bootstraps are worth a worker (see metricsifter.batch._sift_filtered_frames).
+    n_cp = sum(task[1].n_change_points for task in segmentation_tasks if task[0].bandwidth == AUTO)
+    n_jobs, executor = sifter._stage_workers({}, len(segmentation_tasks), lambda model: model.bootstrap_seconds * n_cp)
+    segmented = parallel.map_tasks(_segment, segmentation_tasks, n_jobs=n_jobs, executor=executor)
+
+    return [
+        (
+            config,
+            config_sifter._build_result(
+                detected, None if node is None else segmented[node], {**timings, **detected.timings}
+            ),
+        )
+        for config, config_sifter, (detected, node) in zip(configs, sifters, config_nodes)
+    ]
@@ -14,13 +14,15 @@ convention). We follow that convention strictly.
 
 from __future__ import annotations
 
+import os
+from typing import Callable
+
 import numpy as np
 import pandas as pd
 
-from typing import Callable
-
+from metricsifter.execution import ExecutionOptions
 from metricsifter.sifter import Sifter
-from metricsifter.types import SegmentCandidate, SiftResult
+from metricsifter.types import BatchSegmentScorer, SegmentCandidate, SiftResult, StageHooks
 
 # The constructor parameters shared with Sifter, plus the sift() switch. Kept in
 # one place so get_params / set_params / clone stay in lock-step with __init__.
@@ -35,6 +37,11 @@ _PARAM_NAMES = (
     "without_simple_filter",
     "sigma_estimator",
     "random_state",
+    "bootstrap_early_stopping",
+    "checkpoint_dir",
+    "stage_hooks",
+    "memory_profile",
+    "execution",
 )
 
 
@@ -57,11 +64,16 @@ class SifterTransformer:
         penalty: str | float = "bic",
         penalty_adjust: float | str = 2.0,
         bandwidth: float | str = 2.5,
-        segment_selection_method: str | Callable[[SegmentCandidate], float] = "weighted_max",
+        segment_selection_method: str | Callable[[SegmentCandidate], float] | BatchSegmentScorer = "weighted_max",
         n_jobs: int = 1,
         without_simple_filter: bool = False,
         sigma_estimator: str = "std",
         random_state: int | None = None,
+        bootstrap_early_stopping: bool = False,
+        checkpoint_dir: str | os.PathLike | None = None,
+        stage_hooks: StageHooks | None = None,
+        memory_profile: bool = False,
+        execution: ExecutionOptions | None = None,
     ) -> None:
         # Store every argument verbatim under its own name (sklearn convention;
         # required for get_params/clone round-trips to be exact).
@@ -75,6 +87,11 @@ class SifterTransformer:
         self.without_simple_filter = without_simple_filter
         self.sigma_estimator = sigma_estimator
         self.random_state = random_state
+        self.bootstrap_early_stopping = bootstrap_early_stopping
+        self.checkpoint_dir = checkpoint_dir
+        self.stage_hooks = stage_hooks
+        self.memory_profile = memory_profile
+        self.execution = execution
 
     # -- scikit-learn estimator protocol ---------------------------------
 
@@ -104,6 +121,11 @@ class SifterTransformer:
             n_jobs=self.n_jobs,
             sigma_estimator=self.sigma_estimator,
             random_state=self.random_state,
+            bootstrap_early_stopping=self.bootstrap_early_stopping,
+            checkpoint_dir=self.checkpoint_dir,
+            stage_hooks=self.stage_hooks,
+            memory_profile=self.memory_profile,
+            execution=self.execution,
         )
 
     @staticmethod
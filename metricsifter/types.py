@@ -1,8 +1,16 @@
 import json
 from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+if TYPE_CHECKING:
+    from metricsifter.algo.detection import ChangePointStore
+    from metricsifter.algo.segmentation import ScaleSpace
+
 
 @dataclass
 class Segment:
@@ -27,7 +35,8 @@ class SegmentCandidate:
     ``Callable[[SegmentCandidate], float]``: it receives one of these per
     candidate segment and returns a score; :class:`metricsifter.sifter.Sifter`
     keeps the segment with the maximum score (ties resolved by discovery order,
-    matching the built-in ``"max"`` / ``"weighted_max"`` strategies).
+    matching the built-in ``"max"`` / ``"weighted_max"`` strategies). To score
+    all candidates in one call instead, implement :class:`BatchSegmentScorer`.
 
     Attributes:
         label: Segment ID (the KDE cluster label).
@@ -45,6 +54,146 @@ class SegmentCandidate:
     metric_to_cps: dict[str, list[int]]
 
 
+@dataclass
+class SegmentCandidateBatch:
+    """Every candidate segment of one segmentation, as flat arrays.
+
+    The batch counterpart of :class:`SegmentCandidate`, handed in a single
+    call to a :class:`BatchSegmentScorer`. Segment ``i`` is ``labels[i]``;
+    segment membership and change points are stored as parallel
+    ``(segment index, value)`` arrays, so per-segment reductions are one
+    ``np.bincount(member_segment, ...)`` away.
+
+    Attributes:
+        labels: Segment IDs, in discovery order (the order ties are resolved in).
+        metrics: Metric id -> metric name, for the ids in ``member_metric``.
+        n_change_points: Total change points of each metric id across the
+            whole series (``len(metric_to_cps[m])``).
+        member_segment: Segment index of every (segment, metric) membership.
+        member_metric: Metric id of every (segment, metric) membership.
+        change_point_segment: Segment index of every (segment, change point) pair.
+        change_points: Row position of every (segment, change point) pair,
+            sorted within each segment.
+        metric_to_cps: Metric name -> its change points; only read to build
+            :class:`SegmentCandidate` views (see :meth:`candidates`).
+        store: The change-point store the batch was built from (see
+            :meth:`from_store`); read instead of ``metric_to_cps`` when set.
+    """
+
+    labels: np.ndarray
+    metrics: tuple[str, ...]
+    n_change_points: np.ndarray
+    member_segment: np.ndarray
+    member_metric: np.ndarray
+    change_point_segment: np.ndarray
+    change_points: np.ndarray
+    metric_to_cps: dict[str, list[int]] = field(default_factory=dict, repr=False)
+    store: "ChangePointStore | None" = field(default=None, repr=False)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_segments(
+        cls,
+        label_to_metrics: dict,
+        metric_to_cps: dict[str, list[int]] | None,
+        label_to_change_points: dict | None = None,
+    ) -> "SegmentCandidateBatch":
+        """Build from the ``label -> metrics`` / ``label -> change points`` mappings of a segmentation."""
+        metric_to_cps = metric_to_cps if metric_to_cps is not None else {}
+        label_to_change_points = label_to_change_points if label_to_change_points is not None else {}
+        labels = list(label_to_metrics)
+        metric_ids: dict[str, int] = {}
+        member_segment: list[int] = []
+        member_metric: list[int] = []
+        for i, label in enumerate(labels):
+            for metric in label_to_metrics[label]:
+                member_segment.append(i)
+                member_metric.append(metric_ids.setdefault(metric, len(metric_ids)))
+        metrics = tuple(metric_ids)
+        segment_cps = [np.unique(np.asarray(label_to_change_points.get(label, []), dtype=np.int64)) for label in labels]
+        return cls(
+            labels=np.asarray(labels, dtype=np.int64),
+            metrics=metrics,
+            n_change_points=np.fromiter(
+                (len(metric_to_cps[metric]) if metric_to_cps else 0 for metric in metrics),
+                dtype=np.int64,
+                count=len(metrics),
+            ),
+            member_segment=np.asarray(member_segment, dtype=np.int64),
+            member_metric=np.asarray(member_metric, dtype=np.int64),
+            change_point_segment=np.repeat(np.arange(len(labels)), [len(cps) for cps in segment_cps]),
+            change_points=np.concatenate(segment_cps) if segment_cps else np.empty(0, dtype=np.int64),
+            metric_to_cps=metric_to_cps,
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        store: "ChangePointStore",
+        labels: npt.ArrayLike,
+        member_ids: list[np.ndarray],
+        label_to_change_points: dict,
+    ) -> "SegmentCandidateBatch":
+        """Build from the clusters of a :class:`~metricsifter.algo.detection.ChangePointStore`.
+
+        ``labels``, ``member_ids`` and ``label_to_change_points`` are the output
+        of :func:`metricsifter.algo.segmentation.cluster_change_point_store`.
+        Metric ids are the store's own, so ``n_change_points`` is ``store.counts``.
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        segment_cps = [np.asarray(label_to_change_points[label], dtype=np.int64) for label in labels.tolist()]
+        return cls(
+            labels=labels,
+            metrics=store.metrics,
+            n_change_points=store.counts,
+            member_segment=np.repeat(np.arange(len(labels)), [len(ids) for ids in member_ids]),
+            member_metric=np.concatenate(member_ids).astype(np.int64) if member_ids else np.empty(0, dtype=np.int64),
+            change_point_segment=np.repeat(np.arange(len(labels)), [len(cps) for cps in segment_cps]),
+            change_points=np.concatenate(segment_cps) if segment_cps else np.empty(0, dtype=np.int64),
+            store=store,
+        )
+
+    def _metric_to_cps(self, metrics: list[str]) -> dict[str, list[int]]:
+        if self.store is not None:
+            return {m: self.store.change_points(m).tolist() for m in metrics}
+        return {m: list(self.metric_to_cps[m]) for m in metrics if m in self.metric_to_cps}
+
+    def candidates(self) -> list[SegmentCandidate]:
+        """Materialize one :class:`SegmentCandidate` per segment, in ``labels`` order."""
+        members: list[list[str]] = [[] for _ in range(self.n_segments)]
+        for i, m in zip(self.member_segment.tolist(), self.member_metric.tolist()):
+            members[i].append(self.metrics[m])
+        change_points = np.split(
+            self.change_points, np.cumsum(np.bincount(self.change_point_segment, minlength=self.n_segments))[:-1]
+        )
+        return [
+            SegmentCandidate(
+                label=int(label),
+                metrics=frozenset(names),
+                change_points=[int(cp) for cp in cps],
+                metric_to_cps=self._metric_to_cps(names),
+            )
+            for label, names, cps in zip(self.labels, members, change_points)
+        ]
+
+
+@runtime_checkable
+class BatchSegmentScorer(Protocol):
+    """A custom segment-selection strategy that scores all candidates in one call.
+
+    Pass an object with a ``score_batch`` method as ``segment_selection_method``
+    to receive every candidate of a segmentation as one
+    :class:`SegmentCandidateBatch` instead of one :class:`SegmentCandidate` per
+    call. It returns one score per segment (in ``batch.labels`` order); the
+    highest-scoring segment is selected, ties resolved by discovery order.
+    """
+
+    def score_batch(self, batch: SegmentCandidateBatch) -> npt.ArrayLike: ...
+
+
 @dataclass(frozen=True)
 class SegmentInfo:
     """Rich, diagnostic information about a single change-point cluster (segment).
@@ -175,8 +324,14 @@ class BandwidthTuning:
         stability: Mean pairwise Jaccard per candidate; ``None`` marks an
             inadmissible candidate (fewer than two full-data segments).
         n_segments: Full-data segment count per candidate.
+        n_resamples: Bootstrap resamples actually drawn per candidate (``0`` for
+            inadmissible ones). Equal to the cap everywhere unless sequential
+            early stopping dropped dominated candidates.
         reason: Why ``resolved`` was chosen (``"stability"``, ``"unimodal"``,
-            ``"too_few_change_points"``, ``"no_change_points"``).
+            ``"too_few_change_points"``, ``"no_change_points"``, or
+            ``"snapshot"`` for an intermediate
+            :meth:`~metricsifter.sifter.Sifter.sift_iter` snapshot, which is
+            not tuned).
     """
 
     requested: float | str
@@ -184,6 +339,7 @@ class BandwidthTuning:
     grid: list[float] = field(default_factory=list)
     stability: list[float | None] = field(default_factory=list)
     n_segments: list[int] = field(default_factory=list)
+    n_resamples: list[int] = field(default_factory=list)
     reason: str = ""
 
     def to_dict(self) -> dict:
@@ -193,6 +349,7 @@ class BandwidthTuning:
             "grid": [float(h) for h in self.grid],
             "stability": [float(s) if s is not None else None for s in self.stability],
             "n_segments": [int(n) for n in self.n_segments],
+            "n_resamples": [int(n) for n in self.n_resamples],
             "reason": self.reason,
         }
 
@@ -204,10 +361,164 @@ class BandwidthTuning:
             grid=list(d.get("grid", [])),
             stability=list(d.get("stability", [])),
             n_segments=list(d.get("n_segments", [])),
+            n_resamples=list(d.get("n_resamples", [])),
             reason=d.get("reason", ""),
         )
 
 
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """A search method and worker count with their predicted cost.
+
+    Produced by :meth:`metricsifter.sifter.Sifter.estimate_cost` (one per
+    candidate plan) and, for the plan a ``search_method="auto"`` sift ran,
+    reported in ``SiftResult.execution_plan``.
+
+    Attributes:
+        search_method: Change-point search method of the plan.
+        n_jobs: Workers detection runs on.
+        seconds: Predicted wall-clock seconds of change-point detection.
+        memory: Predicted peak bytes on top of the input frame (see
+            :mod:`metricsifter.memory`).
+        reason: Why the plan was chosen (``"fastest"``, ``"time_budget"`` or
+            ``"over_time_budget"``; empty for estimates that were not chosen).
+    """
+
+    search_method: str
+    n_jobs: int
+    seconds: float
+    memory: int
+    reason: str = ""
+
+    def to_dict(self) -> dict:
+        return {
+            "search_method": self.search_method,
+            "n_jobs": int(self.n_jobs),
+            "seconds": float(self.seconds),
+            "memory": int(self.memory),
+            "reason": self.reason,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ExecutionPlan":
+        return cls(
+            search_method=d["search_method"],
+            n_jobs=d["n_jobs"],
+            seconds=d["seconds"],
+            memory=d["memory"],
+            reason=d.get("reason", ""),
+        )
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    """Cost of one pipeline stage, as recorded in ``SiftResult.timings``.
+
+    Attributes:
+        wall: Elapsed wall-clock seconds.
+        cpu: CPU seconds of the calling process (work done in worker processes
+            is not included).
+        counts: Stage-specific sizes, e.g. ``metrics_in`` / ``metrics_out`` of
+            ``"filter"`` or ``resamples`` of ``"bandwidth_tuning"``.
+        peak_memory: Peak bytes the stage allocated in the calling process on
+            top of what was allocated when it started (``None`` unless
+            ``tracemalloc`` was tracing, e.g. with ``Sifter(memory_profile=True)``).
+        max_rss: Peak resident set size of the calling process in bytes, sampled
+            when the stage ended (``None`` when memory is not profiled or the
+            platform has no ``resource`` module).
+    """
+
+    wall: float
+    cpu: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+    peak_memory: int | None = None
+    max_rss: int | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "wall": float(self.wall),
+            "cpu": float(self.cpu),
+            "counts": {name: int(count) for name, count in self.counts.items()},
+            "peak_memory": self.peak_memory,
+            "max_rss": self.max_rss,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict | float) -> "StageTiming":
+        if not isinstance(d, dict):  # a bare number of seconds
+            return cls(wall=float(d))
+        return cls(
+            wall=d["wall"],
+            cpu=d.get("cpu", 0.0),
+            counts=dict(d.get("counts", {})),
+            peak_memory=d.get("peak_memory"),
+            max_rss=d.get("max_rss"),
+        )
+
+
+@runtime_checkable
+class StageHooks(Protocol):
+    """Callbacks around every timed pipeline stage (``Sifter(stage_hooks=...)``).
+
+    ``on_stage_start`` is called right before a stage runs and ``on_stage_end``
+    right after it, also when it raised. Only stages run by the calling process
+    call them; stages run on workers (the per-frame segmentation of
+    :meth:`~metricsifter.sifter.Sifter.sift_many` and
+    :meth:`~metricsifter.sifter.Sifter.sweep`) are only reported in the timings.
+    """
+
+    def on_stage_start(self, stage: str) -> None: ...
+
+    def on_stage_end(self, stage: str, timing: StageTiming) -> None: ...
+
+
+@dataclass(frozen=True)
+class ChangePointDetection:
+    """STEP0 + STEP1 output of a sift, returned by :meth:`metricsifter.sifter.Sifter.detect`.
+
+    Holds everything segmentation needs, so :meth:`~metricsifter.sifter.Sifter.resegment`
+    can rerun STEP2/STEP3 with another ``bandwidth`` or
+    ``segment_selection_method`` without detecting again.
+
+    Attributes:
+        data: The input frame.
+        columns: Integer positions of the columns of ``data`` that passed STEP0.
+        store: The change points of those columns, in column order.
+        penalty_tuning: Report of the ``penalty_adjust="auto"`` search (``None``
+            unless auto-tuning was requested).
+        execution_plan: The plan a ``search_method="auto"`` detection ran
+            (``None`` for an explicit search method).
+        unprocessed_metrics: Metrics that passed STEP0 but were not detected
+            because the sift was cancelled (see
+            :mod:`metricsifter.cancellation`), in priority order; they are not
+            in ``columns``.
+        timings: The :class:`StageTiming` of the stages that produced it.
+    """
+
+    data: pd.DataFrame = field(repr=False)
+    columns: np.ndarray = field(repr=False)
+    store: "ChangePointStore" = field(repr=False)
+    penalty_tuning: PenaltyTuning | None = None
+    execution_plan: ExecutionPlan | None = None
+    unprocessed_metrics: tuple[str, ...] = ()
+    timings: dict[str, StageTiming] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def time_series_length(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def metric_to_change_points(self) -> dict[str, list[int]]:
+        return self.store.metric_to_cps
+
+    @cached_property
+    def scale_space(self) -> "ScaleSpace":
+        """The memoized change-point scale space shared by every segmentation of this detection."""
+        from metricsifter.algo.segmentation import ScaleSpace
+
+        return ScaleSpace(self.store.positions, self.time_series_length)
+
+
 @dataclass
 class SiftResult:
     """Diagnostic, explainable result of :meth:`metricsifter.sifter.Sifter.sift`.
@@ -219,11 +530,16 @@ class SiftResult:
     excluded from serialization -- only metric names, times and reasons).
 
     Exclusion reasons are mutually exclusive; together with ``selected_metrics``
-    they partition the input columns.
+    (and ``unprocessed_metrics`` of a partial result) they partition the input
+    columns.
 
     Attributes:
-        data: Filtered DataFrame containing only the selected metrics
-            (``None`` when reconstructed from :meth:`from_dict`).
+        data: Filtered DataFrame containing only the selected metrics, a copy
+            of those input columns (``None`` when reconstructed from
+            :meth:`from_dict`). Not a dataclass field: a sift only records the
+            positions of the selected columns of ``detection.data``, and the
+            frame is built on first access, so callers that only need
+            ``selected_metrics`` never pay for it.
         selected_metrics: Metrics retained in the densest segment.
         filtered_no_change: Metrics dropped by the simple no-variation filter.
         filtered_no_change_points: Metrics that passed the filter but had no
@@ -240,9 +556,31 @@ class SiftResult:
             (``None`` unless auto-tuning was requested).
         bandwidth_tuning: Report of the ``bandwidth="auto"`` search (``None``
             unless auto-tuning was requested).
+        execution_plan: The search method and worker count a
+            ``search_method="auto"`` sift chose, with their predicted cost
+            (``None`` for an explicit search method).
+        unprocessed_metrics: Metrics that passed the filter but were never
+            detected because the sift was cancelled or ran out of its
+            ``deadline``, in the priority order they would have run in (empty
+            for a complete sift; see :attr:`partial`).
+        timings: Stage name -> :class:`StageTiming`, in pipeline order, for
+            the stages this sift ran: ``"search_plan"`` (choosing the
+            ``search_method="auto"`` plan), ``"memory_plan"`` (fitting
+            ``max_memory``), ``"pool_startup"`` (warming up a
+            :class:`~metricsifter.parallel.WorkerPool` executor; ~0 when it was
+            already warm), ``"filter"`` (STEP0), ``"detection"`` (STEP1),
+            ``"penalty_tuning"``, ``"bandwidth_tuning"``, ``"segmentation"``
+            (STEP2), ``"selection"`` (STEP3) and ``"assembly"`` (building this
+            result).
+        scale_space: The change-point :class:`~metricsifter.algo.segmentation.ScaleSpace`
+            the sift segmented, with its memoized densities (``None`` when no
+            change points were detected, or when reconstructed from
+            :meth:`from_dict`). Not serialized.
+        detection: The :class:`ChangePointDetection` the sift segmented, to
+            pass to :meth:`~metricsifter.sifter.Sifter.resegment` (``None`` when
+            reconstructed from :meth:`from_dict`). Not serialized.
     """
 
-    data: pd.DataFrame | None
     selected_metrics: frozenset[str]
     filtered_no_change: frozenset[str]
     filtered_no_change_points: frozenset[str]
@@ -253,6 +591,34 @@ class SiftResult:
     selected_segment: SegmentInfo | None = None
     penalty_tuning: PenaltyTuning | None = None
     bandwidth_tuning: BandwidthTuning | None = None
+    execution_plan: ExecutionPlan | None = None
+    unprocessed_metrics: list[str] = field(default_factory=list)
+    timings: dict[str, StageTiming] = field(default_factory=dict)
+    scale_space: "ScaleSpace | None" = field(default=None, repr=False, compare=False)
+    detection: ChangePointDetection | None = field(default=None, repr=False, compare=False)
+    # Integer positions of the selected columns of ``detection.data``, behind ``data``.
+    _selected_columns: np.ndarray | None = field(default=None, repr=False, compare=False)
+
+    @cached_property
+    def data(self) -> pd.DataFrame | None:
+        if self.detection is None or self._selected_columns is None:
+            return None
+        if len(self._selected_columns) == 0:
+            # Nothing selected: a fully empty DataFrame (no index), as run() always returned.
+            return pd.DataFrame()
+        return self.detection.data.take(self._selected_columns, axis=1)
+
+    @property
+    def partial(self) -> bool:
+        """Whether the sift was cut short, leaving ``unprocessed_metrics`` undetected."""
+        return bool(self.unprocessed_metrics)
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of the metrics passing the filter that change points were detected on (1.0 unless partial)."""
+        detected = len(self.selected_metrics) + len(self.filtered_no_change_points) + len(self.filtered_out_of_segment)
+        total = detected + len(self.unprocessed_metrics)
+        return detected / total if total else 1.0
 
     def to_dict(self) -> dict:
         """Serialize to a plain, JSON-compatible dict (excludes the DataFrame)."""
@@ -275,6 +641,11 @@ class SiftResult:
             "selected_segment": self.selected_segment.to_dict() if self.selected_segment is not None else None,
             "penalty_tuning": self.penalty_tuning.to_dict() if self.penalty_tuning is not None else None,
             "bandwidth_tuning": self.bandwidth_tuning.to_dict() if self.bandwidth_tuning is not None else None,
+            "execution_plan": self.execution_plan.to_dict() if self.execution_plan is not None else None,
+            "partial": self.partial,
+            "coverage": self.coverage,
+            "unprocessed_metrics": list(self.unprocessed_metrics),
+            "timings": {stage: timing.to_dict() for stage, timing in self.timings.items()},
         }
 
     def to_json(self, **kwargs) -> str:
@@ -295,8 +666,8 @@ class SiftResult:
         selected = d.get("selected_segment")
         penalty_tuning = d.get("penalty_tuning")
         bandwidth_tuning = d.get("bandwidth_tuning")
+        execution_plan = d.get("execution_plan")
         return cls(
-            data=None,
             selected_metrics=frozenset(d["selected_metrics"]),
             filtered_no_change=frozenset(excluded["no_change_filter"]),
             filtered_no_change_points=frozenset(excluded["no_change_points"]),
@@ -307,6 +678,9 @@ class SiftResult:
             selected_segment=SegmentInfo.from_dict(selected) if selected is not None else None,
             penalty_tuning=PenaltyTuning.from_dict(penalty_tuning) if penalty_tuning is not None else None,
             bandwidth_tuning=BandwidthTuning.from_dict(bandwidth_tuning) if bandwidth_tuning is not None else None,
+            execution_plan=ExecutionPlan.from_dict(execution_plan) if execution_plan is not None else None,
+            unprocessed_metrics=list(d.get("unprocessed_metrics", [])),
+            timings={stage: StageTiming.from_dict(timing) for stage, timing in d.get("timings", {}).items()},
         )
 
     @classmethod
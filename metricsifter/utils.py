@@ -1,8 +1,11 @@
+from concurrent.futures import Executor
 from typing import Any, Callable, Generator
 
 import pandas as pd
 from joblib import Parallel, delayed, effective_n_jobs
 
+from metricsifter import parallel
+
 
 def gen_even_slices(n: int, n_packs: int, *, n_samples: int | None = None) -> Generator[slice, None, None]:
     """Generator to create n_packs slices going up to n."""
@@ -22,8 +25,14 @@ def gen_even_slices(n: int, n_packs: int, *, n_samples: int | None = None) -> Ge
             start = end
 
 
-def parallel_apply(df: pd.DataFrame, func: Callable, n_jobs: int = -1, **kwargs: dict[str, Any]) -> pd.DataFrame:
-    """Apply ``func`` column-wise in parallel using joblib.
+def parallel_apply(
+    df: pd.DataFrame,
+    func: Callable,
+    n_jobs: int = -1,
+    executor: Executor | None = None,
+    **kwargs: dict[str, Any],
+) -> pd.DataFrame:
+    """Apply ``func`` column-wise in parallel using joblib (or ``executor`` when given).
 
     The columns of ``df`` are split into even packs (one pack per effective job)
     and each pack is processed by a worker. The per-pack results are concatenated
@@ -31,15 +40,17 @@ def parallel_apply(df: pd.DataFrame, func: Callable, n_jobs: int = -1, **kwargs:
     only faster. Slicing is done on ``df.shape[1]`` (the number of columns), not
     ``df.size`` (rows * columns): the latter made the first pack swallow every
     column while the remaining workers received empty slices, silently disabling
-    parallelism.
+    parallelism. With an ``executor``, each of its workers receives one pack.
     """
 
-    if effective_n_jobs(n_jobs) == 1 or df.shape[1] == 0 or df.shape[0] == 0:
+    n_packs = effective_n_jobs(n_jobs) if executor is None else parallel.executor_workers(executor, n_jobs)
+    if n_packs == 1 or df.shape[1] == 0 or df.shape[0] == 0:
         return df.apply(func, **kwargs)
-    ret = Parallel(n_jobs=n_jobs)(
-        delayed(type(df).apply)(df.iloc[:, s], func, **kwargs)
-        for s in gen_even_slices(df.shape[1], effective_n_jobs(n_jobs))
-    )
+    packs = [df.iloc[:, s] for s in gen_even_slices(df.shape[1], n_packs)]
+    if executor is None:
+        ret = Parallel(n_jobs=n_jobs)(delayed(type(df).apply)(pack, func, **kwargs) for pack in packs)
+    else:
+        ret = [future.result() for future in [executor.submit(type(df).apply, pack, func, **kwargs) for pack in packs]]
     results = [r for r in ret if not r.empty]
     if not results:
         return df.apply(func, **kwargs)
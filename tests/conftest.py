@@ -33,6 +33,13 @@ def make_synthetic(as_datetime: bool = False) -> pd.DataFrame:
     return df
 
 
+def report(result) -> dict:
+    """``result.to_dict()`` without the run-dependent ``timings``, for equality checks."""
+    d = result.to_dict()
+    del d["timings"]
+    return d
+
+
 @pytest.fixture
 def synthetic_df() -> pd.DataFrame:
     return make_synthetic()
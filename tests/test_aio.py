@@ -0,0 +1,133 @@
+"""
+Test suites for the asyncio API (Sifter.asift / metricsifter.aio)
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from metricsifter import Sifter
+from metricsifter.algo import detection
+from tests.conftest import make_synthetic, report
+
+
+def _slow_detection(monkeypatch, seconds):
+    """Slow every per-metric detection down; returns the list of calls and the peak concurrency."""
+    original = detection.detect_univariate_changepoints
+    calls, active, peak = [], [0], [0]
+    lock = threading.Lock()
+
+    def slow(*args):
+        with lock:
+            calls.append(args)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(seconds)
+        with lock:
+            active[0] -= 1
+        return original(*args)
+
+    monkeypatch.setattr(detection, "detect_univariate_changepoints", slow)
+    return calls, peak
+
+
+class TestAsift:
+    def test_result_and_stage_events(self):
+        data = make_synthetic()
+        sifter = Sifter(n_jobs=1)
+
+        async def main():
+            run = sifter.asift(data)
+            events = [event async for event in run]
+            return events, await run
+
+        events, result = asyncio.run(main())
+        assert report(result) == report(sifter.sift(data))
+        stages = [stage for stage, timing in events if timing is not None]
+        assert stages[0] == "filter" and stages[-1] == "assembly" and "detection" in stages
+        assert events.index(("filter", None)) < next(i for i, (s, t) in enumerate(events) if s == "filter" and t)
+
+    def test_does_not_block_the_loop(self, monkeypatch):
+        _slow_detection(monkeypatch, 0.05)
+
+        async def main():
+            ticks = 0
+            run = Sifter(n_jobs=1).asift(make_synthetic())
+            while not run.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            await run
+            return ticks
+
+        assert asyncio.run(main()) >= 5
+
+    def test_cancellation_stops_dispatching(self, monkeypatch):
+        calls, _ = _slow_detection(monkeypatch, 0.2)
+
+        async def main():
+            run = Sifter(n_jobs=1).asift(make_synthetic())
+            await asyncio.sleep(0.1)
+            run.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run
+
+        asyncio.run(main())
+        time.sleep(0.5)  # let the abandoned worker thread wind down
+        assert len(calls) < 5
+
+    def test_cancellation_stops_at_the_next_stage(self, monkeypatch):
+        _slow_detection(monkeypatch, 0.2)
+        stages = []
+
+        class Hooks:
+            def on_stage_start(self, stage):
+                stages.append(stage)
+
+            def on_stage_end(self, stage, timing):
+                pass
+
+        async def main():
+            run = Sifter(n_jobs=1, bandwidth="auto", random_state=0, stage_hooks=Hooks()).asift(make_synthetic())
+            await asyncio.sleep(0.1)
+            run.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await run
+
+        asyncio.run(main())  # also waits for the sift's thread
+        assert "detection" in stages
+        assert "bandwidth_tuning" not in stages and "selection" not in stages
+
+    def test_cancelled_sift_keeps_its_slot(self, monkeypatch):
+        _, peak = _slow_detection(monkeypatch, 0.2)
+
+        async def main():
+            semaphore = asyncio.Semaphore(1)
+            cancelled = Sifter(n_jobs=1).asift(make_synthetic(), semaphore=semaphore)
+            await asyncio.sleep(0.1)
+            cancelled.cancel()
+            run = Sifter(n_jobs=1).asift(make_synthetic(), semaphore=semaphore)
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            return await run
+
+        result = asyncio.run(main())
+        assert peak[0] == 1  # the next sift only started once the cancelled one's thread was done
+        assert result.selected_metrics
+
+    def test_semaphore_bounds_concurrency(self, monkeypatch):
+        _, peak = _slow_detection(monkeypatch, 0.02)
+
+        async def main():
+            semaphore = asyncio.Semaphore(1)
+            sifter = Sifter(n_jobs=1)
+            return await asyncio.gather(*(sifter.asift(make_synthetic(), semaphore=semaphore) for _ in range(3)))
+
+        results = asyncio.run(main())
+        assert peak[0] == 1
+        assert len({tuple(sorted(result.selected_metrics)) for result in results}) == 1
+
+    def test_requires_running_loop(self):
+        with pytest.raises(RuntimeError):
+            Sifter().asift(make_synthetic())
@@ -9,12 +9,15 @@ Covers the three configurable knobs added to the pipeline:
 All random data uses a fixed seed so the assertions are deterministic.
 """
 
+import math
+
 import numpy as np
 import pytest
 
 from metricsifter import Sifter
-from metricsifter.algo.detection import _estimate_sigma, detect_univariate_changepoints
-from metricsifter.types import SegmentCandidate
+from metricsifter.algo.detection import ChangePointStore, _estimate_sigma, detect_univariate_changepoints
+from metricsifter.algo.segmentation import cluster_change_point_store
+from metricsifter.types import SegmentCandidate, SegmentCandidateBatch
 from tests.conftest import make_synthetic
 
 
@@ -170,3 +173,106 @@ class TestCustomSegmentSelection:
         builtin = Sifter(segment_selection_method="max", n_jobs=1).sift(data)
         callable_ = Sifter(segment_selection_method=lambda c: float(len(c.metrics)), n_jobs=1).sift(data)
         assert builtin.selected_metrics == callable_.selected_metrics
+
+
+class TestBatchSegmentScoring:
+    """Vectorized built-in scores and the batch-scoring protocol."""
+
+    def test_builtin_scores_match_scalar_definitions(self):
+        batch = SegmentCandidateBatch.from_segments(
+            {0: {"a", "b"}, 1: {"b", "c", "d"}},
+            {"a": [10], "b": [10, 50], "c": [50, 52, 54], "d": [55]},
+            {0: [10], 1: [50, 52, 54, 55]},
+        )
+        max_scores = Sifter(segment_selection_method="max")._score_segments(batch)
+        weighted = Sifter(segment_selection_method="weighted_max")._score_segments(batch)
+
+        np.testing.assert_array_equal(max_scores, [2.0, 3.0])
+        np.testing.assert_allclose(weighted, [1.5, 0.5 + 1 / 3 + 1.0])
+
+    def test_weighted_scores_independent_of_metric_order(self):
+        metric_to_cps = {f"m{i}": list(range(i % 7 + 1)) for i in range(40)}
+        forward = {0: set(list(metric_to_cps)[:25]), 1: set(list(metric_to_cps)[15:])}
+        backward = {0: set(reversed(list(forward[0]))), 1: set(reversed(list(forward[1])))}  # noqa: C414
+        sifter = Sifter(segment_selection_method="weighted_max")
+
+        a = sifter._score_segments(SegmentCandidateBatch.from_segments(forward, metric_to_cps))
+        b = sifter._score_segments(
+            SegmentCandidateBatch.from_segments(backward, dict(reversed(list(metric_to_cps.items()))))
+        )
+        np.testing.assert_array_equal(a, b)
+
+    def test_weighted_scores_are_exact_sums(self):
+        # 1/3 + 1 and 1/6 + 1 + 1/6 are both 4/3, but adding the second in
+        # metric order rounds up in the last bit.
+        metric_to_cps = {"a": [10, 20, 30], "b": [15], "c": list(range(6)), "d": [50], "e": list(range(6, 12))}
+        batch = SegmentCandidateBatch.from_segments({0: {"a", "b"}, 1: {"c", "d", "e"}}, metric_to_cps)
+        sifter = Sifter(segment_selection_method="weighted_max")
+        scores = sifter._score_segments(batch)
+
+        assert 1 / 6 + 1.0 + 1 / 6 > 1 / 3 + 1.0
+        np.testing.assert_array_equal(scores, [math.fsum([1 / 3, 1.0]), math.fsum([1 / 6, 1.0, 1 / 6])])
+        assert scores[0] == scores[1]
+        # Exact ties go to the first segment.
+        assert sifter._select_by_scores({0: {"a", "b"}, 1: {"c", "d", "e"}}, batch, scores)[0] == 0
+
+    def test_weighted_scores_empty_batch(self):
+        batch = SegmentCandidateBatch.from_segments({}, {})
+        assert Sifter(segment_selection_method="weighted_max")._score_segments(batch).shape == (0,)
+
+    def test_batch_scorer_called_once_and_reused(self):
+        data = make_synthetic()
+
+        class CountingMax:
+            def __init__(self):
+                self.calls = 0
+
+            def score_batch(self, batch: SegmentCandidateBatch) -> np.ndarray:
+                self.calls += 1
+                return np.bincount(batch.member_segment, minlength=batch.n_segments)
+
+        scorer = CountingMax()
+        result = Sifter(segment_selection_method=scorer, n_jobs=1).sift(data)
+        builtin = Sifter(segment_selection_method="max", n_jobs=1).sift(data)
+
+        assert scorer.calls == 1
+        assert result.selected_metrics == builtin.selected_metrics
+        assert [seg.score for seg in result.segments] == [seg.score for seg in builtin.segments]
+
+    def test_batch_scorer_wrong_length_rejected(self):
+        class Broken:
+            def score_batch(self, batch):
+                return [1.0]
+
+        with pytest.raises(ValueError, match="one score per segment"):
+            Sifter(segment_selection_method=Broken(), n_jobs=1).sift(make_synthetic())
+
+    def test_candidates_view_matches_batch(self):
+        batch = SegmentCandidateBatch.from_segments(
+            {3: {"a"}, 7: {"a", "b"}}, {"a": [5, 40], "b": [42]}, {3: [5], 7: [42, 40]}
+        )
+        candidates = batch.candidates()
+
+        assert [c.label for c in candidates] == [3, 7]
+        assert candidates[1].metrics == frozenset({"a", "b"})
+        assert candidates[1].change_points == [40, 42]
+        assert candidates[1].metric_to_cps == {"a": [5, 40], "b": [42]}
+
+    def test_batch_from_store_matches_from_segments(self):
+        store = ChangePointStore.from_lists(["a", "b", "c", "d"], [[5, 40], [42], [], [44, 90]])
+        labels, member_ids, label_to_cps = cluster_change_point_store(store, 100, kde_bandwidth=2.5)
+        label_to_metrics = {int(label): {store.metrics[m] for m in ids} for label, ids in zip(labels, member_ids)}
+        from_store = SegmentCandidateBatch.from_store(store, labels, member_ids, label_to_cps)
+        from_segments = SegmentCandidateBatch.from_segments(label_to_metrics, store.metric_to_cps, label_to_cps)
+
+        for method in ["max", "weighted_max"]:
+            sifter = Sifter(segment_selection_method=method)
+            np.testing.assert_array_equal(sifter._score_segments(from_store), sifter._score_segments(from_segments))
+        assert from_store.candidates() == from_segments.candidates()
+
+    def test_selection_reads_the_store_arrays(self):
+        store = ChangePointStore.from_lists(["a", "b", "c"], [[5, 40], [42], [44]])
+        segmented = Sifter(segment_selection_method="weighted_max")._segment(store, 100)
+
+        assert segmented.remained_metrics == {"a", "b", "c"}
+        assert "metric_to_cps" not in vars(store)
@@ -13,15 +13,28 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from metricsifter import Sifter, SifterTransformer
+from metricsifter import ExecutionOptions, Sifter, SifterTransformer
 from metricsifter.algo.detection import (
     PENALTY_ADJUST_FALLBACK,
     PENALTY_ADJUST_GRID,
+    ChangePointStore,
+    _adjacent_matched_counts,
     _univariate_penalty_path,
     detect_univariate_changepoints,
     select_penalty_adjust,
 )
-from metricsifter.algo.segmentation import BANDWIDTH_FALLBACK, select_bandwidth
+from metricsifter.algo.segmentation import (
+    BANDWIDTH_FALLBACK,
+    ScaleSpace,
+    _batched_kde_minima,
+    _mean_pairwise_jaccard,
+    _pack_bitsets,
+    _resample_histograms,
+    _segments_from_minima,
+    _unpack_bitsets,
+    segment_nested_changepoints,
+    select_bandwidth,
+)
 from metricsifter.types import SiftResult
 from tests.conftest import make_synthetic
 
@@ -257,6 +270,162 @@ class TestBandwidthSelectionUnit:
         assert any(n >= 2 for n in diag["n_segments"])
         assert resolved in diag["grid"]
 
+    def test_batched_segmentation_matches_statsmodels(self):
+        """The batched path must reproduce segment_nested_changepoints."""
+        metric_to_cps = {"a": [10, 12], "b": [11, 47], "c": [45, 48, 80], "d": [83]}
+        metrics = sorted(metric_to_cps)
+        flatten = [cp for cps in metric_to_cps.values() for cp in cps]
+        cp_to_metrics: dict[int, list[str]] = {}
+        for metric, cps in metric_to_cps.items():
+            for cp in cps:
+                cp_to_metrics.setdefault(cp, []).append(metric)
+
+        store = ChangePointStore.from_lists(metrics, [metric_to_cps[metric] for metric in metrics])
+        cp_metric, cp_pos = store.metric_ids, store.positions
+        histograms = _resample_histograms(np.ones((1, len(metrics))), cp_metric, cp_pos, 100)
+        for h in (1.5, 2.5, 6.0):
+            expected_metrics, expected_cps = segment_nested_changepoints(flatten, cp_to_metrics, 100, kde_bandwidth=h)
+            minima = _batched_kde_minima(histograms, h)
+            labels, members, label_to_cps = _segments_from_minima(minima[0], cp_metric, cp_pos, len(metrics))
+            assert labels.tolist() == list(label_to_cps)
+            assert [{metrics[i] for i in ids} for ids in _unpack_bitsets(members)] == list(expected_metrics.values())
+            assert [cps.tolist() for cps in label_to_cps.values()] == [
+                cps.tolist() for cps in expected_cps.values() if len(cps) > 0
+            ]
+
+    @pytest.mark.parametrize(
+        "change_points, length, h",
+        [
+            ([100, 101, 500, 502], 1000, 2.5),  # underflowed tails between the clusters
+            (np.random.default_rng(11).integers(0, 300, size=90).tolist(), 300, 1.0),
+            (np.random.default_rng(11).integers(0, 300, size=90).tolist(), 300, 7.0),
+        ],
+    )
+    def test_resamples_share_the_full_data_estimator(self, change_points, length, h):
+        """A resample identical to the full data has exactly the full data's minima."""
+        histograms = np.zeros((3, length))
+        np.add.at(histograms, (slice(None), change_points), 1.0)
+        expected = _batched_kde_minima(histograms[:1], h)[0]
+        for row in _batched_kde_minima(histograms, h):
+            np.testing.assert_array_equal(row, expected)
+        # Away from exact ties, it also has the minima of the full data's ScaleSpace.
+        np.testing.assert_array_equal(np.flatnonzero(expected), ScaleSpace(change_points, length).minima(h))
+
+    def test_point_on_first_minimum_joins_the_right_cluster(self):
+        """The leftmost cluster is ``x < first minimum``, as in segment_changepoints_with_kde."""
+        store = ChangePointStore.from_lists(["left", "middle", "right"], [[10, 11], [20], [29, 30]])
+        minima = np.zeros(40, dtype=bool)
+        minima[[20, 25]] = True
+        labels, members, label_to_cps = _segments_from_minima(minima, store.metric_ids, store.positions, 3)
+        assert labels.tolist() == [0, 1, 2]
+        assert [ids.tolist() for ids in _unpack_bitsets(members)] == [[0], [1], [2]]
+        assert {label: cps.tolist() for label, cps in label_to_cps.items()} == {0: [10, 11], 1: [20], 2: [29, 30]}
+
+    def test_resample_histograms_count_multiplicity(self):
+        metrics = ["a", "b"]
+        store = ChangePointStore.from_lists(metrics, [[1, 3], [3]])
+        cp_metric, cp_pos = store.metric_ids, store.positions
+        weights = np.array([[1.0, 1.0], [2.0, 0.0], [0.0, 3.0]])
+        histograms = _resample_histograms(weights, cp_metric, cp_pos, 5)
+        np.testing.assert_array_equal(histograms, [[0, 1, 0, 2, 0], [0, 2, 0, 2, 0], [0, 0, 0, 3, 0]])
+
+    def test_bitset_jaccard_matches_set_jaccard(self):
+        rng = np.random.default_rng(0)
+        n_metrics = 150  # spans three 64-bit words
+        sets = [set(rng.choice(n_metrics, size=rng.integers(0, 20), replace=False).tolist()) for _ in range(12)]
+        sets.append(set())
+        sets.append(set())
+        rows = np.repeat(np.arange(len(sets)), [len(s) for s in sets])
+        bits = np.array([m for s in sets for m in sorted(s)], dtype=np.int64)
+        bitsets = _pack_bitsets(rows, bits, len(sets), n_metrics)
+
+        assert [set(ids.tolist()) for ids in _unpack_bitsets(bitsets)] == sets
+        expected = [len(a & b) / len(a | b) if a | b else 1.0 for i, a in enumerate(sets) for b in sets[i + 1 :]]
+        assert _mean_pairwise_jaccard(bitsets) == pytest.approx(np.mean(expected))
+
+
+class TestBootstrapEarlyStopping:
+    @staticmethod
+    def _scattered_change_points():
+        rng = np.random.default_rng(3)
+        metric_to_cps = {
+            f"m{i}": sorted(set(rng.integers(0, 300, size=rng.integers(1, 4)).tolist())) for i in range(60)
+        }
+        flatten = [cp for cps in metric_to_cps.values() for cp in cps]
+        cp_to_metrics: dict[int, list[str]] = {}
+        for metric, cps in metric_to_cps.items():
+            for cp in cps:
+                cp_to_metrics.setdefault(cp, []).append(metric)
+        return flatten, cp_to_metrics, metric_to_cps
+
+    def test_fixed_bootstrap_reports_full_resamples(self):
+        flatten, cp_to_metrics, metric_to_cps = self._scattered_change_points()
+        selector = Sifter(n_jobs=1).select_largest_segment_with_label
+        _, diag = select_bandwidth(flatten, cp_to_metrics, metric_to_cps, 300, selector, random_state=0)
+        assert diag["n_resamples"] == [20 if s is not None else 0 for s in diag["stability"]]
+
+    def test_dominated_candidates_stop_early(self):
+        flatten, cp_to_metrics, metric_to_cps = self._scattered_change_points()
+        selector = Sifter(n_jobs=1).select_largest_segment_with_label
+        full, full_diag = select_bandwidth(flatten, cp_to_metrics, metric_to_cps, 300, selector, random_state=0)
+        early, diag = select_bandwidth(
+            flatten, cp_to_metrics, metric_to_cps, 300, selector, random_state=0, early_stopping=True
+        )
+
+        assert early == full
+        assert all(0 < n <= 20 for n, s in zip(diag["n_resamples"], diag["stability"]) if s is not None)
+        assert sum(diag["n_resamples"]) < sum(full_diag["n_resamples"])
+        # A candidate that ran to the cap used the same resamples, hence the same score.
+        for n, score, full_score in zip(diag["n_resamples"], diag["stability"], full_diag["stability"]):
+            if n == 20:
+                assert score == full_score
+
+    def test_sifter_reports_resamples_used(self):
+        result = Sifter(bandwidth="auto", random_state=0, n_jobs=1, bootstrap_early_stopping=True).sift(
+            make_two_bursts()
+        )
+        tuning = result.bandwidth_tuning
+        assert len(tuning.n_resamples) == len(tuning.grid)
+        assert SiftResult.from_json(result.to_json()).bandwidth_tuning.n_resamples == tuning.n_resamples
+        assert result.selected_metrics == frozenset(f"dense_{i}" for i in range(8))
+
+
+class TestParallelTuning:
+    def test_bandwidth_tuning_is_independent_of_worker_count(self):
+        flatten, cp_to_metrics, metric_to_cps = TestBootstrapEarlyStopping._scattered_change_points()
+        selector = Sifter(n_jobs=1).select_largest_segment_with_label
+        for early_stopping in (False, True):
+            serial = select_bandwidth(
+                flatten, cp_to_metrics, metric_to_cps, 300, selector, random_state=0, early_stopping=early_stopping
+            )
+            parallel = select_bandwidth(
+                flatten,
+                cp_to_metrics,
+                metric_to_cps,
+                300,
+                selector,
+                random_state=0,
+                early_stopping=early_stopping,
+                n_jobs=2,
+            )
+            assert parallel == serial
+
+    def test_sifter_n_jobs_does_not_change_auto_bandwidth(self):
+        data = make_two_bursts()
+        serial = Sifter(bandwidth="auto", random_state=0, n_jobs=1).sift(data)
+        parallel = Sifter(
+            bandwidth="auto", random_state=0, n_jobs=2, execution=ExecutionOptions(parallelism="fixed")
+        ).sift(data)
+        assert parallel.bandwidth_tuning == serial.bandwidth_tuning
+        assert parallel.selected_metrics == serial.selected_metrics
+
+    def test_precomputed_matched_counts_match_plateau_search(self):
+        paths = [[[50 + (g % 2)] for g in range(len(PENALTY_ADJUST_GRID))] for _ in range(3)]
+        matched = [_adjacent_matched_counts(path, tolerance=1) for path in paths]
+        assert select_penalty_adjust(paths, series_length=100, matched_counts=matched) == select_penalty_adjust(
+            paths, series_length=100
+        )
+
 
 class TestSerializationAndIntegration:
     def test_tuning_reports_round_trip_through_json(self):
@@ -0,0 +1,142 @@
+"""
+Test suites for deadlines, cooperative cancellation and partial results (metricsifter.cancellation)
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricsifter import CancellationToken, ExecutionOptions, Sifter, SiftResult, parallel
+from metricsifter.algo import detection
+from tests.conftest import make_synthetic, report
+
+
+def _cancel_after(monkeypatch, token, n_calls, name="detect_univariate_changepoints"):
+    """Make the ``n_calls``-th per-metric detection cancel ``token``."""
+    original = getattr(detection, name)
+    calls = []
+
+    def counting(*args):
+        calls.append(args)
+        if len(calls) == n_calls:
+            token.cancel()
+        return original(*args)
+
+    monkeypatch.setattr(detection, name, counting)
+    return calls
+
+
+class TestCancellationToken:
+    def test_cancel_and_deadline(self):
+        token = CancellationToken()
+        assert not token.cancelled and token.remaining() is None
+        token.cancel()
+        assert token.cancelled and token.remaining() == 0.0
+
+        expiring = CancellationToken(timeout=0.01)
+        assert 0 < expiring.remaining() <= 0.01
+        time.sleep(0.02)
+        assert expiring.cancelled
+
+    def test_parent(self):
+        parent = CancellationToken(timeout=5.0)
+        child = CancellationToken(timeout=60.0, parent=parent)
+        assert child.remaining() <= 5.0
+        parent.cancel()
+        assert child.cancelled
+
+    def test_change_magnitude_scores(self):
+        data = make_synthetic()
+        scores = dict(zip(data.columns, detection.change_magnitude_scores(data)))
+        assert min(scores[f"failure_{i}"] for i in range(3)) > scores["noise"]
+        assert scores["unrelated"] > scores["noise"] and scores["flat_0"] == 0.0
+        with_gaps = pd.DataFrame({"a": [np.nan, 0.0, 0.0, 5.0, 5.0, np.nan], "b": [np.nan] * 6})
+        assert detection.change_magnitude_scores(with_gaps).tolist()[1] == 0.0
+
+
+class TestImapCancellable:
+    @pytest.mark.parametrize("use_executor", [False, True], ids=["joblib", "executor"])
+    def test_stops_dispatching(self, use_executor):
+        token = CancellationToken()
+        tasks = [(0.01 * (i + 1),) for i in range(20)]
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            results = []
+            for i, result in parallel.imap_cancellable(
+                time.sleep, tasks, token, executor=executor if use_executor else None
+            ):
+                results.append(i)
+                if len(results) == 2:
+                    token.cancel()
+        assert 2 <= len(results) < 5
+
+    def test_uncancelled_runs_everything(self):
+        results = dict(parallel.imap_cancellable(abs, [(-i,) for i in range(10)], CancellationToken()))
+        assert results == {i: i for i in range(10)}
+
+
+class TestPartialSift:
+    def test_uncancelled_token_matches_sift(self):
+        data = make_synthetic()
+        result = Sifter(n_jobs=1, execution=ExecutionOptions(deadline=60.0)).sift(
+            data, cancel_token=CancellationToken()
+        )
+        assert not result.partial and result.unprocessed_metrics == []
+        assert report(result) == report(Sifter(n_jobs=1).sift(data))
+
+    @pytest.mark.parametrize("kwargs", [{}, {"penalty_adjust": "auto"}], ids=["fixed", "auto"])
+    def test_strongest_metrics_detected_first(self, monkeypatch, kwargs):
+        data = make_synthetic()
+        expected = Sifter(n_jobs=1, **kwargs).sift(data)
+        token = CancellationToken()
+        name = "univariate_penalty_path_with_matches" if kwargs else "detect_univariate_changepoints"
+        _cancel_after(monkeypatch, token, 3, name)
+
+        result = Sifter(n_jobs=1, **kwargs).sift(data, cancel_token=token)
+        assert result.partial
+        assert set(result.unprocessed_metrics) == {"unrelated", "noise"}
+        assert result.unprocessed_metrics[0] == "unrelated"  # priority order
+        assert result.selected_metrics == expected.selected_metrics
+        assert result.timings["detection"].counts["unprocessed"] == 2
+        parts = [
+            result.selected_metrics,
+            result.filtered_no_change,
+            result.filtered_no_change_points,
+            result.filtered_out_of_segment,
+            frozenset(result.unprocessed_metrics),
+        ]
+        assert sum(len(part) for part in parts) == data.shape[1] and frozenset().union(*parts) == set(data.columns)
+
+    def test_expired_deadline(self):
+        data = make_synthetic()
+        result = Sifter(n_jobs=1, execution=ExecutionOptions(deadline=1e-9)).sift(data)
+        assert result.partial and result.selected_segment is None
+        assert len(result.unprocessed_metrics) == 5  # every metric passing STEP0
+        assert result.filtered_no_change == {f"flat_{i}" for i in range(6)}
+
+        restored = SiftResult.from_json(result.to_json())
+        assert restored.partial and restored.unprocessed_metrics == result.unprocessed_metrics
+        assert result.to_dict()["partial"] is True
+
+    def test_detect_and_resegment_stay_partial(self):
+        token = CancellationToken()
+        token.cancel()
+        sifter = Sifter(n_jobs=1)
+        detected = sifter.detect(make_synthetic(), cancel_token=token)
+        assert len(detected.unprocessed_metrics) == 5 and len(detected.columns) == 0
+        assert sifter.resegment(detected, bandwidth=5.0).partial
+
+    def test_checkpointed_chunks_resume(self, tmp_path):
+        data = make_synthetic()
+        token = CancellationToken()
+        token.cancel()
+        sifter = Sifter(n_jobs=1, checkpoint_dir=tmp_path)
+        assert sifter.sift(data, cancel_token=token).partial
+        # Nothing was recorded as a finished detection, so a rerun detects everything.
+        assert report(sifter.sift(data)) == report(Sifter(n_jobs=1).sift(data))
+
+    def test_invalid_deadline(self):
+        with pytest.raises(ValueError, match="deadline must be a positive number"):
+            ExecutionOptions(deadline=0)
@@ -0,0 +1,98 @@
+"""
+Test suites for stage checkpointing (metricsifter.checkpoint)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricsifter import Sifter
+from metricsifter import sifter as sifter_module
+from metricsifter.algo import detection
+from metricsifter.checkpoint import Checkpointer, fingerprint_frame, pack_penalty_paths, unpack_penalty_paths
+from tests.conftest import make_synthetic, report
+
+
+class TestCheckpointer:
+    def test_roundtrip_and_atomic_files(self, tmp_path):
+        checkpointer = Checkpointer(tmp_path / "ckpt")
+        assert checkpointer.load("stage", 1, np.arange(3)) is None
+
+        checkpointer.save({"values": np.arange(3)}, "stage", 1, np.arange(3))
+        saved = checkpointer.load("stage", 1, np.arange(3))
+        np.testing.assert_array_equal(saved["values"], [0, 1, 2])
+        assert checkpointer.load("stage", 2, np.arange(3)) is None
+        assert [path.suffix for path in (tmp_path / "ckpt").iterdir()] == [".npz"]
+
+    def test_fingerprint_tracks_values_and_names(self):
+        data = make_synthetic()
+        assert fingerprint_frame(data) == fingerprint_frame(data.copy())
+        changed = data.copy()
+        changed.iloc[3, 2] += 1.0
+        assert fingerprint_frame(changed) != fingerprint_frame(data)
+        assert fingerprint_frame(data.rename(columns={"noise": "other"})) != fingerprint_frame(data)
+
+    def test_penalty_paths_roundtrip(self):
+        results = [([[1, 5], [5], []], [0], [1, 0]), ([[], [], []], [], [0, 0]), ([[7], [7], [7]], [2, 9], [1, 1])]
+        assert unpack_penalty_paths(pack_penalty_paths(results, 3)) == results
+        assert unpack_penalty_paths(pack_penalty_paths([], 3)) == []
+
+
+class TestSifterCheckpointing:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"bandwidth": "auto", "penalty_adjust": "auto", "random_state": 0}],
+        ids=["fixed", "auto"],
+    )
+    def test_rerun_loads_every_stage(self, tmp_path, monkeypatch, kwargs):
+        data = make_synthetic(as_datetime=True)
+        expected = Sifter(n_jobs=1, **kwargs).sift(data)
+        first = Sifter(n_jobs=1, checkpoint_dir=tmp_path, **kwargs).sift(data)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("stage recomputed")
+
+        monkeypatch.setattr(Sifter, "_input_columns", fail)
+        monkeypatch.setattr(Sifter, "_detect_changepoints", fail)
+        monkeypatch.setattr(detection, "univariate_penalty_path_with_matches", fail)
+        if kwargs:
+            monkeypatch.setattr(sifter_module.segmentation, "select_bandwidth_for_store", fail)
+        second = Sifter(n_jobs=1, checkpoint_dir=tmp_path, **kwargs).sift(data)
+
+        assert report(first) == report(second) == report(expected)
+        pd.testing.assert_frame_equal(second.data, expected.data)
+
+    def test_interrupted_detection_resumes_per_chunk(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sifter_module, "_CHECKPOINT_CHUNK_SIZE", 2)
+        data = make_synthetic()
+        n_chunks = -(-len(Sifter._changing_columns(data)) // 2)
+        detect = Sifter._detect_changepoints
+        calls = []
+
+        killed = True
+
+        def recording(self, X, columns=None, recorder=None):
+            if killed and len(calls) == 2:
+                raise KeyboardInterrupt
+            calls.append(tuple(columns))
+            return detect(self, X, columns, recorder)
+
+        monkeypatch.setattr(Sifter, "_detect_changepoints", recording)
+        with pytest.raises(KeyboardInterrupt):
+            Sifter(n_jobs=1, checkpoint_dir=tmp_path).sift(data)
+        done = list(calls)
+
+        killed = False
+        calls.clear()
+        result = Sifter(n_jobs=1, checkpoint_dir=tmp_path).sift(data)
+
+        assert len(done) == 2 and len(calls) == n_chunks - 2
+        assert not set(done) & set(calls)
+        assert report(result) == report(Sifter(n_jobs=1).sift(data))
+
+    def test_parameters_key_the_checkpoints(self, tmp_path):
+        data = make_synthetic()
+        Sifter(n_jobs=1, checkpoint_dir=tmp_path).sift(data)
+        result = Sifter(n_jobs=1, checkpoint_dir=tmp_path, penalty_adjust=8.0).sift(data)
+
+        assert report(result) == report(Sifter(n_jobs=1, penalty_adjust=8.0).sift(data))
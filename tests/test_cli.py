@@ -45,8 +45,28 @@ class TestRun:
             "selected_segment",
             "penalty_tuning",
             "bandwidth_tuning",
+            "execution_plan",
+            "partial",
+            "coverage",
+            "unprocessed_metrics",
+            "timings",
         }
 
+    def test_checkpoint_dir(self, tmp_path, input_csv):
+        ckpt = tmp_path / "ckpt"
+        argv = ["run", str(input_csv), "--output", str(tmp_path / "out.csv"), "--index-col", "0"]
+        assert cli.main(argv + ["--checkpoint-dir", str(ckpt)]) == cli.EXIT_OK
+        first = sorted(path.name for path in ckpt.iterdir())
+        assert cli.main(argv + ["--checkpoint-dir", str(ckpt)]) == cli.EXIT_OK
+
+        assert first and sorted(path.name for path in ckpt.iterdir()) == first
+
+    def test_max_memory(self, tmp_path, capsys, input_csv):
+        argv = ["run", str(input_csv), "--output", str(tmp_path / "out.csv"), "--index-col", "0"]
+        assert cli.main(argv + ["--max-memory", "1GiB", "--memory-profile"]) == cli.EXIT_OK
+        assert cli.main(argv + ["--max-memory", "1KB"]) == cli.EXIT_MEMORY_BUDGET
+        assert "No execution plan fits" in capsys.readouterr().err
+
     def test_stdout_when_no_output(self, capsys, input_csv):
         code = cli.main(["run", str(input_csv), "--index-col", "0", "--n-jobs", "1"])
         assert code == cli.EXIT_OK
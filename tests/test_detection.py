@@ -7,6 +7,8 @@ import pandas as pd
 import pytest
 
 from metricsifter.algo.detection import (
+    NO_CHANGE_POINTS,
+    ChangePointStore,
     _detect_changepoints_with_missing_values,
     detect_multi_changepoints,
     detect_univariate_changepoints,
@@ -217,3 +219,55 @@ class TestDetectMultiChangepoints:
 
         assert len(flatten_cps) == 0
         assert len(metric_to_cps) == 0
+
+
+class TestChangePointStore:
+    """Test the CSR change point store and its compatibility views"""
+
+    @pytest.fixture
+    def store(self):
+        return ChangePointStore.from_lists(["a", "b", "c", "d"], [[10, 50], [], [50], None])
+
+    def test_layout(self, store):
+        """Offsets delimit each metric's change points"""
+        np.testing.assert_array_equal(store.offsets, [0, 2, 2, 3, 3])
+        np.testing.assert_array_equal(store.positions, [10, 50, 50])
+        assert store.positions.dtype == np.int32
+        np.testing.assert_array_equal(store.counts, [2, 0, 1, 0])
+        np.testing.assert_array_equal(store.metric_ids, [0, 0, 2])
+        np.testing.assert_array_equal(store.change_points("a"), [10, 50])
+
+    def test_dict_views(self, store):
+        """Lazy views reproduce the legacy dict-of-lists aggregates"""
+        assert store.flatten_change_points == [10, 50, 50]
+        # "d" was not detected (None): it has no change points but no metric_to_cps entry.
+        assert store.metric_to_cps == {"a": [10, 50], "b": [], "c": [50]}
+        assert dict(store.cp_to_metrics) == {10: ["a"], 50: ["a", "c"], NO_CHANGE_POINTS: ["b", "d"]}
+        assert store.metric_to_cps is store.metric_to_cps
+
+    def test_incidence(self, store):
+        """The sparse incidence is the metric x time 0/1 matrix"""
+        incidence = store.incidence(60)
+
+        assert incidence.shape == (4, 60)
+        dense = incidence.toarray()
+        assert dense.sum() == 3
+        assert dense[0, 10] == dense[0, 50] == dense[2, 50] == 1
+
+    def test_invalid_offsets(self):
+        """Offsets inconsistent with the positions are rejected"""
+        with pytest.raises(ValueError, match="offsets"):
+            ChangePointStore(["a"], [0, 2], [10])
+
+    def test_take_and_concat(self, store):
+        """Stores are reordered and stacked without touching their dict views"""
+        taken = store.take([2, 0, 1, 3])
+        assert taken.metric_to_cps == {"c": [50], "a": [10, 50], "b": []}
+        np.testing.assert_array_equal(taken.detected, [True, True, True, False])
+
+        stacked = ChangePointStore.concat([taken, ChangePointStore.from_lists(["e"], [[5]])])
+        assert stacked.metrics == ("c", "a", "b", "d", "e")
+        np.testing.assert_array_equal(stacked.offsets, [0, 1, 3, 3, 3, 4])
+        np.testing.assert_array_equal(stacked.positions, [50, 10, 50, 5])
+        assert list(stacked.metric_to_cps) == ["c", "a", "b", "e"]
+        assert ChangePointStore.concat([]).n_metrics == 0
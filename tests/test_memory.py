@@ -0,0 +1,102 @@
+"""
+Test suites for memory budgets and per-stage memory profiling (metricsifter.memory)
+"""
+
+import pytest
+
+from metricsifter import ExecutionOptions, Sifter
+from metricsifter.algo import detection
+from metricsifter.memory import MemoryBudgetError, available_memory, estimate_memory, parse_memory, plan_memory
+from tests.conftest import make_synthetic, report
+
+
+class TestParseMemory:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(1024, 1024), ("2048", 2048), ("512MB", 512 * 10**6), ("1.5GiB", 3 << 29), ("800Mi", 800 << 20), ("4k", 4000)],
+    )
+    def test_sizes(self, value, expected):
+        assert parse_memory(value) == expected
+
+    @pytest.mark.parametrize("value", ["lots", "1 PB", "-5MB", 0])
+    def test_rejects(self, value):
+        with pytest.raises(ValueError):
+            parse_memory(value)
+
+
+class TestPlanMemory:
+    def test_estimate_shrinks_with_chunks_and_workers(self):
+        full = estimate_memory(50_000, 10_000, n_workers=8, spawns_workers=True)
+        assert estimate_memory(50_000, 10_000, n_workers=8, spawns_workers=True, chunk_size=1024) < full
+        assert estimate_memory(50_000, 10_000, n_workers=2, spawns_workers=True) < full
+        assert estimate_memory(50_000, 10_000, penalty_tuning=True, bandwidth_tuning=True) > estimate_memory(
+            50_000, 10_000
+        )
+
+    def test_prefers_chunking_over_fewer_workers(self):
+        generous = plan_memory("16GB", 50_000, 10_000, n_jobs=8)
+        assert (generous.n_jobs, generous.chunk_size) == (8, None)
+        chunked = plan_memory("2GB", 50_000, 10_000, n_jobs=8)
+        assert chunked.n_jobs == 8 and chunked.chunk_size is not None
+        assert chunked.estimate <= chunked.budget == 2 * 10**9
+
+    def test_drops_workers_then_fails(self):
+        plan = plan_memory("1GB", 50_000, 10_000, n_jobs=8)
+        assert plan.n_jobs < 8
+        assert plan_memory("1GB", 50_000, 10_000, n_jobs=8, fixed_workers=True).n_jobs == 8
+        with pytest.raises(MemoryBudgetError, match="No execution plan fits max_memory='1MB'"):
+            plan_memory("1MB", 50_000, 10_000, n_jobs=8)
+
+    def test_available_memory(self, monkeypatch):
+        assert available_memory() > 0
+
+        def unreadable(*args, **kwargs):
+            raise OSError
+
+        monkeypatch.setattr("builtins.open", unreadable)
+        assert available_memory() is None or available_memory() > 0  # the sysconf fallback
+
+
+class TestSifterMemoryBudget:
+    @pytest.mark.parametrize("kwargs", [{}, {"penalty_adjust": "auto"}], ids=["fixed", "auto"])
+    def test_chunked_plan_matches_unplanned(self, monkeypatch, kwargs):
+        monkeypatch.setattr("metricsifter.memory.CHUNK_SIZES", (2,))
+        data = make_synthetic(as_datetime=True)
+        length, n_metrics = data.shape
+        # Between the chunked and the unchunked estimate, so chunking is required.
+        budget = estimate_memory(n_metrics, length, chunk_size=2, penalty_tuning=bool(kwargs)) + 1
+        assert estimate_memory(n_metrics, length, penalty_tuning=bool(kwargs)) > budget
+
+        result = Sifter(n_jobs=1, execution=ExecutionOptions(max_memory=budget), **kwargs).sift(data)
+        plan = result.timings["memory_plan"].counts
+        assert plan["chunk_size"] == 2 and plan["estimate"] <= plan["budget"] == budget
+        assert result.timings["detection"].counts["chunks"] == 3
+        assert report(result) == report(Sifter(n_jobs=1, **kwargs).sift(data))
+
+    def test_fails_fast(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError("detection ran")
+
+        monkeypatch.setattr(detection, "detect_change_point_store", fail)
+        with pytest.raises(MemoryBudgetError):
+            Sifter(execution=ExecutionOptions(max_memory=1024)).sift(make_synthetic())
+        with pytest.raises(MemoryError):
+            Sifter(execution=ExecutionOptions(max_memory=1024)).detect(make_synthetic())
+
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError, match="Cannot parse memory size"):
+            ExecutionOptions(max_memory="a lot")
+
+
+class TestMemoryProfile:
+    def test_stages_report_memory(self):
+        result = Sifter(n_jobs=1, memory_profile=True).sift(make_synthetic())
+        for timing in result.timings.values():
+            assert timing.peak_memory is not None and timing.peak_memory >= 0
+            assert timing.max_rss is None or timing.max_rss > 0
+        assert result.timings["filter"].peak_memory > 0
+        assert result.to_dict()["timings"]["detection"]["peak_memory"] == result.timings["detection"].peak_memory
+
+    def test_off_by_default(self):
+        timings = Sifter(n_jobs=1).sift(make_synthetic()).timings
+        assert all(timing.peak_memory is None and timing.max_rss is None for timing in timings.values())
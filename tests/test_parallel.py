@@ -0,0 +1,436 @@
+"""
+Test suites for the warm worker pool (metricsifter.parallel)
+"""
+
+import copy
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricsifter import CancellationToken, ExecutionOptions, Sifter, parallel, planner
+from metricsifter.adapters import prometheus
+from metricsifter.algo import detection
+from metricsifter.parallel import ThreadPool, WorkerPool, map_tasks
+from tests.conftest import make_synthetic, report
+
+
+def _cached_searchers() -> list[tuple[str, str]]:
+    return sorted(detection._searchers.__dict__.get("cache", {}))
+
+
+def _power(base: int, exponent: int) -> int:
+    return base**exponent
+
+
+def _omp_num_threads(_=None) -> str | None:
+    return os.environ.get("OMP_NUM_THREADS")
+
+
+def _auto_threads(n_workers: int) -> int:
+    return parallel.threads_per_worker("auto", n_workers)
+
+
+def _sift_in_child() -> tuple[int, int]:
+    slow = planner.RuntimeModel(single={"pelt": (0.0, 1.0)}, path={"pelt": (0.0, 1.0)})
+    result = Sifter(n_jobs=4, execution=ExecutionOptions(runtime_model=slow, backend="threads")).sift(make_synthetic())
+    return parallel.cpu_budget(), result.timings["detection"].counts["workers"]
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with WorkerPool(max_workers=2, search_methods=("pelt", "binseg")) as pool:
+        yield pool
+
+
+class TestWorkerPool:
+    def test_workers_are_warm(self, pool):
+        assert pool.started
+        assert pool.startup_seconds > 0
+        searchers = [pool.submit(_cached_searchers).result() for _ in range(4)]
+        assert all(cached == [("binseg", "l2"), ("pelt", "l2")] for cached in searchers)
+
+    def test_map_tasks_keeps_order(self, pool):
+        tasks = [(i, 2) for i in range(50)]
+        assert map_tasks(_power, tasks, executor=pool) == [i**2 for i in range(50)]
+        assert map_tasks(_power, tasks, n_jobs=1) == [i**2 for i in range(50)]
+        assert map_tasks(_power, [], executor=pool) == []
+
+    def test_copy_shares_and_pickle_refuses(self, pool):
+        assert copy.deepcopy(pool) is pool
+        with pytest.raises(TypeError, match="cannot be pickled"):
+            pickle.dumps(pool)
+
+    def test_restart_after_shutdown(self):
+        pool = WorkerPool(max_workers=1, search_methods=())
+        assert not pool.started
+        assert pool.submit(_power, 3, 3).result() == 27
+        pool.shutdown()
+        assert not pool.started
+        assert pool.submit(_power, 2, 5).result() == 32
+        pool.shutdown()
+
+    def test_warns_when_some_workers_are_late(self, monkeypatch):
+        def first_answer_only(probes, timeout):
+            probes[0].result()
+            time.sleep(max(0.0, timeout))
+            return {probes[0]}, set(probes[1:])
+
+        monkeypatch.setattr(parallel, "_STARTUP_TIMEOUT", 1.0)
+        monkeypatch.setattr(parallel, "wait", first_answer_only)
+        pool = WorkerPool(max_workers=2, search_methods=())
+        with pytest.warns(RuntimeWarning, match="Only 1 of 2 pool workers started"):
+            pool.start()
+        assert pool.started
+        pool.shutdown()
+
+    def test_raises_when_no_worker_starts(self, monkeypatch):
+        def no_answer(probes, timeout):
+            time.sleep(timeout)
+            return set(), set(probes)
+
+        monkeypatch.setattr(parallel, "wait", no_answer)
+        monkeypatch.setattr(parallel, "_STARTUP_TIMEOUT", 0.5)
+        pool = WorkerPool(max_workers=1, search_methods=())
+        with pytest.raises(RuntimeError, match="No worker of the pool started"):
+            pool.start()
+        assert not pool.started
+
+
+class TestSifterWithPool:
+    def test_matches_serial(self, pool):
+        data = make_synthetic()
+        kwargs = {"bandwidth": "auto", "penalty_adjust": "auto", "random_state": 0}
+        serial = Sifter(n_jobs=1, **kwargs).sift(data)
+        pooled = Sifter(execution=ExecutionOptions(executor=pool, parallelism="fixed"), **kwargs).sift(data)
+
+        assert pooled.selected_metrics == serial.selected_metrics
+        assert pooled.metric_to_change_points == serial.metric_to_change_points
+        assert pooled.bandwidth_tuning == serial.bandwidth_tuning
+        assert pooled.timings["pool_startup"].counts == {"workers": 2}
+
+    def test_context_manager_owns_pool(self):
+        data = make_synthetic()
+        with Sifter(n_jobs=2, execution=ExecutionOptions(parallelism="fixed")) as sifter:
+            owned = sifter._owned_pool
+            assert owned is not None and owned.started
+            first = sifter.sift(data)
+            second = sifter.sift(data)
+        assert sifter._owned_pool is None
+        assert not owned.started
+
+        assert first.timings["pool_startup"].wall < 0.5  # warmed up on entering the block
+        assert second.selected_metrics == Sifter(n_jobs=1).sift(data).selected_metrics
+
+    def test_startup_reported_by_first_sift(self):
+        pool = WorkerPool(max_workers=1, search_methods=())
+        try:
+            result = Sifter(execution=ExecutionOptions(executor=pool)).sift(make_synthetic())
+        finally:
+            pool.shutdown()
+        assert result.timings["pool_startup"].wall >= pool.startup_seconds > 0
+        assert result.to_dict()["timings"]["pool_startup"] == result.timings["pool_startup"].to_dict()
+
+    def test_sifter_pickles_without_executor(self, pool):
+        sifter = pickle.loads(pickle.dumps(Sifter(execution=ExecutionOptions(executor=pool))))
+        assert sifter.execution.executor is None
+
+
+class TestThreadPool:
+    def test_matches_serial(self):
+        data = make_synthetic()
+        with ThreadPool(max_workers=2, search_methods=("pelt",)) as threads:
+            assert threads.max_workers == 2
+            assert threads.submit(_cached_searchers).result() == [("pelt", "l2")]
+            result = Sifter(execution=ExecutionOptions(executor=threads, parallelism="fixed")).sift(data)
+            assert copy.deepcopy(threads) is threads
+            with pytest.raises(TypeError, match="cannot be pickled"):
+                pickle.dumps(threads)
+        assert report(result) == report(Sifter(n_jobs=1).sift(data))
+
+    def test_column_blocks_match_per_column_detection(self):
+        data = make_synthetic()
+        columns = Sifter._changing_columns(data)[::-1]
+        args = ("pelt", "l2", "bic", 2.0)
+        expected = detection.detect_change_point_store(data, *args, n_jobs=1, columns=columns)
+        with ThreadPool(max_workers=2) as threads:
+            blocked = detection.detect_change_point_store(data, *args, columns=columns, executor=threads)
+        assert blocked.metrics == tuple(data.columns[columns])
+        assert blocked.metric_to_cps == {metric: expected.metric_to_cps[metric] for metric in blocked.metrics}
+
+
+class _Concurrency:
+    """A task that records how many of its calls run at once."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = self.peak = 0
+
+    def __call__(self, x: int) -> int:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        return x * x
+
+
+class TestPlainExecutor:
+    @pytest.mark.parametrize("runner", ["map_tasks", "imap_unordered", "imap_cancellable"])
+    def test_submissions_capped_at_n_jobs(self, runner):
+        task, tasks = _Concurrency(), [(x,) for x in range(40)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            if runner == "map_tasks":
+                results = dict(enumerate(map_tasks(task, tasks, n_jobs=2, executor=executor)))
+            elif runner == "imap_unordered":
+                results = dict(parallel.imap_unordered(task, tasks, n_jobs=2, executor=executor))
+            else:
+                results = dict(parallel.imap_cancellable(task, tasks, CancellationToken(), n_jobs=2, executor=executor))
+        assert results == {x: x * x for x in range(40)}
+        assert task.peak == 2
+
+    def test_sift_reports_the_workers_it_runs_on(self):
+        data = make_synthetic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            result = Sifter(n_jobs=2, execution=ExecutionOptions(executor=executor, parallelism="fixed")).sift(data)
+        assert result.timings["detection"].counts["workers"] == 2
+        assert report(result) == report(Sifter(n_jobs=1).sift(data))
+
+
+class TestBackends:
+    def test_resolve(self, monkeypatch):
+        assert parallel.resolve_backend("threads") == "threads"
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+        assert not parallel.gil_disabled() and parallel.resolve_backend("auto") == "processes"
+        monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+        assert parallel.gil_disabled() and parallel.resolve_backend("auto") == "threads"
+        with pytest.raises(ValueError, match="backend='mpi' is not supported"):
+            ExecutionOptions(backend="mpi")
+
+    def test_threads_match_serial(self, monkeypatch):
+        data = make_synthetic()
+        original = detection.detect_univariate_changepoints
+        threads = set()
+
+        def recording(*args):
+            threads.add(threading.get_ident())  # only seen when detection runs in this process
+            return original(*args)
+
+        monkeypatch.setattr(detection, "detect_univariate_changepoints", recording)
+        kwargs = {"bandwidth": "auto", "random_state": 0}
+        result = Sifter(n_jobs=2, execution=ExecutionOptions(backend="threads", parallelism="fixed"), **kwargs).sift(
+            data
+        )
+        assert threads
+        assert report(result) == report(Sifter(n_jobs=1, **kwargs).sift(data))
+
+    def test_threaded_filter(self, monkeypatch):
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(30, 40))
+        values[:, ::3] = 1.0
+        monkeypatch.setattr("metricsifter.sifter._FILTER_BLOCK_SIZE", 60)
+        np.testing.assert_array_equal(Sifter._has_changes(values, n_threads=4), Sifter._has_changes(values))
+        assert Sifter(n_jobs=3, execution=ExecutionOptions(backend="threads"))._filter_threads() == 3
+        assert Sifter(n_jobs=3, execution=ExecutionOptions(backend="processes"))._filter_threads() == 1
+
+    def test_context_manager_owns_threads(self):
+        with Sifter(n_jobs=2, execution=ExecutionOptions(backend="threads")) as sifter:
+            assert isinstance(sifter._owned_pool, ThreadPool)
+            assert sifter._filter_threads() == 2
+            result = sifter.sift(make_synthetic())
+        assert "pool_startup" not in result.timings
+
+    def test_searchers_are_per_thread(self):
+        filters = list(warnings.filters)
+        barrier = threading.Barrier(4)
+
+        def build(_):
+            barrier.wait()
+            return detection._build_searcher("bottomup", "rbf")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            searchers = list(executor.map(build, range(4)))
+        assert len({id(searcher) for searcher in searchers}) == 4
+        assert warnings.filters == filters
+
+
+class TestNativeThreads:
+    def test_policy(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        assert parallel.threads_per_worker("auto", 2) == 4
+        assert parallel.threads_per_worker("auto", 16) == 1
+        assert parallel.threads_per_worker(3, 8) == 3 and parallel.threads_per_worker(None, 8) is None
+        for policy in (0, "all", 1.5):
+            with pytest.raises(ValueError, match="threads_per_worker must be"):
+                ExecutionOptions(threads_per_worker=policy)
+
+    def test_auto_policy_in_child_processes(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        for var in (*parallel.THREAD_LIMIT_VARS, parallel.WORKER_ENV_VAR):
+            monkeypatch.delenv(var, raising=False)
+        with multiprocessing.get_context("fork").Pool(1) as child:
+            assert child.apply(_auto_threads, (2,)) == 4
+        with WorkerPool(max_workers=1, search_methods=(), threads_per_worker=None) as pool:
+            assert pool.submit(_auto_threads, 2).result() == 1
+
+    def test_worker_processes_are_limited(self):
+        with WorkerPool(max_workers=2, search_methods=(), threads_per_worker=3) as pool:
+            assert pool.submit(_omp_num_threads).result() == "3"
+        with parallel.backend_config("processes", threads_per_worker=2):
+            assert map_tasks(_omp_num_threads, [(i,) for i in range(2)], n_jobs=2) == ["2", "2"]
+
+    def test_process_workers_sized_per_stage(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        with parallel.worker_threads("auto"):
+            assert map_tasks(_omp_num_threads, [(i,) for i in range(2)], n_jobs=2) == ["4", "4"]
+            assert map_tasks(_omp_num_threads, [(i,) for i in range(4)], n_jobs=4) == ["2"] * 4
+
+    def test_thread_workers_lower_shared_pools_on_request(self, monkeypatch):
+        threadpoolctl = pytest.importorskip("threadpoolctl")
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        original = detection.detect_univariate_changepoints
+        seen = set()
+
+        def recording(*args):
+            seen.update(info["num_threads"] for info in threadpoolctl.threadpool_info())
+            return original(*args)
+
+        monkeypatch.setattr(detection, "detect_univariate_changepoints", recording)
+        with threadpoolctl.threadpool_limits(8):
+            execution = ExecutionOptions(backend="threads", parallelism="fixed")
+            Sifter(n_jobs=4, execution=execution).sift(make_synthetic())
+            assert seen == {8}  # "auto" leaves the process-wide pools alone
+            seen.clear()
+            Sifter(n_jobs=4, execution=replace(execution, threads_per_worker=2)).sift(make_synthetic())
+            assert seen == {2}
+            with parallel.native_thread_limit(3):
+                with parallel.native_thread_limit(5):  # the lowest limit applies
+                    assert {info["num_threads"] for info in threadpoolctl.threadpool_info()} == {3}
+                assert {info["num_threads"] for info in threadpoolctl.threadpool_info()} == {3}
+            assert {info["num_threads"] for info in threadpoolctl.threadpool_info()} == {8}
+
+    def test_nested_budget(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        with parallel.sift_budget() as budget, parallel.sift_budget() as inner:  # a sift entered from a sift
+            assert budget == inner == parallel.cpu_budget() == 8
+
+        entered, release = threading.Barrier(2), threading.Event()
+
+        def concurrent_sift(_):
+            with parallel.sift_budget() as budget:
+                entered.wait()
+                release.wait()
+                return budget
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            budgets = executor.map(concurrent_sift, range(2))
+            release.set()
+            assert sorted(budgets) == [4, 8]
+
+        # A worker process gets the share its parent gave it; a WorkerPool
+        # worker without one gets one CPU, any other child process all of them.
+        monkeypatch.setattr(parallel.multiprocessing, "parent_process", lambda: object())
+        for var in (*parallel.THREAD_LIMIT_VARS, parallel.WORKER_ENV_VAR):
+            monkeypatch.delenv(var, raising=False)
+        assert parallel.cpu_budget() == 8
+        monkeypatch.setenv(parallel.WORKER_ENV_VAR, "1")
+        assert parallel.cpu_budget() == 1
+        monkeypatch.setenv("OMP_NUM_THREADS", "2")
+        assert parallel.cpu_budget() == 2
+
+    def test_plain_child_process_keeps_its_cpus(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        for var in (*parallel.THREAD_LIMIT_VARS, parallel.WORKER_ENV_VAR):
+            monkeypatch.delenv(var, raising=False)
+        with multiprocessing.get_context("fork").Pool(1) as child:
+            budget, workers = child.apply(_sift_in_child)
+        assert budget == 8
+        assert workers == 4
+
+    def test_pool_worker_gets_one_cpu(self):
+        with WorkerPool(max_workers=1, search_methods=(), threads_per_worker=None) as pool:
+            assert pool.submit(parallel.cpu_budget).result() == 1
+
+    def test_nested_sift_stays_within_budget(self, monkeypatch):
+        monkeypatch.setattr(parallel, "available_cpus", lambda: 8)
+        slow = planner.RuntimeModel(single={"pelt": (0.0, 1.0)}, path={"pelt": (0.0, 1.0)})
+        sifter = Sifter(n_jobs=4, execution=ExecutionOptions(runtime_model=slow, backend="threads"))
+        assert sifter.sift(make_synthetic()).timings["detection"].counts["workers"] == 4
+        monkeypatch.setattr(parallel.multiprocessing, "parent_process", lambda: object())
+        monkeypatch.setenv("OMP_NUM_THREADS", "1")
+        assert sifter.sift(make_synthetic()).timings["detection"].counts["workers"] == 1
+
+
+def _frames() -> list[pd.DataFrame]:
+    base = make_synthetic()
+    flat = pd.DataFrame({"flat": np.ones(100), "ramp": np.arange(100.0)})
+    return [base, base.iloc[:, ::-1], flat, make_synthetic(as_datetime=True), base.iloc[:70]]
+
+
+class TestSiftMany:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"bandwidth": "auto", "penalty_adjust": "auto", "random_state": 0}],
+        ids=["fixed", "auto"],
+    )
+    def test_matches_sift_in_input_order(self, kwargs):
+        frames = _frames()
+        expected = [Sifter(n_jobs=1, **kwargs).sift(frame) for frame in frames]
+        results = Sifter(n_jobs=2, execution=ExecutionOptions(parallelism="fixed"), **kwargs).sift_many(frames)
+
+        assert [report(result) for result in results] == [report(result) for result in expected]
+        for result, reference in zip(results, expected):
+            pd.testing.assert_frame_equal(result.data, reference.data)
+
+    def test_as_completed_on_pool(self, pool):
+        frames = _frames()
+        expected = Sifter(n_jobs=1).sift_many(frames)
+        pairs = list(
+            Sifter(execution=ExecutionOptions(executor=pool, parallelism="fixed")).sift_many(
+                iter(frames), as_completed=True
+            )
+        )
+
+        assert sorted(i for i, _ in pairs) == list(range(len(frames)))
+        for i, result in pairs:
+            assert result.selected_metrics == expected[i].selected_metrics
+            assert {"pool_startup", "filter", "detection", "assembly"} <= set(result.timings)
+
+    def test_empty(self):
+        assert Sifter().sift_many([]) == []
+
+
+class TestSiftSharded:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"bandwidth": "auto", "penalty_adjust": "auto", "random_state": 0}],
+        ids=["fixed", "auto"],
+    )
+    def test_matches_unsharded(self, kwargs):
+        data = make_synthetic(as_datetime=True)
+        expected = Sifter(n_jobs=1, **kwargs).sift(data)
+        # Interleaved shards, with "noise" and "flat_5" left unmapped.
+        shards = {column: i % 3 for i, column in enumerate(data.columns) if column not in ("noise", "flat_5")}
+        result = Sifter(n_jobs=2, execution=ExecutionOptions(parallelism="fixed"), **kwargs).sift_sharded(data, shards)
+
+        assert report(result) == report(expected)
+        pd.testing.assert_frame_equal(result.data, expected.data)
+
+    def test_by_prometheus_labels(self, pool):
+        data = make_synthetic(as_datetime=True)
+        data.attrs[prometheus.METRIC_LABELS_ATTR] = {
+            column: {"__name__": column, "service": column.split("_")[0]} for column in data.columns
+        }
+        result = Sifter(execution=ExecutionOptions(executor=pool, parallelism="fixed")).sift_sharded(data, "service")
+
+        assert result.selected_metrics == Sifter().sift(data).selected_metrics
@@ -0,0 +1,199 @@
+"""
+Test suites for the runtime cost model and search_method="auto" (metricsifter.planner)
+"""
+
+import functools
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricsifter import ExecutionOptions, Sifter, cli, planner
+from metricsifter.algo import detection
+from metricsifter.memory import WORKER_OVERHEAD, MemoryBudgetError
+from metricsifter.planner import (
+    DEFAULT_RUNTIME_MODEL,
+    RuntimeModel,
+    benchmark_backends,
+    calibrate,
+    choose_plan,
+    choose_workers,
+    estimate_plans,
+    trimmed_lengths,
+)
+from metricsifter.types import ExecutionPlan, SiftResult
+from tests.conftest import make_synthetic, report
+
+
+class TestRuntimeModel:
+    def test_calibrate(self, tmp_path):
+        model = calibrate(lengths=(64, 128, 256), search_methods=("binseg", "pelt"), repeats=1)
+        assert set(model.single) == set(model.path) == {"binseg", "pelt"}
+        assert model.column_seconds("binseg", np.array([256])) > model.column_seconds("binseg", np.array([64])) > 0
+
+        path = tmp_path / "model.json"
+        model.save(path)
+        assert RuntimeModel.load(path) == model
+        with pytest.raises(ValueError, match="not calibrated"):
+            model.column_seconds("bottomup", np.array([64]))
+
+    def test_trimmed_lengths(self):
+        data = pd.DataFrame({"a": [np.nan, 1, np.nan, 2, np.nan], "b": [1.0] * 5, "c": [np.nan] * 5})
+        assert trimmed_lengths(data, np.arange(3)).tolist() == [3, 5, 0]
+
+    def test_penalty_paths_cost_more(self):
+        lengths = np.full(100, 1000)
+        for method in ("pelt", "binseg", "bottomup"):
+            assert DEFAULT_RUNTIME_MODEL.column_seconds(
+                method, lengths, penalty_tuning=True
+            ) > DEFAULT_RUNTIME_MODEL.column_seconds(method, lengths)
+
+
+class TestChoosePlan:
+    def test_estimate_plans_sorted(self):
+        plans = estimate_plans(np.full(500, 2000), 2000, worker_counts=(1, 2, 4))
+        assert len(plans) == 9
+        assert [plan.seconds for plan in plans] == sorted(plan.seconds for plan in plans)
+
+    def test_parallel_overhead_on_small_inputs(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+        small = estimate_plans(np.full(4, 100), 100, search_methods=("pelt",), worker_counts=(1, 8))
+        assert small[0].n_jobs == 1
+        large = estimate_plans(np.full(5000, 5000), 5000, search_methods=("pelt",), worker_counts=(1, 8))
+        assert large[0].n_jobs == 8
+        warm = estimate_plans(np.full(4, 100), 100, search_methods=("pelt",), worker_counts=(8,), warm_workers=True)
+        assert warm[0].seconds < small[-1].seconds
+
+    def test_reasons(self):
+        plans = [
+            ExecutionPlan("pelt", 4, seconds=1.0, memory=900),
+            ExecutionPlan("pelt", 1, seconds=3.0, memory=100),
+            ExecutionPlan("binseg", 2, seconds=2.0, memory=500),
+        ]
+        assert choose_plan(plans) == ExecutionPlan("pelt", 4, 1.0, 900, reason="fastest")
+        assert choose_plan(plans, max_memory=600).n_jobs == 2
+        assert choose_plan(plans, time_budget=2.5) == ExecutionPlan("binseg", 2, 2.0, 500, reason="time_budget")
+        assert choose_plan(plans, time_budget=0.5).reason == "over_time_budget"
+        with pytest.raises(MemoryBudgetError, match="No search plan fits"):
+            choose_plan(plans, max_memory=50)
+
+
+class TestAutoSearchMethod:
+    def test_runs_chosen_plan(self):
+        data = make_synthetic()
+        result = Sifter(search_method="auto", n_jobs=1).sift(data)
+        plan = result.execution_plan
+        assert plan.search_method in ("pelt", "binseg", "bottomup") and plan.n_jobs == 1
+        assert plan.reason == "fastest"
+        assert result.timings["search_plan"].counts == {"candidates": 3, "n_jobs": 1}
+        expected = report(Sifter(search_method=plan.search_method, n_jobs=1).sift(data))
+        assert report(result) == {**expected, "execution_plan": plan.to_dict()}
+        assert SiftResult.from_dict(result.to_dict()).execution_plan == plan
+
+    def test_estimate_cost(self):
+        data = make_synthetic()
+        plans = Sifter(search_method="auto", n_jobs=4).estimate_cost(data)
+        assert {(plan.search_method, plan.n_jobs) for plan in plans} == {
+            (method, n_jobs) for method in ("pelt", "binseg", "bottomup") for n_jobs in (1, 2, 4)
+        }
+        assert {plan.search_method for plan in Sifter(search_method="binseg").estimate_cost(data)} == {"binseg"}
+        assert Sifter().sift(data).execution_plan is None
+
+    def test_time_budget_and_saved_model(self, tmp_path):
+        path = tmp_path / "model.json"
+        DEFAULT_RUNTIME_MODEL.save(path)
+        sifter = Sifter(
+            search_method="auto", n_jobs=4, execution=ExecutionOptions(runtime_model=str(path), time_budget=1e6)
+        )
+        assert sifter.detect(make_synthetic()).execution_plan.n_jobs == 1
+
+    def test_other_entry_points(self):
+        frames = [make_synthetic(), make_synthetic()]
+        sifter = Sifter(search_method="auto", n_jobs=1)
+        assert all(result.execution_plan is not None for result in sifter.sift_many(frames))
+        data = make_synthetic()
+        shards = {column: column.split("_")[0] for column in data.columns}
+        assert sifter.sift_sharded(data, shards).execution_plan is not None
+        with pytest.raises(ValueError, match="Cannot sweep search_method='auto'"):
+            sifter.sweep(data, {"penalty_adjust": [1.0, 2.0]})
+
+    def test_cli(self, tmp_path):
+        input_csv = tmp_path / "input.csv"
+        make_synthetic().to_csv(input_csv)
+        model = tmp_path / "model.json"
+        assert cli.main(["calibrate", "--output", str(model), "--repeats", "1"]) == cli.EXIT_OK
+        assert set(RuntimeModel.load(model).single) == {"pelt", "binseg", "bottomup"}
+        report_json = tmp_path / "report.json"
+        argv = ["run", str(input_csv), "--index-col", "0", "--search-method", "auto", "--runtime-model", str(model)]
+        assert cli.main(argv + ["--output", str(tmp_path / "out.csv"), "--report", str(report_json)]) == cli.EXIT_OK
+        assert SiftResult.from_json(report_json.read_text()).execution_plan is not None
+
+
+class TestAdaptiveParallelism:
+    def test_choose_workers(self, monkeypatch):
+        monkeypatch.setattr("os.cpu_count", lambda: 8)
+        assert choose_workers(0.01, 50, (1, 2, 4, 8)) == 1
+        assert choose_workers(100.0, 500, (1, 2, 4, 8)) == 8
+        assert choose_workers(100.0, 500, (2, 4, 8), available_memory=5 * WORKER_OVERHEAD) == 4
+        assert choose_workers(100.0, 500, (8,), warm_workers=True, available_memory=0) == 8
+        assert choose_workers(0.5, 500, (8,), warm_workers=True, cpus=1) == 1
+        assert choose_workers(100.0, 3, (1, 2, 4, 8)) == 4  # no more useful workers than tasks
+
+    def test_small_frames_run_in_process(self, monkeypatch):
+        monkeypatch.setattr("metricsifter.parallel.available_cpus", lambda: 8)
+        data = make_synthetic()
+        original = detection.detect_univariate_changepoints
+        threads = set()
+
+        def recording(*args):
+            threads.add(threading.get_ident())
+            return original(*args)
+
+        monkeypatch.setattr(detection, "detect_univariate_changepoints", recording)
+        kwargs = {"bandwidth": "auto", "random_state": 0}
+        result = Sifter(n_jobs=8, **kwargs).sift(data)
+        assert threads == {threading.get_ident()}
+        assert result.timings["detection"].counts["workers"] == 1
+        assert result.timings["bandwidth_tuning"].counts["workers"] == 1
+        assert report(result) == report(Sifter(n_jobs=1, **kwargs).sift(data))
+        assert Sifter(n_jobs=8).sift_many([data])[0].timings["detection"].counts["workers"] == 1
+
+    def test_expensive_stages_go_parallel(self, monkeypatch):
+        monkeypatch.setattr("metricsifter.parallel.available_cpus", lambda: 8)
+        data = make_synthetic()
+        slow = RuntimeModel(single={"pelt": (0.0, 1.0)}, path={"pelt": (0.0, 1.0)}, bootstrap_seconds=1.0)
+        kwargs = {"bandwidth": "auto", "penalty_adjust": "auto", "random_state": 0}
+        result = Sifter(n_jobs=2, execution=ExecutionOptions(runtime_model=slow, backend="threads"), **kwargs).sift(
+            data
+        )
+        assert result.timings["detection"].counts["workers"] == 2
+        assert result.timings["bandwidth_tuning"].counts["workers"] == 2
+        assert report(result) == report(Sifter(n_jobs=1, **kwargs).sift(data))
+        # An uncalibrated search method keeps the configured workers.
+        binseg = Sifter(
+            search_method="binseg", n_jobs=2, execution=ExecutionOptions(runtime_model=slow, backend="threads")
+        ).detect(data)
+        assert binseg.timings["detection"].counts["workers"] == 2
+
+    def test_fixed_override(self):
+        data = make_synthetic()
+        result = Sifter(n_jobs=2, execution=ExecutionOptions(backend="threads", parallelism="fixed")).sift(data)
+        assert result.timings["detection"].counts["workers"] == 2
+        assert Sifter(n_jobs=1).sift(data).timings["detection"].counts["workers"] == 1
+        with pytest.raises(ValueError, match="parallelism='always' is not supported"):
+            ExecutionOptions(parallelism="always")
+
+
+class TestBenchmarkBackends:
+    def test_rows(self):
+        rows = benchmark_backends(shapes=((4, 64), (2, 128)), n_jobs=2, repeats=1)
+        assert [(row["n_metrics"], row["n_rows"]) for row in rows] == [(4, 64), (2, 128)]
+        assert all(row[name] > 0 for row in rows for name in ("serial", "processes", "threads"))
+
+    def test_cli(self, monkeypatch, capsys):
+        monkeypatch.setattr(planner, "benchmark_backends", functools.partial(benchmark_backends, shapes=((4, 64),)))
+        assert cli.main(["benchmark", "--n-jobs", "2", "--repeats", "1"]) == cli.EXIT_OK
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].split() == ["metrics", "rows", "serial", "processes", "threads"]
+        assert lines[1].split()[:2] == ["4", "64"]
@@ -88,6 +88,21 @@ class TestReverseLookup:
             prometheus.to_metric_labels(plain, "a")
 
 
+class TestShardByLabels:
+    def test_label_values_per_column(self):
+        df = prometheus.from_query_range(_matrix_response())
+        shards = prometheus.shard_by_labels(df, ["instance", "zone"])
+
+        assert shards == {
+            'cpu_usage{instance="node1",job="node"}': ("node1", None),
+            'cpu_usage{instance="node2",job="node"}': ("node2", None),
+        }
+
+    def test_requires_metadata(self):
+        with pytest.raises(KeyError):
+            prometheus.shard_by_labels(pd.DataFrame({"x": [1.0]}), ["instance"])
+
+
 class TestEdgeCases:
     def test_non_matrix_raises_value_error(self):
         response = {"data": {"resultType": "vector", "result": []}}
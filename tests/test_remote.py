@@ -0,0 +1,196 @@
+"""
+Test suites for the socket worker servers and their executor (metricsifter.remote)
+"""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import AuthenticationError
+from pathlib import Path
+
+import pytest
+
+from metricsifter import CancellationToken, ExecutionOptions, Sifter, SiftResult, cli, parallel
+from metricsifter.remote import RemoteExecutor, WorkerServer, parse_address
+from tests.conftest import make_synthetic, report
+
+AUTHKEY = b"metricsifter-tests"
+
+
+def _start_worker(*extra: str) -> tuple[subprocess.Popen, str]:
+    """A ``metricsifter worker`` process on a free local port, and its address."""
+    env = {**os.environ, cli.AUTHKEY_ENV: AUTHKEY.decode(), "PYTHONPATH": str(Path(__file__).parents[1])}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "metricsifter.cli", "worker", "--port", "0", *extra],
+        env=env,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline()
+    assert line.startswith("metricsifter worker listening on"), line
+    return process, line.split()[-1]
+
+
+@pytest.fixture(scope="module")
+def workers():
+    """Two worker processes, as on two hosts."""
+    started = [_start_worker() for _ in range(2)]
+    yield [address for _, address in started]
+    for process, _ in started:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+@pytest.fixture
+def local_server():
+    server = WorkerServer(authkey=AUTHKEY)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.close()
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def _fail(message: str) -> None:
+    raise KeyError(message)
+
+
+def _fail_unpicklable() -> None:
+    raise ValueError(threading.Lock())
+
+
+def _exit_worker() -> None:
+    os._exit(1)
+
+
+def _server_only_class() -> None:
+    raise ModuleNotFoundError("No module named 'server_only'")
+
+
+class _ServerOnlyResult:
+    """A result whose class only the server can import."""
+
+    def __reduce__(self):
+        return _server_only_class, ()
+
+
+def _return_server_only() -> _ServerOnlyResult:
+    return _ServerOnlyResult()
+
+
+class TestRemoteExecutor:
+    def test_sift_matches_serial(self, workers):
+        data = make_synthetic()
+        kwargs = {"penalty_adjust": "auto", "bandwidth": "auto", "random_state": 0}
+        with RemoteExecutor(workers, authkey=AUTHKEY) as executor:
+            assert executor.max_workers == 2
+            result = Sifter(execution=ExecutionOptions(executor=executor, parallelism="fixed"), **kwargs).sift(data)
+            detected = Sifter(execution=ExecutionOptions(executor=executor, parallelism="fixed")).detect(data)
+        assert report(result) == report(Sifter(n_jobs=1, **kwargs).sift(data))
+        assert result.timings["pool_startup"].counts == {"workers": 2}
+        assert detected.store.metric_to_cps == Sifter(n_jobs=1).detect(data).store.metric_to_cps
+
+    def test_submit_and_map(self, local_server):
+        with RemoteExecutor([local_server.address], authkey=AUTHKEY) as executor:
+            assert executor.submit(pow, 2, exp=10).result() == 1024
+            assert list(executor.map(pow, range(7), [2] * 7, chunksize=3)) == [i**2 for i in range(7)]
+            tasks = [(i, 1) for i in range(5)]
+            assert parallel.map_tasks(lambda a, b: a - b, tasks, executor=executor) == [-1, 0, 1, 2, 3]
+            with pytest.raises(KeyError, match="boom") as info:
+                executor.submit(_fail, "boom").result()
+            assert "_fail" in str(info.value.__cause__)  # the worker's traceback
+
+    def test_unpicklable_error(self, local_server):
+        with (
+            RemoteExecutor([local_server.address], authkey=AUTHKEY) as executor,
+            pytest.raises(RuntimeError, match="^ValueError: <unlocked _thread.lock") as info,
+        ):
+            executor.submit(_fail_unpicklable).result()
+        assert "_fail_unpicklable" in str(info.value.__cause__)
+
+    def test_unloadable_result(self, local_server):
+        with RemoteExecutor([local_server.address], authkey=AUTHKEY) as executor:
+            with pytest.raises(RuntimeError, match="^Cannot unpickle the reply") as info:
+                executor.submit(_return_server_only).result(timeout=60)
+            assert isinstance(info.value.__cause__, ModuleNotFoundError)
+            # The connection keeps serving tasks.
+            assert list(executor.map(abs, [-1, -2])) == [1, 2]
+
+    def test_broken_pool_error(self):
+        server = WorkerServer(authkey=AUTHKEY, max_workers=2, search_methods=())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with RemoteExecutor([server.address], authkey=AUTHKEY) as executor, pytest.raises(BrokenProcessPool):
+                executor.submit(_exit_worker).result(timeout=60)
+        finally:
+            server.close()
+            thread.join(timeout=30)
+
+    def test_cancellation(self, local_server):
+        token = CancellationToken()
+        with RemoteExecutor([local_server.address], authkey=AUTHKEY) as executor:
+            done = []
+            for i, _ in parallel.imap_cancellable(time.sleep, [(0.05,)] * 20, token, executor=executor):
+                done.append(i)
+                if len(done) == 2:
+                    token.cancel()
+        assert 2 <= len(done) < 5
+
+    def test_restart_copy_and_pickle(self, local_server):
+        executor = RemoteExecutor([f"{local_server.address[0]}:{local_server.address[1]}"], authkey=AUTHKEY)
+        assert not executor.started
+        assert executor.submit(abs, -3).result() == 3
+        executor.shutdown()
+        assert not executor.started
+        assert executor.submit(abs, -4).result() == 4
+        assert copy.deepcopy(executor) is executor
+        with pytest.raises(TypeError, match="cannot be pickled"):
+            pickle.dumps(executor)
+        executor.shutdown()
+
+    def test_wrong_authkey(self, local_server):
+        with pytest.raises(AuthenticationError):
+            RemoteExecutor([local_server.address], authkey=b"wrong").start()
+        with RemoteExecutor([local_server.address], authkey=AUTHKEY) as executor:  # the server carries on
+            assert executor.submit(abs, -1).result() == 1
+
+    def test_lost_server(self):
+        process, address = _start_worker()
+        executor = RemoteExecutor([address], authkey=AUTHKEY).start()
+        process.kill()
+        process.wait(timeout=30)
+        with pytest.raises(ConnectionError):
+            executor.submit(time.sleep, 0).result(timeout=30)
+        with pytest.raises(RuntimeError, match="connection is closed"):
+            executor.submit(abs, 1)
+        executor.shutdown()
+
+    def test_invalid_addresses(self):
+        assert parse_address("10.0.0.1:7075") == ("10.0.0.1", 7075)
+        with pytest.raises(ValueError, match="host:port"):
+            parse_address("10.0.0.1")
+        with pytest.raises(ValueError, match="at least one"):
+            RemoteExecutor([], authkey=AUTHKEY)
+
+
+class TestCli:
+    def test_run_on_remote_workers(self, workers, tmp_path, monkeypatch):
+        input_csv = tmp_path / "input.csv"
+        make_synthetic().to_csv(input_csv)
+        report_json = tmp_path / "report.json"
+        argv = ["run", str(input_csv), "--index-col", "0", "--output", str(tmp_path / "out.csv")]
+        monkeypatch.setenv(cli.AUTHKEY_ENV, AUTHKEY.decode())
+        assert cli.main(argv + ["--report", str(report_json), "--remote-workers", *workers]) == cli.EXIT_OK
+        assert SiftResult.from_json(report_json.read_text()).timings["pool_startup"].counts == {"workers": 2}
+
+    def test_requires_authkey(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.delenv(cli.AUTHKEY_ENV, raising=False)
+        assert cli.main(["worker", "--port", "0"]) == cli.EXIT_INPUT_ERROR
+        assert cli.AUTHKEY_ENV in capsys.readouterr().err
@@ -5,8 +5,11 @@ Test suites for segmentation module
 import numpy as np
 import pytest
 
-from metricsifter.algo.detection import NO_CHANGE_POINTS
+from metricsifter.algo.detection import NO_CHANGE_POINTS, ChangePointStore
 from metricsifter.algo.segmentation import (
+    ScaleSpace,
+    compute_kde_density,
+    segment_change_point_store,
     segment_changepoints_with_kde,
     segment_nested_changepoints,
 )
@@ -218,3 +221,108 @@ class TestSegmentNestedChangepoints:
 
         assert 'metric1' in all_metrics
         assert 'metric2' in all_metrics
+
+
+class TestScaleSpace:
+    """Test the memoized change-point scale space"""
+
+    @pytest.mark.parametrize('bandwidth', [2.5, 4.0, 'scott'])
+    def test_density_matches_statsmodels(self, bandwidth):
+        """Density equals the statsmodels KDE the segmentation was defined with, bit for bit"""
+        from statsmodels.nonparametric.kde import KDEUnivariate
+
+        rng = np.random.default_rng(0)
+        change_points = rng.integers(0, 200, size=80)
+        kde = KDEUnivariate(change_points)
+        kde.fit(kernel="gau", bw=bandwidth, fft=True)
+        expected = kde.evaluate(np.linspace(0, 199, 200))
+
+        np.testing.assert_array_equal(ScaleSpace(change_points, 200).density(bandwidth), expected)
+
+    def test_tied_valley_matches_statsmodels(self):
+        """A valley with a tied bottom splits exactly where the statsmodels KDE has a minimum"""
+        import scipy.signal
+        from statsmodels.nonparametric.kde import KDEUnivariate
+
+        change_points = [104, 77, 86, 199, 143, 195]  # 77 and 86 tie at 81 / 82
+        for order in (change_points, sorted(change_points), change_points[::-1]):
+            kde = KDEUnivariate(np.array(order))
+            kde.fit(kernel="gau", bw=2.5, fft=True)
+            expected = scipy.signal.argrelextrema(kde.evaluate(np.linspace(0, 199, 200)), np.less)[0]
+
+            np.testing.assert_array_equal(ScaleSpace(order, 200).minima(2.5), expected)
+
+    def test_memoizes_per_bandwidth(self):
+        """Density and minima are computed once per resolved bandwidth"""
+        scale_space = ScaleSpace([10, 11, 12, 50, 51, 52, 90], 100)
+
+        assert scale_space.density(3.0) is scale_space.density(3.0)
+        assert scale_space.minima(3.0) is scale_space.minima(3.0)
+        assert scale_space.density("scott") is scale_space.density(scale_space.bandwidth("scott"))
+
+    def test_order_invariant(self):
+        """Permuting the change points only moves the density in the last bits"""
+        change_points = [5, 5, 20, 21, 21, 60, 61, 62]
+        density = ScaleSpace(change_points, 80).density(2.5)
+
+        np.testing.assert_allclose(ScaleSpace(change_points[::-1], 80).density(2.5), density, rtol=1e-12)
+
+    def test_degenerate(self):
+        """A single unique position has no density and no minima"""
+        scale_space = ScaleSpace([7, 7, 7], 20)
+
+        assert scale_space.is_degenerate
+        assert scale_space.density(2.5) is None
+        assert len(scale_space.minima(2.5)) == 0
+        assert compute_kde_density([7, 7, 7], 20, scale_space=scale_space) is None
+
+    def test_shared_with_segmentation(self):
+        """Segmenting through a shared scale space gives the same clusters"""
+        change_points = [10, 11, 12, 50, 51, 52]
+        scale_space = ScaleSpace(change_points, 100)
+
+        _, shared = segment_changepoints_with_kde(change_points, 100, 2.5, scale_space=scale_space)
+        _, fresh = segment_changepoints_with_kde(change_points, 100, 2.5)
+
+        assert shared.keys() == fresh.keys()
+        for label in fresh:
+            np.testing.assert_array_equal(shared[label], fresh[label])
+
+
+class TestSegmentChangePointStore:
+    """Test segmentation directly on a ChangePointStore"""
+
+    @pytest.mark.parametrize("kde_bandwidth", [1.0, 2.5, "scott"])
+    def test_matches_nested_segmentation(self, kde_bandwidth):
+        """Same non-empty clusters as the dict-based segmentation"""
+        rng = np.random.default_rng(1)
+        metrics = [f"m{i}" for i in range(20)]
+        store = ChangePointStore.from_lists(
+            metrics, [sorted(set(rng.integers(0, 150, size=3).tolist())) for _ in metrics]
+        )
+
+        expected_metrics, expected_cps = segment_nested_changepoints(
+            store.flatten_change_points, store.cp_to_metrics, 150, kde_bandwidth=kde_bandwidth
+        )
+        label_to_metrics, label_to_cps = segment_change_point_store(store, 150, kde_bandwidth=kde_bandwidth)
+
+        assert label_to_metrics == {label: ms for label, ms in expected_metrics.items() if ms}
+        assert {label: cps.tolist() for label, cps in label_to_cps.items()} == {
+            label: cps.tolist() for label, cps in expected_cps.items() if len(cps)
+        }
+
+    def test_point_on_first_minimum(self):
+        """A change point on the first minimum only joins the cluster to its right"""
+        metrics = [f"left_{i}" for i in range(5)] + ["middle"] + [f"right_{i}" for i in range(5)]
+        store = ChangePointStore.from_lists(metrics, [[10]] * 5 + [[20]] + [[30]] * 5)
+        scale_space = ScaleSpace(store.positions, 50)
+        assert scale_space.minima(5.0).tolist() == [20]
+
+        _, expected_cps = segment_nested_changepoints(store.flatten_change_points, store.cp_to_metrics, 50, 5.0)
+        label_to_metrics, label_to_cps = segment_change_point_store(store, 50, 5.0, scale_space=scale_space)
+
+        assert "middle" not in label_to_metrics[0]
+        assert "middle" in label_to_metrics[1]
+        assert {label: cps.tolist() for label, cps in label_to_cps.items()} == {
+            label: cps.tolist() for label, cps in expected_cps.items() if len(cps)
+        }
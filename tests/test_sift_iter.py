@@ -0,0 +1,67 @@
+"""
+Test suites for progressive sifting (Sifter.sift_iter)
+"""
+
+import numpy as np
+import pytest
+
+from metricsifter import CancellationToken, Sifter
+from metricsifter.algo.segmentation import ScaleSpace
+from tests.conftest import make_synthetic, report
+
+
+class TestScaleSpaceExtended:
+    def test_matches_fresh_scale_space(self):
+        first, added = [10, 10, 12, 40], [11, 41, 41, 70]
+        space = ScaleSpace(first, 80)
+        space.density(2.5)
+        extended = space.extended(added)
+        fresh = ScaleSpace(first + added, 80)
+        assert extended.n_change_points == 8 and np.array_equal(extended.positions, fresh.positions)
+        np.testing.assert_array_equal(extended.density(2.5), fresh.density(2.5))
+        np.testing.assert_array_equal(extended.minima(2.5), fresh.minima(2.5))
+        np.testing.assert_allclose(extended.density("scott"), fresh.density("scott"), rtol=1e-12)
+
+
+class TestSiftIter:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{}, {"penalty_adjust": "auto"}, {"bandwidth": "auto", "random_state": 0}],
+        ids=["fixed", "penalty_auto", "bandwidth_auto"],
+    )
+    def test_snapshots_converge_to_sift(self, kwargs):
+        data = make_synthetic()
+        sifter = Sifter(n_jobs=1, **kwargs)
+        snapshots = list(sifter.sift_iter(data, interval=0))
+        # One snapshot per metric passing STEP0, strongest level shifts first.
+        assert [snapshot.coverage for snapshot in snapshots] == [0.2, 0.4, 0.6, 0.8, 1.0]
+        assert snapshots[0].partial and "noise" in snapshots[0].unprocessed_metrics
+        assert not snapshots[-1].partial
+        assert report(snapshots[-1]) == report(sifter.sift(data))
+        if "bandwidth" in kwargs:
+            assert snapshots[1].bandwidth_tuning.reason == "snapshot"
+
+    def test_priority_and_single_snapshot(self):
+        data = make_synthetic()
+        first = next(Sifter(n_jobs=1).sift_iter(data, priority=["noise"], interval=0))
+        assert set(first.unprocessed_metrics) == {"failure_0", "failure_1", "failure_2", "unrelated"}
+        assert first.filtered_no_change_points == {"noise"} and first.to_dict()["coverage"] == 0.2
+
+        (only,) = Sifter(n_jobs=1).sift_iter(data, interval=60.0)
+        assert report(only) == report(Sifter(n_jobs=1).sift(data))
+
+    def test_cancel_and_close(self):
+        token = CancellationToken()
+        iterator = Sifter(n_jobs=1).sift_iter(make_synthetic(), interval=0, cancel_token=token)
+        assert next(iterator).coverage == 0.2
+        token.cancel()
+        snapshots = list(iterator)
+        assert snapshots[-1].partial and snapshots[-1].coverage < 1.0
+
+        iterator = Sifter(n_jobs=1).sift_iter(make_synthetic(), interval=0)
+        next(iterator)
+        iterator.close()
+
+    def test_invalid_interval(self):
+        with pytest.raises(ValueError, match="interval must be non-negative"):
+            Sifter().sift_iter(make_synthetic(), interval=-1)
@@ -6,12 +6,14 @@ deterministic and does not depend on the pyrca-based generator.
 """
 
 import json
+import pickle
+from dataclasses import fields, replace
 
 import numpy as np
 import pandas as pd
 import pytest
 
-from metricsifter import SegmentInfo, Sifter, SiftResult
+from metricsifter import ExecutionOptions, SegmentInfo, Sifter, SiftResult, StageTiming
 
 
 def _make_synthetic(as_datetime: bool = False) -> pd.DataFrame:
@@ -103,6 +105,58 @@ class TestExclusionClassification:
         assert result.selected_metrics == frozenset()
         assert result.filtered_no_change == frozenset({"a", "b"})
         assert result.segments == []
+        assert result.scale_space is None
+
+    def test_scale_space_attached(self, sifter):
+        """The segmented scale space is kept on the result but never serialized."""
+        result = sifter.sift(_make_synthetic())
+
+        assert result.scale_space is not None
+        assert result.scale_space.n_change_points == sum(len(c) for c in result.metric_to_change_points.values())
+        assert result.scale_space.density(sifter.bandwidth) is not None
+        assert "scale_space" not in result.to_dict()
+
+
+class TestLazyData:
+    """SiftResult.data is built from the input on first access."""
+
+    def test_data_built_on_first_access(self, sifter):
+        data = _make_synthetic()
+        result = sifter.sift(data)
+
+        assert "data" not in vars(result)
+        expected = data[[c for c in data.columns if c in result.selected_metrics]]
+        pd.testing.assert_frame_equal(result.data, expected)
+        assert result.data is result.data
+
+    def test_data_is_a_copy(self, sifter):
+        data = _make_synthetic()
+        result = sifter.sift(data)
+
+        result.data.iloc[:, :] = 0.0
+        pd.testing.assert_frame_equal(data, _make_synthetic())
+
+    def test_data_is_not_a_field(self, sifter):
+        data = _make_synthetic()
+        result = sifter.sift(data)
+        expected = result.data
+
+        assert "data" not in {f.name for f in fields(SiftResult)}
+        pd.testing.assert_frame_equal(replace(result, timings={}).data, expected)
+
+    def test_step0_reads_values_in_place(self):
+        data = _make_synthetic()
+        values = data.to_numpy()
+        columns = Sifter._changing_columns(data)
+
+        assert np.shares_memory(data.to_numpy(dtype=np.float64, na_value=np.nan), values)
+        assert [data.columns[j] for j in columns] == ["failure_0", "failure_1", "failure_2", "unrelated", "noise"]
+
+    def test_pickle_round_trip_before_access(self, sifter):
+        result = sifter.sift(_make_synthetic())
+        restored = pickle.loads(pickle.dumps(result))
+
+        pd.testing.assert_frame_equal(restored.data, result.data)
 
 
 class TestTimestampSupport:
@@ -180,9 +234,77 @@ class TestSerialization:
             "selected_segment",
             "penalty_tuning",
             "bandwidth_tuning",
+            "execution_plan",
+            "partial",
+            "coverage",
+            "unprocessed_metrics",
+            "timings",
         }
 
 
+class _RecordingHooks:
+    def __init__(self):
+        self.events = []
+
+    def on_stage_start(self, stage):
+        self.events.append(("start", stage))
+
+    def on_stage_end(self, stage, timing):
+        self.events.append(("end", stage))
+
+
+class TestStageTimings:
+    def test_stages_and_counts(self, sifter):
+        timings = sifter.sift(_make_synthetic()).timings
+        assert list(timings) == ["filter", "detection", "segmentation", "selection", "assembly"]
+        assert timings["filter"].counts == {"metrics_in": 11, "metrics_out": 5}
+        assert timings["detection"].counts["metrics"] == 5
+        assert timings["detection"].counts["metrics_with_change_points"] == 4
+        assert timings["segmentation"].counts["kde_evaluations"] == 1
+        assert timings["assembly"].counts == {"selected_metrics": 3}
+        assert all(timing.wall >= 0 and timing.cpu >= 0 for timing in timings.values())
+
+    def test_auto_tuning_stages(self):
+        result = Sifter(n_jobs=1, bandwidth="auto", penalty_adjust="auto", random_state=0).sift(_make_synthetic())
+        tuning = result.timings["bandwidth_tuning"].counts
+        assert tuning["candidates"] == len(result.bandwidth_tuning.grid)
+        assert tuning["resamples"] == sum(result.bandwidth_tuning.n_resamples)
+        assert tuning["kde_evaluations"] == 0  # too few change points to tune
+        assert result.timings["detection"].counts["grid_points"] > 1
+        assert "penalty_tuning" in result.timings
+
+    def test_hooks_called_in_order(self):
+        hooks = _RecordingHooks()
+        Sifter(n_jobs=1, stage_hooks=hooks).sift(_make_synthetic())
+        stages = ["filter", "detection", "segmentation", "selection", "assembly"]
+        assert hooks.events == [(event, stage) for stage in stages for event in ("start", "end")]
+
+    def test_hooks_survive_per_call_copies(self):
+        # max_memory plans and deadlines sift on a copy of the sifter.
+        hooks = _RecordingHooks()
+        Sifter(n_jobs=1, stage_hooks=hooks, execution=ExecutionOptions(max_memory="1GB", deadline=60.0)).sift(
+            _make_synthetic()
+        )
+        assert [stage for event, stage in hooks.events if event == "end"] == [
+            "memory_plan",
+            "filter",
+            "detection",
+            "segmentation",
+            "selection",
+            "assembly",
+        ]
+
+    def test_dict_roundtrip(self, sifter):
+        result = sifter.sift(_make_synthetic())
+        restored = SiftResult.from_dict(json.loads(result.to_json()))
+        assert restored.timings == result.timings
+
+    def test_legacy_float_timings(self, sifter):
+        d = sifter.sift(_make_synthetic()).to_dict()
+        d["timings"] = {"pool_startup": 1.5}
+        assert SiftResult.from_dict(d).timings == {"pool_startup": StageTiming(wall=1.5)}
+
+
 class TestBackwardCompatibility:
     def test_run_matches_sift_data(self, sifter):
         data = _make_synthetic()
@@ -120,6 +120,38 @@ class TestFilterNoChangesParallel:
         pd.testing.assert_frame_equal(seq, par2)
         pd.testing.assert_frame_equal(seq, par_all)
 
+
+class TestFilterNoChangesRules:
+    """The vectorized STEP0 filter applies every no-change rule per column."""
+
+    @pytest.mark.parametrize(
+        "column, kept",
+        [
+            ([np.nan] * 6, False),
+            ([3.0] * 6, False),
+            ([1.0, 3.0, 5.0, 7.0, 9.0, 11.0], False),  # constant step
+            ([5.0, np.nan, 5.0, np.nan, 5.0, 5.0], False),  # only zero/NaN differences
+            ([np.nan, 2.0, 2.0, 2.0, 2.0, 2.0], False),
+            ([0.0, 1.0, 2.0, 3.0, 4.0, np.nan], True),  # NaN breaks the constant step
+            ([1.0, 1.0, 1.0, 4.0, 4.0, 4.0], True),
+        ],
+    )
+    def test_rule(self, column, kept):
+        data = pd.DataFrame({"x": column, "change": [0.0, 1.0, 0.0, 2.0, 0.0, 1.0]})
+        assert ("x" in Sifter._filter_no_changes(data).columns) == kept
+
+    def test_block_boundaries(self, monkeypatch):
+        """Column blocks do not change the decisions."""
+        rng = np.random.default_rng(0)
+        values = rng.normal(size=(20, 50))
+        values[:, ::4] = 1.0
+        values[:, 1::5] = np.nan
+        expected = Sifter._has_changes(values)
+
+        monkeypatch.setattr("metricsifter.sifter._FILTER_BLOCK_SIZE", 60)
+        np.testing.assert_array_equal(Sifter._has_changes(values), expected)
+        assert expected.sum() == 29
+
     def test_invalid_segment_selection_method(self):
         """Should raise error for invalid segment_selection_method"""
         # Generate data with clear changepoints
@@ -310,3 +342,64 @@ class TestSifterEdgeCases:
         # Label 0 has larger weighted sum
         assert label == 0
         assert metrics == {"metric1", "metric2"}
+
+
+# ============================================================================
+# Re-segmentation tests
+# ============================================================================
+
+
+class TestResegment:
+    """Test STEP2/STEP3 reruns from stored change points"""
+
+    @pytest.mark.parametrize("bandwidth", [1.0, 6.0, "scott", "auto"])
+    @pytest.mark.parametrize("method", ["max", "weighted_max"])
+    def test_matches_fresh_sift(self, bandwidth, method):
+        """Resegmenting a result equals sifting again with the new parameters"""
+        from tests.conftest import make_synthetic, report
+
+        data = make_synthetic(as_datetime=True)
+        result = Sifter(n_jobs=1, random_state=0).sift(data)
+        resegmented = Sifter(n_jobs=1, random_state=0).resegment(
+            result, bandwidth=bandwidth, segment_selection_method=method
+        )
+        expected = Sifter(n_jobs=1, random_state=0, bandwidth=bandwidth, segment_selection_method=method).sift(data)
+
+        assert report(resegmented) == report(expected)
+        pd.testing.assert_frame_equal(resegmented.data, expected.data)
+
+    def test_detect_once_segment_many(self):
+        """A detection state is reused, scale space included"""
+        from tests.conftest import make_synthetic
+
+        sifter = Sifter(n_jobs=1)
+        detected = sifter.detect(make_synthetic())
+        first = sifter.resegment(detected)
+        second = sifter.resegment(detected, bandwidth=5.0)
+
+        assert first.detection is second.detection is detected
+        assert first.scale_space is second.scale_space is detected.scale_space
+        assert first.metric_to_change_points == detected.metric_to_change_points
+
+    def test_no_change_points(self):
+        """Detections without change points resegment to the empty result"""
+        data = pd.DataFrame({"a": np.arange(100.0) % 2})
+        result = Sifter(n_jobs=1, bandwidth="auto").resegment(Sifter(n_jobs=1).detect(data))
+
+        assert result.selected_metrics == frozenset()
+        assert result.bandwidth_tuning.reason == "no_change_points"
+
+    def test_restored_result_rejected(self):
+        """Results restored from a dict have no detection state"""
+        from metricsifter.types import SiftResult
+        from tests.conftest import make_synthetic
+
+        restored = SiftResult.from_dict(Sifter(n_jobs=1).sift(make_synthetic()).to_dict())
+        with pytest.raises(ValueError, match="detection state"):
+            Sifter(n_jobs=1).resegment(restored)
+
+    def test_invalid_bandwidth(self):
+        """Unsupported bandwidth names are rejected as in the constructor"""
+        detected = Sifter(n_jobs=1).detect(pd.DataFrame({"a": np.arange(10.0) ** 2}))
+        with pytest.raises(ValueError, match="bandwidth"):
+            Sifter(n_jobs=1).resegment(detected, bandwidth="widest")
@@ -0,0 +1,76 @@
+"""
+Test suites for multi-configuration sweeps (metricsifter.sweep)
+"""
+
+import pandas as pd
+import pytest
+
+from metricsifter import Sifter
+from metricsifter.algo import detection
+from metricsifter.sweep import expand_param_grid
+from tests.conftest import make_synthetic, report
+
+
+class TestExpandParamGrid:
+    def test_product_last_fastest(self):
+        configs = expand_param_grid({"bandwidth": [1.0, 2.0], "segment_selection_method": ["max", "weighted_max"]})
+        assert configs == [
+            {"bandwidth": 1.0, "segment_selection_method": "max"},
+            {"bandwidth": 1.0, "segment_selection_method": "weighted_max"},
+            {"bandwidth": 2.0, "segment_selection_method": "max"},
+            {"bandwidth": 2.0, "segment_selection_method": "weighted_max"},
+        ]
+
+    def test_list_of_grids(self):
+        configs = expand_param_grid([{"bandwidth": [1.0]}, {"penalty_adjust": [1.0, "auto"]}])
+        assert configs == [{"bandwidth": 1.0}, {"penalty_adjust": 1.0}, {"penalty_adjust": "auto"}]
+
+
+class TestSweep:
+    def test_matches_individual_sifts(self):
+        data = make_synthetic(as_datetime=True)
+        grid = {
+            "penalty_adjust": [1.0, "auto"],
+            "sigma_estimator": ["std", "diff_std"],
+            "bandwidth": [2.5, "auto"],
+            "segment_selection_method": ["max", "weighted_max"],
+        }
+        results = Sifter(n_jobs=1, random_state=0).sweep(data, grid)
+
+        assert [config for config, _ in results] == expand_param_grid(grid)
+        for config, result in results:
+            expected = Sifter(n_jobs=1, random_state=0, **config).sift(data)
+            assert report(result) == report(expected)
+            pd.testing.assert_frame_equal(result.data, expected.data)
+
+    def test_one_fit_per_column_and_searcher(self, monkeypatch):
+        calls = []
+        sweep_column = detection.univariate_penalty_sweep
+
+        def counting(x, search_method, cost_model, settings, tolerance):
+            calls.append((search_method, len(settings)))
+            return sweep_column(x, search_method, cost_model, settings, tolerance)
+
+        monkeypatch.setattr(detection, "univariate_penalty_sweep", counting)
+        data = make_synthetic()
+        grid = {"search_method": ["pelt", "binseg"], "penalty_adjust": [1.0, 2.0, 2], "bandwidth": [1.0, 2.5]}
+        results = Sifter(n_jobs=1).sweep(data, grid)
+
+        n_columns = len(Sifter._changing_columns(data))
+        assert len(results) == 12
+        # 2.0 and 2 are one setting; the bandwidths share the detection.
+        assert sorted(calls) == [("binseg", 2)] * n_columns + [("pelt", 2)] * n_columns
+        shared = [
+            result.detection
+            for config, result in results
+            if config["search_method"] == "pelt" and config["penalty_adjust"] == 2
+        ]
+        assert len(shared) == 4 and all(detected is shared[0] for detected in shared)
+
+    def test_unsweepable_parameter(self):
+        with pytest.raises(ValueError, match="Cannot sweep"):
+            Sifter(n_jobs=1).sweep(make_synthetic(), {"n_jobs": [1, 2]})
+
+    def test_invalid_value(self):
+        with pytest.raises(ValueError, match="bandwidth"):
+            Sifter(n_jobs=1).sweep(make_synthetic(), {"bandwidth": ["widest"]})
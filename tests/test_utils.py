@@ -5,6 +5,7 @@ Test suites for utils module
 import pandas as pd
 import pytest
 
+from metricsifter.parallel import ThreadPool
 from metricsifter.utils import gen_even_slices, parallel_apply
 
 
@@ -128,6 +129,13 @@ class TestParallelApply:
         pd.testing.assert_series_equal(result_single, result_parallel)
         pd.testing.assert_series_equal(result_single, result_all)
 
+    def test_executor(self):
+        """Packs run on an executor's workers"""
+        df = pd.DataFrame({"A": [1, 2, 3], "B": [2, 4, 6], "C": [3, 6, 9]})
+        with ThreadPool(max_workers=2) as executor:
+            result = parallel_apply(df, lambda x: x.sum(), executor=executor)
+        pd.testing.assert_series_equal(result, df.apply(lambda x: x.sum()))
+
     def test_dataframe_returning_func_matches_serial(self):
         """Element-wise funcs (column -> same-length Series) must match df.apply()"""
         df = pd.DataFrame(